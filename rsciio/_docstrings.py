@@ -39,6 +39,14 @@ LAZY_DOC = """lazy : bool, default=False
     """
 
 
+METADATA_ONLY_DOC = """metadata_only : bool, default=False
+        If ``True``, only the header of the file is read: the axes, metadata
+        and original metadata are returned but the data is not read. It is
+        replaced by a read-only array of zeros of the same shape and dtype,
+        which doesn't allocate the memory of the data.
+    """
+
+
 LAZY_UNSUPPORTED_DOC = """lazy : bool, default=False
         Lazy loading is not supported.
     """
@@ -50,6 +58,36 @@ CHUNKS_DOC = """chunks : tuple of int or None, default=None
         space.
     """
 
+ACCESS_PATTERN_DOC = """access_pattern : None, "signal", "navigation", "balanced" or float, default=None
+        The access pattern used to define the chunks when ``chunks=None``.
+        If ``None``, the chunks contain whole signals. Otherwise, the chunks
+        minimise the expected number of chunks to read to access a signal
+        (``"signal"``), a navigation image, i.e. an image of the navigation
+        space at a given position in signal space (``"navigation"``), or both
+        equally often (``"balanced"``); a number between 0 and 1 gives the
+        fraction of accesses reading navigation images. The size of the
+        chunks is limited by the same target size in all cases. This target
+        applies to the uncompressed data, the compression in use is not taken
+        into account.
+    """
+
+
+RECHUNK_ON_SAVE_DOC = """rechunk_on_save : bool, default=False
+        By default, lazy signals are saved with the chunks of the dask array.
+        If ``True`` and ``chunks=None``, the chunks are determined as for
+        non-lazy signals, using ``access_pattern``, and the dask array is
+        rechunked when saving.
+    """
+
+PACK_RAGGED_DOC = """pack_ragged : bool, default=False
+        If ``True``, ragged arrays of numerical arrays with the same number of
+        dimensions are saved in a single buffer containing the values of all
+        arrays, with the offsets and shapes of the arrays, instead of a
+        variable length dataset. This layout is faster to write and read, but
+        it can't be read correctly by readers supporting only versions of the
+        format older than 3.4. Only used for non-lazy signals.
+    """
+
 CHUNKS_READ_DOC = """chunks : tuple of int or None, default="auto"
         The chunks used when reading the data lazily. This argument is passed
         to the ``chunks`` of the :py:func:`dask.array.from_array` function.
@@ -119,6 +157,42 @@ DISTRIBUTED_DOC = """distributed : bool, default=False
         """
 
 
+ENERGY_WINDOWS_DOC = """energy_windows : None, list or dict, default=None
+        If not ``None``, the counts of the events are summed in the given
+        energy windows while reading the event stream and the maps of the
+        windows are returned with (windows, y, x) shape instead of the
+        spectrum image. The windows are a list of X-ray lines (e.g.
+        ``"Fe_Ka"``, which requires ``exspy``) or of ``(start, end)``
+        energies in keV, or a dictionary of such ``(start, end)`` energies
+        with the names of the windows as keys. The windows of the X-ray lines
+        are twice the FWHM of the line wide.
+    """
+
+
+SLICES_DOC = """slices : None, int, slice or tuple of int and slice, default=None
+        The region of the data to read, given in array order as for numpy
+        basic indexing, for example ``(slice(10, 20), slice(None), 5)``.
+        Negative steps are not supported. Only the chunks of the dataset
+        overlapping with the region are read, also when loading lazily, and
+        the axes are adjusted to match the region. The signals stored in the
+        metadata with the same shape as the data (e.g. the variance) are
+        restricted to the same region and the others (e.g. the navigator) are
+        not returned. If ``None``, the whole data is read.
+    """
+
+
+APPEND_DOC = """append : bool, default=False
+        If ``True`` and the file already contains a signal with the same title,
+        the data is appended to the data of this signal along the first axis of
+        the array, which must be a navigation axis, and only the size of this
+        axis is updated. The data already written and the metadata are not
+        rewritten. If the file or the signal doesn't exist, the signal is
+        written and its dataset can be appended to later. In hspy files, only
+        the signals written with ``append=True`` can be appended to, as the
+        datasets of the other signals can't be resized.
+    """
+
+
 RETURNS_DOC = """Returns
     -------
 
@@ -24,15 +24,21 @@ import warnings
 import dask.array as da
 import h5py
 import numpy as np
+from dask.diagnostics import ProgressBar
 from packaging.version import Version
 
 from rsciio._docstrings import SHOW_PROGRESSBAR_DOC
-from rsciio.utils.tools import ensure_unicode
+from rsciio.utils.tools import dummy_context_manager, ensure_unicode
 
-version = "3.3"
+version = "3.4"
 
 default_version = Version(version)
 
+# Version written in the files which don't use the packed layout of ragged
+# arrays added in version 3.4, so that readers supporting older versions of
+# the format read them without warning
+compatible_version = "3.3"
+
 not_valid_format = "The file is not a valid HyperSpy hdf5 file"
 
 _logger = logging.getLogger(__name__)
@@ -85,10 +91,307 @@ def unflatten_data(data, shape, is_hdf5=False):
     return new_data
 
 
+def pack_ragged_data(data):
+    """
+    Pack a ragged array in a single buffer containing the values of all the
+    elements, with the offset of each element in the buffer and its shape.
+
+    The offsets are computed with vectorised operations and the values are
+    concatenated in a single call; only getting the shape and the values of
+    each element of the object array is done element by element.
+
+    Parameters
+    ----------
+    data : numpy.ndarray
+        Array of object dtype, whose elements are arrays of the same number
+        of dimensions.
+
+    Returns
+    -------
+    values, offsets, shapes : numpy.ndarray or None
+        The 1D buffer of values, the offsets of the elements in the buffer
+        (same shape as ``data``) and the shapes of the elements (shape of
+        ``data`` plus the number of dimensions of the elements). ``None`` if
+        the elements can't be packed, when they contain strings or objects
+        or have different number of dimensions.
+    """
+    elements = list(map(np.asarray, data.ravel()))
+    if len(elements) == 0:
+        return None
+    ndims = set(map(np.ndim, elements))
+    kinds = set(element.dtype.kind for element in elements)
+    if len(ndims) != 1 or kinds & set("OSUV"):
+        return None
+    ndim = ndims.pop()
+    shapes = np.array(list(map(np.shape, elements)), dtype=np.int64).reshape(
+        data.shape + (ndim,)
+    )
+    sizes = np.prod(shapes, axis=-1, dtype=np.int64)
+    offsets = np.cumsum(sizes, dtype=np.int64) - sizes.ravel()
+    values = np.concatenate(list(map(np.ravel, elements)))
+    return values, offsets.reshape(data.shape), shapes
+
+
+def unpack_ragged_data(offsets, shapes, values):
+    """
+    Unpack the elements of a ragged array packed with
+    :py:func:`pack_ragged_data`. Only the range of ``values`` containing the
+    elements is read and the elements are views of this range.
+
+    The range is split in a single call; the elements with more than one
+    dimension are reshaped and all elements are assigned to the object
+    array element by element.
+
+    Parameters
+    ----------
+    offsets : numpy.ndarray
+        The offsets of the elements in ``values``, increasing in C order as
+        written by :py:func:`pack_ragged_data`.
+    shapes : numpy.ndarray
+        The shapes of the elements.
+    values : array-like
+        The 1D buffer of values, for example a h5py or zarr dataset.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of object dtype with the same shape as ``offsets``.
+    """
+    offsets = np.asarray(offsets)
+    shapes = np.asarray(shapes)
+    data = np.empty(offsets.shape, dtype=object)
+    if data.size == 0:
+        return data
+    shapes = shapes.reshape((data.size, shapes.shape[-1]))
+    sizes = np.prod(shapes, axis=-1, dtype=np.int64)
+    start = int(offsets.min())
+    starts = offsets.ravel() - start
+    buffer = np.asarray(values[start : start + int((starts + sizes).max())])
+    # the pieces at odd indices are the elements, the others are the gaps
+    # between the elements, for example between the rows of a region
+    elements = np.split(buffer, np.column_stack([starts, starts + sizes]).ravel())
+    elements = elements[1::2]
+    if shapes.shape[-1] != 1:
+        elements = map(np.reshape, elements, shapes)
+    data_flat = data.reshape(-1)
+    for i, element in enumerate(elements):
+        data_flat[i] = element
+    return data
+
+
+def _normalize_slices(slices, shape):
+    """
+    Convert the ``slices`` argument of the readers to a tuple of slices with
+    explicit start, stop and step, one for each dimension of ``shape``, and
+    return also which dimensions are indexed with an integer.
+    """
+    if not isinstance(slices, tuple):
+        slices = (slices,)
+    if len(slices) > len(shape):
+        raise IndexError(
+            f"Too many indices ({len(slices)}) for data with {len(shape)} dimensions."
+        )
+    slices = slices + (slice(None),) * (len(shape) - len(slices))
+    normalized_slices = []
+    is_integer = []
+    for slice_, size in zip(slices, shape):
+        if isinstance(slice_, slice):
+            start, stop, step = slice_.indices(size)
+            if step < 0:
+                raise ValueError("Negative steps are not supported.")
+            stop = max(start, stop)
+            is_integer.append(False)
+        elif isinstance(slice_, (int, np.integer)):
+            start = int(slice_) + size if slice_ < 0 else int(slice_)
+            if not 0 <= start < size:
+                raise IndexError(
+                    f"Index {slice_} is out of bounds for axis with size {size}."
+                )
+            stop, step = start + 1, 1
+            is_integer.append(True)
+        else:
+            raise TypeError("Only integers and slices are supported.")
+        normalized_slices.append(slice(start, stop, step))
+    return tuple(normalized_slices), tuple(is_integer)
+
+
+def _slice_axis(axis, slice_):
+    """Return the dictionary of an axis restricted to the ``slice_`` range."""
+    axis = axis.copy()
+    if "axis" in axis:
+        axis["axis"] = np.asarray(axis["axis"])[slice_]
+    if isinstance(axis.get("x"), dict):
+        # the `x` axis of a functional axis
+        axis["x"] = _slice_axis(axis["x"], slice_)
+    if "scale" in axis and "offset" in axis:
+        axis["offset"] = axis["offset"] + slice_.start * axis["scale"]
+        axis["scale"] = axis["scale"] * slice_.step
+    if "size" in axis:
+        axis["size"] = len(range(slice_.start, slice_.stop, slice_.step))
+    return axis
+
+
+def _slice_metadata_signals(dictionary, shape, slices, is_integer):
+    """
+    Restrict the signals stored in the metadata (e.g. the variance) whose
+    data have the same shape as the data to the region read, and remove the
+    other signals (e.g. the navigator), which don't match the region.
+    """
+    for key in list(dictionary):
+        value = dictionary[key]
+        if not isinstance(value, dict):
+            continue
+        if not key.startswith("_sig_"):
+            _slice_metadata_signals(value, shape, slices, is_integer)
+        elif np.shape(value.get("data")) == tuple(shape) and len(
+            value.get("axes", [])
+        ) == len(shape):
+            value["data"] = value["data"][
+                tuple(s.start if i else s for s, i in zip(slices, is_integer))
+            ]
+            value["axes"] = [
+                _slice_axis(axis, slice_)
+                for axis, slice_, integer in zip(value["axes"], slices, is_integer)
+                if not integer
+            ]
+        else:
+            del dictionary[key]
+
+
+class _DatasetRegion:
+    """
+    Array-like region of a h5py/zarr dataset, which reads only the chunks
+    of the dataset overlapping with the region. The chunks are aligned with
+    the chunks of the dataset, when the steps of the slices are 1.
+    """
+
+    def __init__(self, dataset, slices):
+        self.dataset = dataset
+        self.slices = slices
+        self.shape = tuple(len(range(s.start, s.stop, s.step)) for s in slices)
+        self.dtype = dataset.dtype
+        self.ndim = len(self.shape)
+        dataset_chunks = dataset.chunks or dataset.shape
+        chunks = []
+        for s, size, chunk_size in zip(slices, self.shape, dataset_chunks):
+            if s.step == 1 and size > 0:
+                first = min(size, chunk_size - s.start % chunk_size)
+                rest = da.core.normalize_chunks(chunk_size, (size - first,))[0]
+                chunks.append(tuple(c for c in (first,) + rest if c))
+            else:
+                chunks.append(max(1, chunk_size // s.step))
+        self.chunks = da.core.normalize_chunks(tuple(chunks), self.shape)
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        key, is_integer = _normalize_slices(key, self.shape)
+        # compose the slices of the key with the slices of the region
+        slices = tuple(
+            s.start + k.start * s.step
+            if integer
+            else slice(
+                s.start + k.start * s.step,
+                # stop just after the last element, within the dataset
+                s.start + max(k.start, k.stop - 1) * s.step + (k.stop > k.start),
+                s.step * k.step,
+            )
+            for s, k, integer in zip(self.slices, key, is_integer)
+        )
+        return self.dataset[slices]
+
+    def __array__(self, dtype=None, copy=None):
+        data = self.dataset[self.slices]
+        return data if dtype is None else data.astype(dtype)
+
+
 # ---------------------------------
 
 
-def get_signal_chunks(shape, dtype, signal_axes=None, target_size=1e6):
+_ACCESS_PATTERNS = {"signal": 0.0, "balanced": 0.5, "navigation": 1.0}
+
+
+def _get_access_weight(access_pattern):
+    """
+    Return the fraction of the accesses reading navigation images, as opposed
+    to signals, for the given access pattern.
+    """
+    if isinstance(access_pattern, str):
+        if access_pattern not in _ACCESS_PATTERNS:
+            raise ValueError(
+                f"`access_pattern` must be one of {tuple(_ACCESS_PATTERNS)} or a "
+                f"number between 0 and 1, not '{access_pattern}'."
+            )
+        return _ACCESS_PATTERNS[access_pattern]
+    if not 0 <= access_pattern <= 1:
+        raise ValueError(
+            f"`access_pattern` must be between 0 and 1, not {access_pattern}."
+        )
+    return float(access_pattern)
+
+
+def _optimise_chunks(shape, typesize, signal_axes, weight, target_size):
+    """
+    Calculate chunks minimising the expected number of chunks read to access
+    a signal (with probability ``1 - weight``) or a navigation image (with
+    probability ``weight``), with chunks smaller than ``target_size`` bytes.
+
+    The size of the chunks is the size of the uncompressed data: the
+    compression ratio is not known before writing and the chunks are
+    decompressed in memory when they are read, so the compression is
+    deliberately ignored.
+
+    The chunks are grown greedily, one axis at a time, choosing the axis
+    which gives the largest reduction of the expected number of chunks read
+    for the increase of the size of the chunks.
+    """
+    shape = tuple(max(int(size), 1) for size in shape)
+    navigation_axes = tuple(i for i in range(len(shape)) if i not in signal_axes)
+    max_size = max(int(target_size // typesize), 1)
+
+    def cost(chunks):
+        number_of_chunks = [-(-size // chunk) for size, chunk in zip(shape, chunks)]
+        signal_chunks = np.prod([number_of_chunks[i] for i in signal_axes])
+        navigation_chunks = np.prod([number_of_chunks[i] for i in navigation_axes])
+        return (
+            (1 - weight) * signal_chunks + weight * navigation_chunks,
+            np.prod(number_of_chunks),
+        )
+
+    chunks = [1] * len(shape)
+    current_cost = cost(chunks)
+    while True:
+        size = np.prod(chunks)
+        best = None
+        for i, (axis_size, chunk) in enumerate(zip(shape, chunks)):
+            largest = min(axis_size, max_size // (size // chunk))
+            for new_chunk in {min(2 * chunk, largest), largest}:
+                if new_chunk <= chunk:
+                    continue
+                new_chunks = chunks[:i] + [new_chunk] + chunks[i + 1 :]
+                new_cost = cost(new_chunks)
+                growth = np.log(new_chunk / chunk)
+                # reduction of the expected number of chunks read per
+                # increase of the chunk size, otherwise grow the axes evenly
+                # and reduce the total number of chunks
+                score = (
+                    np.log(current_cost[0] / new_cost[0]) / growth,
+                    -chunk / axis_size,
+                    -new_chunk / axis_size,
+                    np.log(current_cost[1] / new_cost[1]) / growth,
+                )
+                if best is None or score > best[0]:
+                    best = (score, new_chunks, new_cost)
+        if best is None:
+            break
+        _, chunks, current_cost = best
+
+    return tuple(int(chunk) for chunk in chunks)
+
+
+def get_signal_chunks(
+    shape, dtype, signal_axes=None, target_size=1e6, access_pattern=None
+):
     """
     Function that calculates chunks for the signal, preferably at least one
     chunk per signal space.
@@ -103,13 +406,30 @@ def get_signal_chunks(shape, dtype, signal_axes=None, target_size=1e6):
         The axes defining "signal space" of the dataset. If None, the default
         h5py chunking is performed.
     target_size : int
-        The target number of bytes for one chunk
+        The target number of bytes for one chunk, before compression.
+    access_pattern : {None, "signal", "navigation", "balanced"} or float
+        How the data will be accessed. If ``None``, the chunks contain whole
+        signals and the navigation axes are chunked equally. Otherwise, the
+        chunks minimise the expected number of chunks read to access a signal
+        (``"signal"``), a navigation image, which is an image of the navigation
+        space at a given position of the signal space (``"navigation"``), or
+        both with the same frequency (``"balanced"``). A number between 0 and
+        1 is the fraction of the accesses reading navigation images.
     """
     typesize = np.dtype(dtype).itemsize
     if shape == (0,) or signal_axes is None:
         # enable autochunking from h5py
         return True
 
+    if access_pattern is not None:
+        return _optimise_chunks(
+            shape,
+            typesize,
+            tuple(signal_axes),
+            _get_access_weight(access_pattern),
+            target_size,
+        )
+
     # largely based on the guess_chunk in h5py
     bytes_per_signal = np.prod([shape[i] for i in signal_axes]) * typesize
     signals_per_chunk = int(np.floor_divide(target_size, bytes_per_signal))
@@ -157,6 +477,21 @@ def get_signal_chunks(shape, dtype, signal_axes=None, target_size=1e6):
         return tuple(int(x) for x in chunks)
 
 
+def set_format_version(attrs, file_version):
+    """
+    Set the format version in the attributes of a file, unless the file
+    already has a later version, for example when a signal using the
+    features of this version has already been written in the file.
+    """
+    current_version = attrs.get("file_format_version")
+    if isinstance(current_version, bytes):
+        current_version = current_version.decode()
+    if isinstance(current_version, float):
+        current_version = str(round(current_version, 2))
+    if current_version is None or Version(current_version) < Version(file_version):
+        attrs["file_format_version"] = file_version
+
+
 class HierarchicalReader:
     """A generic Reader class for reading data from hierarchical file types."""
 
@@ -205,7 +540,7 @@ class HierarchicalReader:
 
         return Version(version)
 
-    def read(self, lazy):
+    def read(self, lazy, slices=None):
         """
         Read all data, metadata, models.
 
@@ -213,6 +548,8 @@ class HierarchicalReader:
         ----------
         lazy : bool
             Return data as lazy signal.
+        slices : None, int, slice or tuple of int and slice
+            The region of the data to read, see :py:meth:`group2signaldict`.
 
         Raises
         ------
@@ -256,7 +593,7 @@ class HierarchicalReader:
             # Parse the file
             for experiment in experiments:
                 exg = self.file["Experiments"][experiment]
-                exp = self.group2signaldict(exg, lazy)
+                exp = self.group2signaldict(exg, lazy, slices=slices)
                 # assign correct models, if found:
                 _tmp = {}
                 for key, _dict in reversed(models_with_signals):
@@ -277,12 +614,46 @@ class HierarchicalReader:
 
         return exp_dict_list
 
-    def _read_array(self, group, dataset_key):
+    @staticmethod
+    def _get_array_shape(group, dataset_key):
+        """The shape of the array, including packed ragged arrays."""
+        if f"_ragged_offsets_{dataset_key}" in group:
+            return group[f"_ragged_offsets_{dataset_key}"].shape
+        return group[dataset_key].shape
+
+    def _read_packed_ragged_array(self, group, dataset_key, slices=None):
+        offsets = group[f"_ragged_offsets_{dataset_key}"]
+        shapes = group[f"_ragged_packed_shapes_{dataset_key}"]
+        if slices is not None:
+            offsets = _DatasetRegion(offsets, slices)
+            shapes = _DatasetRegion(shapes, slices + (slice(0, shapes.shape[-1], 1),))
+        offsets = da.from_array(offsets, chunks=offsets.chunks or offsets.shape)
+        shapes = da.from_array(shapes, chunks=offsets.chunks + ((shapes.shape[-1],),))
+        index = tuple(range(offsets.ndim))
+        return da.blockwise(
+            unpack_ragged_data,
+            index,
+            offsets,
+            index,
+            shapes,
+            index + (offsets.ndim,),
+            values=group[dataset_key],
+            concatenate=True,
+            dtype=object,
+            meta=np.array((), dtype=object),
+        )
+
+    def _read_array(self, group, dataset_key, slices=None):
         # This is a workaround for the lack of support for n-d ragged array
         # in h5py and zarr. There is work in progress for implementation in zarr:
         # https://github.com/zarr-developers/zarr-specs/issues/62 which may be
         # relevant to implement here when available
+        if f"_ragged_offsets_{dataset_key}" in group:
+            # Ragged array packed in a single buffer (v3.4)
+            return self._read_packed_ragged_array(group, dataset_key, slices)
         data = group[dataset_key]
+        if slices is not None:
+            data = _DatasetRegion(data, slices)
         key = f"_ragged_shapes_{dataset_key}"
         if "ragged_shapes" in group:
             # For file saved with rosettaSciIO <= 0.1
@@ -290,6 +661,8 @@ class HierarchicalReader:
             key = "ragged_shapes"
         if key in group:
             ragged_shape = group[key]
+            if slices is not None:
+                ragged_shape = _DatasetRegion(ragged_shape, slices)
             # Use same chunks as data so that apply_gufunc doesn't rechunk
             # Reduces the transfer of data between workers which
             # significantly improves performance for distributed loading
@@ -306,7 +679,7 @@ class HierarchicalReader:
             )
         return data
 
-    def group2signaldict(self, group, lazy=False):
+    def group2signaldict(self, group, lazy=False, slices=None):
         """
         Reads a h5py/zarr group and returns a signal dictionary.
 
@@ -316,6 +689,12 @@ class HierarchicalReader:
             A group following hspy specification.
         lazy : bool, optional
             Return the data as dask array. The default is False.
+        slices : None, int, slice or tuple of int and slice
+            The region of the data to read, given in array order as for
+            numpy basic indexing (negative steps are not supported). Only
+            the chunks overlapping with the region are read and the axes
+            are adjusted accordingly. The default is None, which reads the
+            whole data.
 
         Raises
         ------
@@ -351,7 +730,11 @@ class HierarchicalReader:
             exp["package"] = ""
             exp["package_version"] = ""
 
-        data = self._read_array(group, "data")
+        shape = self._get_array_shape(group, "data")
+        ndim = len(shape)
+        if slices is not None:
+            slices, is_integer = _normalize_slices(slices, shape)
+        data = self._read_array(group, "data", slices)
         if lazy:
             if not isinstance(data, da.Array):
                 data = da.from_array(data, chunks=data.chunks)
@@ -361,9 +744,11 @@ class HierarchicalReader:
                 data = data.compute()
             data = np.asanyarray(data)
             exp["attributes"]["_lazy"] = False
+        if slices is not None and any(is_integer):
+            data = data[tuple(0 if i else slice(None) for i in is_integer)]
         exp["data"] = data
         axes = []
-        for i in range(len(exp["data"].shape)):
+        for i in range(ndim):
             try:
                 axes.append(self._group2dict(group[f"axis-{i}"]))
                 axis = axes[-1]
@@ -374,14 +759,14 @@ class HierarchicalReader:
                         axis[key] = ensure_unicode(item)
             except KeyError:
                 break
-        if len(axes) != len(exp["data"].shape):  # broke from the previous loop
+        if len(axes) != ndim:  # broke from the previous loop
             try:
                 axes = [
                     i
                     for k, i in sorted(
                         iter(
                             self._group2dict(
-                                group["_list_" + str(len(exp["data"].shape)) + "_axes"],
+                                group["_list_" + str(ndim) + "_axes"],
                                 lazy=lazy,
                             ).items()
                         )
@@ -389,6 +774,13 @@ class HierarchicalReader:
                 ]
             except KeyError:
                 raise IOError(not_valid_format)
+        if slices is not None:
+            axes = [
+                _slice_axis(axis, slice_)
+                for axis, slice_, integer in zip(axes, slices, is_integer)
+                if not integer
+            ]
+            _slice_metadata_signals(exp["metadata"], shape, slices, is_integer)
         exp["axes"] = axes
         if "learning_results" in group.keys():
             exp["attributes"]["learning_results"] = self._group2dict(
@@ -595,7 +987,9 @@ class HierarchicalReader:
                 dictionary[key] = value
         if not isinstance(group, self.Dataset):
             for key in group.keys():
-                if key.startswith("_ragged_shapes_"):
+                if key.startswith(
+                    ("_ragged_shapes_", "_ragged_offsets_", "_ragged_packed_shapes_")
+                ):
                     # array used to parse ragged array, need to skip it
                     # otherwise, it will wrongly read kwargs when reading
                     # variable length markers as they uses ragged arrays
@@ -704,6 +1098,85 @@ class HierarchicalWriter:
     def _store_data(*arg):  # pragma: no cover
         raise NotImplementedError("This method must be implemented by subclasses.")
 
+    @staticmethod
+    def _remove_datasets(group, *keys):
+        """Remove datasets of a previous layout of a ragged array."""
+        for key in keys:
+            if key in group:
+                del group[key]
+
+    @staticmethod
+    def _get_resizable_kwds(shape):
+        """
+        Keywords to pass to ``require_dataset`` to create a dataset which can
+        be resized along its first axis.
+        """
+        return {}
+
+    @classmethod
+    def append_dataset(cls, group, data, key, show_progressbar=True):
+        """
+        Append data to a dataset along its first axis. Only the chunks
+        containing the appended data are written.
+
+        Parameters
+        ----------
+        group : :py:class:`zarr.hierarchy.Group` or :py:class:`h5py.Group`
+            The group containing the dataset.
+        data : Array-like
+            The data to be appended.
+        key : str
+            The key of the dataset.
+        %s
+        """ % SHOW_PROGRESSBAR_DOC
+        dset = group[key]
+        if data.dtype == np.dtype("O"):
+            raise ValueError("Appending ragged arrays is not supported.")
+        if data.ndim != dset.ndim or data.shape[1:] != dset.shape[1:]:
+            raise ValueError(
+                f"The shape of the data {data.shape} doesn't match the shape "
+                f"of the dataset {dset.shape}."
+            )
+        if np.issubdtype(data.dtype, np.dtype("U")):
+            data = data.astype(np.dtype("S"))
+        if data.dtype != dset.dtype:
+            raise ValueError(
+                f"The dtype of the data ({data.dtype}) doesn't match the dtype "
+                f"of the dataset ({dset.dtype})."
+            )
+        if data.shape[0] == 0:
+            return
+        start = dset.shape[0]
+        stop = start + data.shape[0]
+        # zarr arrays can always be resized, hdf5 datasets only up to their
+        # maximum shape
+        maxshape = getattr(dset, "maxshape", (None,))
+        if maxshape[0] is not None and maxshape[0] < stop:
+            raise ValueError(
+                "The data can't be appended to the dataset, which can't be "
+                "resized. The signal must have been written with `append=True`."
+            )
+        dset.resize((stop,) + dset.shape[1:])
+        if isinstance(data, da.Array):
+            # Align the blocks with the chunks of the dataset, so that a chunk
+            # is never written by several blocks
+            chunk_size = dset.chunks[0]
+            first = min(data.shape[0], chunk_size - start % chunk_size)
+            chunks_0 = (first,) + da.core.normalize_chunks(
+                chunk_size, (data.shape[0] - first,)
+            )[0]
+            data = data.rechunk((tuple(c for c in chunks_0 if c),) + dset.chunks[1:])
+            cm = ProgressBar if show_progressbar else dummy_context_manager
+            with cm():
+                da.store(
+                    data,
+                    dset,
+                    regions=(slice(start, stop),),
+                    lock=cls._is_hdf5,
+                )
+        else:
+            dset[start:stop] = data
+
     @classmethod
     def overwrite_dataset(
         cls,
@@ -713,6 +1186,10 @@ class HierarchicalWriter:
         signal_axes=None,
         chunks=None,
         show_progressbar=True,
+        parallel_compression=False,
+        access_pattern=None,
+        rechunk_on_save=False,
+        pack_ragged=False,
         **kwds,
     ):
         """
@@ -731,24 +1208,47 @@ class HierarchicalWriter:
             The indexes of the signal axes.
         chunks : tuple, None
             The chunks for the dataset. If ``None`` and saving lazy signal,
-            the chunks of the dask array will be used otherwise the chunks
-            will be determined by the
-            :py:func:`~.io_plugins._hierarchical.get_signal_chunks` function.
+            the chunks of the dask array will be used (unless
+            ``rechunk_on_save=True``) otherwise the chunks will be determined
+            by the :py:func:`~.io_plugins._hierarchical.get_signal_chunks`
+            function.
         %s
+        parallel_compression : bool or int, default=False
+            Only for HDF5 files. If not ``False``, the chunks are compressed
+            in a pool of threads and written with direct chunk writes, see
+            :py:func:`rsciio.hspy.file_writer`.
+        access_pattern : {None, "signal", "navigation", "balanced"} or float
+            The access pattern passed to
+            :py:func:`~.io_plugins._hierarchical.get_signal_chunks`, when
+            ``chunks`` is ``None``.
+        rechunk_on_save : bool, default=False
+            If ``True`` and ``chunks`` is ``None``, the chunks of lazy data
+            are also determined by
+            :py:func:`~.io_plugins._hierarchical.get_signal_chunks` and the
+            dask array is rechunked when writing.
+        pack_ragged : bool, default=False
+            If ``True``, ragged arrays of numerical arrays are written in a
+            single buffer with the offsets and shapes of the arrays, see
+            :py:func:`pack_ragged_data`. Only for non-lazy data.
         kwds : dict
             Any additional keywords for to be passed to the
             :py:meth:`h5py.Group.require_dataset` or
             :py:meth:`zarr.hierarchy.Group.require_dataset` method.
         """ % SHOW_PROGRESSBAR_DOC
         if chunks is None:
-            if isinstance(data, da.Array):
+            if isinstance(data, da.Array) and not rechunk_on_save:
                 # For lazy dataset, by default, we use the current dask chunking
                 chunks = tuple([c[0] for c in data.chunks])
             else:
                 # If signal_axes=None, use automatic h5py chunking, otherwise
                 # optimise the chunking to contain at least one signal per chunk
+                # or for the given access pattern
                 chunks = get_signal_chunks(
-                    data.shape, data.dtype, signal_axes, cls.target_size
+                    data.shape,
+                    data.dtype,
+                    signal_axes,
+                    cls.target_size,
+                    access_pattern=access_pattern,
                 )
         if np.issubdtype(data.dtype, np.dtype("U")):
             # Saving numpy unicode type is not supported in h5py
@@ -778,7 +1278,50 @@ class HierarchicalWriter:
                     del group[key]
 
         _logger.info(f"Chunks used for saving: {chunks}")
-        if data.dtype == np.dtype("O"):
+        packed = None
+        if (
+            pack_ragged
+            and data.dtype == np.dtype("O")
+            and not isinstance(data, da.Array)
+        ):
+            packed = pack_ragged_data(data)
+        if packed is not None:
+            values, offsets, shapes = packed
+            if f"_ragged_shapes_{key}" in group:
+                # Previously written with the variable length layout
+                cls._remove_datasets(group, key, f"_ragged_shapes_{key}")
+            cls.overwrite_dataset(
+                group, values, key, show_progressbar=show_progressbar, **kwds
+            )
+            cls.overwrite_dataset(
+                group,
+                offsets,
+                f"_ragged_offsets_{key}",
+                chunks=chunks,
+                show_progressbar=show_progressbar,
+                **kwds,
+            )
+            cls.overwrite_dataset(
+                group,
+                shapes,
+                f"_ragged_packed_shapes_{key}",
+                chunks=(
+                    tuple(chunks) + shapes.shape[-1:]
+                    if isinstance(chunks, tuple)
+                    else None
+                ),
+                show_progressbar=show_progressbar,
+                **kwds,
+            )
+        elif data.dtype == np.dtype("O"):
+            if f"_ragged_offsets_{key}" in group:
+                # Previously written with the packed layout
+                cls._remove_datasets(
+                    group,
+                    key,
+                    f"_ragged_offsets_{key}",
+                    f"_ragged_packed_shapes_{key}",
+                )
             if isinstance(data, da.Array):
                 new_data, shapes = da.apply_gufunc(
                     flatten_data,
@@ -805,7 +1348,15 @@ class HierarchicalWriter:
                 show_progressbar,
             )
         else:
-            cls._store_data(data, dset, group, key, chunks, show_progressbar)
+            cls._store_data(
+                data,
+                dset,
+                group,
+                key,
+                chunks,
+                show_progressbar,
+                parallel_compression=parallel_compression,
+            )
 
     def write(self):
         self.write_signal(self.signal, self.group, **self.kwds)
@@ -817,9 +1368,35 @@ class HierarchicalWriter:
         write_dataset=True,
         chunks=None,
         show_progressbar=True,
+        parallel_compression=False,
+        append=False,
+        access_pattern=None,
+        rechunk_on_save=False,
+        pack_ragged=False,
         **kwds,
     ):
         """Writes a signal dict to a hdf5/zarr group"""
+        data_kwds = {}
+        if append:
+            if not signal["axes"] or not signal["axes"][0]["navigate"]:
+                raise ValueError(
+                    "Appending data requires the first axis of the array to be "
+                    "a navigation axis."
+                )
+            if "axis" in signal["axes"][0]:
+                raise ValueError(
+                    "Appending data along a non-uniform axis is not supported."
+                )
+            if write_dataset and "data" in group:
+                self.append_dataset(
+                    group, signal["data"], "data", show_progressbar=show_progressbar
+                )
+                # Only the size of the axis along which the data is appended
+                # changes
+                group["axis-0"].attrs["size"] = group["data"].shape[0]
+                return
+            data_kwds = self._get_resizable_kwds(signal["data"].shape)
+
         group.attrs.update(signal["package_info"])
 
         for i, axis_dict in enumerate(signal["axes"]):
@@ -847,9 +1424,18 @@ class HierarchicalWriter:
                 ],
                 chunks=chunks,
                 show_progressbar=show_progressbar,
+                parallel_compression=parallel_compression,
+                access_pattern=access_pattern,
+                rechunk_on_save=rechunk_on_save,
+                pack_ragged=pack_ragged,
                 **kwds,
+                **data_kwds,
             )
 
+        if "_ragged_offsets_data" in group:
+            # the packed layout of ragged arrays requires the latest version
+            set_format_version(self.file.attrs, version)
+
         if default_version < Version("1.2"):
             metadata_dict["_internal_parameters"] = metadata_dict.pop("_HyperSpy")
 
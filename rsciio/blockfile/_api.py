@@ -22,6 +22,7 @@ import os
 import warnings
 
 import dask
+import dask.array as da
 import dateutil
 import numpy as np
 from dask.diagnostics import ProgressBar
@@ -40,6 +41,7 @@ from rsciio.utils.date_time_tools import (
     datetime_to_serial_date,
     serial_date_to_ISO_format,
 )
+from rsciio.utils.distributed import memmap_distributed
 from rsciio.utils.skimage_exposure import rescale_intensity
 from rsciio.utils.tools import (
     DTBox,
@@ -215,16 +217,26 @@ def get_header_from_signal(signal, endianess="<"):
     return header, note
 
 
-def file_reader(filename, lazy=False, mmap_mode=None, endianess="<"):
+def file_reader(filename, lazy=False, mmap_mode=None, endianess="<", chunks="auto"):
     """
     Read a blockfile.
 
+    The virtual bright field image stored in the file is returned as the
+    navigator of the signal, in ``metadata["_HyperSpy"]["_sig_navigator"]``,
+    which avoids having to compute it from the 4D data.
+
     Parameters
     ----------
     %s
     %s
     %s
     %s
+    chunks : tuple, dict or str, default="auto"
+        The chunks used when reading the data lazily, which are given for the
+        ``(NY, NX, DP_SZ, DP_SZ)`` shape of the data in the file. It is passed
+        to :py:func:`dask.array.core.normalize_chunks`. With ``"auto"``, only
+        the navigation axes are chunked and each chunk contains full frames.
+
     %s
     """
 
@@ -273,34 +285,61 @@ def file_reader(filename, lazy=False, mmap_mode=None, endianess="<"):
 
     # Get data:
 
-    # TODO A Virtual BF/DF is stored first, may be loaded as navigator in future
-    # offset1 = header['Data_offset_1']
-    # f.seek(offset1)
-    # navigator = np.fromfile(f, dtype=endianess+"u1", shape=(NX, NY)).T
+    # A virtual bright field image is stored first
+    f.seek(header["Data_offset_1"])
+    navigator = np.fromfile(f, dtype=endianess + "u1", count=NX * NY)
+    if navigator.size < NX * NY:
+        navigator = None
+    else:
+        navigator = navigator.reshape((NY, NX)).squeeze()
 
     # Then comes actual blockfile
     offset2 = header["Data_offset_2"]
-    if not lazy:
-        f.seek(offset2)
-        data = np.fromfile(f, dtype=endianess + "u1")
-    else:
-        data = np.memmap(f, mode=mmap_mode, offset=offset2, dtype=endianess + "u1")
-    try:
-        data = data.reshape((NY, NX, DP_SZ * DP_SZ + 6))
-    except ValueError:
-        warnings.warn(
-            "Blockfile header dimensions larger than file size! "
-            "Will attempt to load by zero padding incomplete frames."
-        )
-        # Data is stored DP by DP:
-        pw = [(0, NX * NY * (DP_SZ * DP_SZ + 6) - data.size)]
-        data = np.pad(data, pw, mode="constant")
-        data = data.reshape((NY, NX, DP_SZ * DP_SZ + 6))
-
     # Every frame is preceeded by a 6 byte sequence (AA 55, and then a 4 byte
     # integer specifying frame number)
-    data = data[:, :, 6:]
-    data = data.reshape((NY, NX, DP_SZ, DP_SZ), order="C").squeeze()
+    record_dtype = np.dtype(
+        [
+            ("MAGIC", endianess + "u2"),
+            ("ID", endianess + "u4"),
+            ("IMG", endianess + "u1", (DP_SZ, DP_SZ)),
+        ]
+    )
+    file_size = os.fstat(f.fileno()).st_size
+    if lazy and offset2 + NX * NY * record_dtype.itemsize <= file_size:
+        if chunks == "auto":
+            chunks = ("auto", "auto", -1, -1)
+        data = memmap_distributed(
+            filename,
+            dtype=record_dtype,
+            offset=offset2,
+            shape=(NY, NX),
+            chunks=chunks,
+            key="IMG",
+            mode=mmap_mode,
+        )
+    else:
+        if not lazy:
+            f.seek(offset2)
+            data = np.fromfile(f, dtype=endianess + "u1")
+        else:
+            data = np.memmap(f, mode=mmap_mode, offset=offset2, dtype=endianess + "u1")
+        try:
+            data = data.reshape((NY, NX, DP_SZ * DP_SZ + 6))
+        except ValueError:
+            warnings.warn(
+                "Blockfile header dimensions larger than file size! "
+                "Will attempt to load by zero padding incomplete frames."
+            )
+            # Data is stored DP by DP:
+            pw = [(0, NX * NY * (DP_SZ * DP_SZ + 6) - data.size)]
+            data = np.pad(data, pw, mode="constant")
+            data = data.reshape((NY, NX, DP_SZ * DP_SZ + 6))
+
+        data = data[:, :, 6:]
+        data = data.reshape((NY, NX, DP_SZ, DP_SZ), order="C")
+        if lazy:
+            data = da.from_array(data, chunks=chunks)
+    data = data.squeeze()
 
     units = ["nm", "nm", "cm", "cm"]
     names = ["y", "x", "dy", "dx"]
@@ -332,6 +371,19 @@ def file_reader(filename, lazy=False, mmap_mode=None, endianess="<"):
         for i in range(dim)
     ]
 
+    nav_dim = navigator.ndim if navigator is not None else 0
+    if nav_dim > 0:
+        metadata["_HyperSpy"] = {
+            "_sig_navigator": {
+                "data": navigator,
+                "axes": [dict(axis, navigate=False) for axis in axes[:nav_dim]],
+                "metadata": {
+                    "General": {"title": "Virtual bright field"},
+                    "Signal": {},
+                },
+            }
+        }
+
     dictionary = {
         "data": data,
         "axes": axes,
@@ -349,6 +401,76 @@ def file_reader(filename, lazy=False, mmap_mode=None, endianess="<"):
 file_reader.__doc__ %= (FILENAME_DOC, LAZY_DOC, MMAP_DOC, ENDIANESS_DOC, RETURNS_DOC)
 
 
+def _sample_intensity_range(data, number_of_frames=100):
+    """
+    Estimate the intensity range of the data from frames evenly spaced in
+    the navigation space.
+    """
+    navigation_shape = data.shape[:-2]
+    navigation_size = int(np.prod(navigation_shape))
+    indices = np.unique(
+        np.linspace(0, navigation_size - 1, min(navigation_size, number_of_frames))
+        .round()
+        .astype(int)
+    )
+    indices = np.unravel_index(indices, navigation_shape)
+    if isinstance(data, da.Array):
+        sample = data.vindex[indices]
+    else:
+        sample = data[indices]
+    minimum, maximum = dask.compute(sample.min(), sample.max())
+    return (minimum, maximum)
+
+
+def _write_block(
+    block,
+    filename,
+    offset,
+    record_dtype,
+    shape,
+    in_range,
+    navigator_offset=None,
+    block_info=None,
+):
+    """
+    Write a block of frames with their prefix in the blockfile and, if
+    ``navigator_offset`` is not None, their mean in the virtual bright field.
+    """
+    location = block_info[0]["array-location"][:-2]
+    slices = tuple(slice(start, stop) for start, stop in location)
+    indices = np.ravel_multi_index(
+        np.meshgrid(*[np.arange(*loc) for loc in location], indexing="ij"), shape
+    )
+    if in_range is not None:
+        frames = rescale_intensity(block, in_range=in_range, out_range=np.uint8)
+    else:
+        frames = block
+    records = np.memmap(
+        filename, dtype=record_dtype, mode="r+", offset=offset, shape=shape
+    )
+    records_block = records[slices]
+    records_block["MAGIC"] = 0x55AA
+    records_block["ID"] = indices
+    records_block["IMG"] = frames
+    records.flush()
+    if navigator_offset is not None:
+        navigator = block.mean(axis=(-2, -1))
+        if in_range is not None:
+            navigator = rescale_intensity(
+                navigator, in_range=in_range, out_range=np.uint8
+            )
+        vbf = np.memmap(
+            filename,
+            dtype=np.uint8,
+            mode="r+",
+            offset=navigator_offset,
+            shape=shape,
+        )
+        vbf[slices] = navigator
+        vbf.flush()
+    return np.ones(block.shape[:-2], dtype=bool)
+
+
 def file_writer(
     filename,
     signal,
@@ -356,6 +478,7 @@ def file_writer(
     navigator="navigator",
     show_progressbar=True,
     endianess="<",
+    max_workers=None,
 ):
     """
     Write signal to blockfile.
@@ -373,6 +496,11 @@ def file_writer(
           :py:class:`numpy.ushort`, are mapped onto 0-255, respectively. Does not work
           for ``float`` data types.
         - ``'minmax'``: the minimum and maximum in the dataset are mapped to 0-255.
+          For lazy signals, this requires an additional pass over the data.
+        - ``'sample'``: as ``'minmax'`` but the minimum and maximum are estimated
+          from a sample of 100 frames evenly spaced in the dataset, which avoids
+          a pass over the full data. Values outside of the estimated range are
+          clipped.
         - ``'crop'``: everything below 0 and above 255 is set to 0 and 255, respectively
         - 2-tuple of `floats` or `ints`: the intensities between these values are
           scaled between 0-255, everything below is 0 and everything above is 255.
@@ -386,6 +514,20 @@ def file_writer(
         If set to None, a zero array is stored in the file.
     %s
     %s
+    max_workers : int or None, default=None
+        Number of threads used to rescale and write the frames. The data is
+        written chunk by chunk with each chunk processed by one thread, which
+        bounds the memory usage to a few chunks per thread. The default
+        (``None``) uses the default number of threads of the dask scheduler.
+        It is ignored when using the dask distributed scheduler.
+
+    Notes
+    -----
+    The data is rescaled, cast to :py:class:`numpy.uint8` and written in a
+    single pass, chunk by chunk, using the chunks of the lazy signal or
+    chunks along the navigation axes for non-lazy signals. When the virtual
+    bright field image is computed from the data, it is computed during the
+    same pass.
     """
     smetadata = DTBox(signal["metadata"], box_dots=True)
     if intensity_scaling is None:
@@ -407,6 +549,8 @@ def file_writer(
         if signal["attributes"]["_lazy"]:
             minimum, maximum = dask.compute(minimum, maximum)
         original_scale = (minimum, maximum)
+    elif intensity_scaling == "sample":
+        original_scale = _sample_intensity_range(signal["data"])
     elif intensity_scaling == "crop":
         original_scale = (0, 255)
     else:
@@ -425,13 +569,16 @@ def file_writer(
         zero_pad = int(header["Data_offset_1"][0]) - f.tell()
         np.zeros((zero_pad,), np.byte).tofile(f)
         # Write virtual bright field
+        compute_navigator = False
         if navigator is None:
             navigator = np.zeros((signal["data"].shape[0], signal["data"].shape[1]))
         elif isinstance(navigator, str) and (navigator == "navigator"):
             if smetadata.get("_HyperSpy._sig_navigator", False):
                 navigator = smetadata["_HyperSpy._sig_navigator.data"]
             else:
-                navigator = signal["data"].mean(axis=(-2, -1))
+                # computed while writing the data
+                compute_navigator = True
+                navigator = np.zeros(signal["data"].shape[:-2])
         elif hasattr(navigator, "shape"):
             # Is numpy array-like
             # check that the shape is ok
@@ -442,7 +589,7 @@ def file_writer(
                 )
         else:
             raise ValueError("The `navigator` argument is expected to be array-like")
-        if intensity_scaling is not None:
+        if intensity_scaling is not None and not compute_navigator:
             navigator = rescale_intensity(
                 navigator, in_range=original_scale, out_range=np.uint8
             )
@@ -450,45 +597,56 @@ def file_writer(
         np.asanyarray(navigator).tofile(f)
         # Zero pad until next data block
         if f.tell() > int(header["Data_offset_2"][0]):
-            raise ValueError(
-                "Signal navigation size does not match " "data dimensions."
-            )
+            raise ValueError("Signal navigation size does not match data dimensions.")
         zero_pad = int(header["Data_offset_2"][0]) - f.tell()
         np.zeros((zero_pad,), np.byte).tofile(f)
         file_location = f.tell()
 
-    if intensity_scaling is not None:
-        array_data = rescale_intensity(
-            signal["data"],
-            in_range=original_scale,
-            out_range=np.uint8,
+        data = signal["data"]
+        # We need to pad each image with magic 'AA55', then a u32 serial
+        records = data.shape[:-2]
+        record_dtype = np.dtype(
+            [
+                ("MAGIC", endianess + "u2"),
+                ("ID", endianess + "u4"),
+                ("IMG", endianess + "u1", data.shape[-2:]),
+            ]
         )
+        # Allocate the file before writing the frames concurrently
+        f.truncate(file_location + int(np.prod(records)) * record_dtype.itemsize)
+
+    if len(records) == 0:
+        data = data[np.newaxis]
+        records = (1,)
+    lazy = isinstance(data, da.Array)
+    if lazy:
+        # Each chunk needs to contain full frames
+        data = data.rechunk({data.ndim - 2: -1, data.ndim - 1: -1})
     else:
-        array_data = signal["data"]
-    array_data = array_data.astype(endianess + "u1")
-    # Write full data stack:
-    # We need to pad each image with magic 'AA55', then a u32 serial
-    pixels = array_data.shape[-2:]
-    records = array_data.shape[:-2]
-    record_dtype = [
-        ("MAGIC", endianess + "u2"),
-        ("ID", endianess + "u4"),
-        ("IMG", endianess + "u1", pixels),
-    ]
-    magics = np.full(records, 0x55AA, dtype=endianess + "u2")
-    ids = np.arange(np.prod(records), dtype=endianess + "u4").reshape(records)
-    file_memmap = np.memmap(
-        filename, dtype=record_dtype, mode="r+", offset=file_location, shape=records
+        data = da.from_array(
+            data, chunks=("auto",) * len(records) + (-1, -1), asarray=False
+        )
+    written = data.map_blocks(
+        _write_block,
+        filename=filename,
+        offset=file_location,
+        record_dtype=record_dtype,
+        shape=records,
+        in_range=None if intensity_scaling is None else original_scale,
+        navigator_offset=(
+            int(header["Data_offset_1"][0]) if compute_navigator else None
+        ),
+        drop_axis=(data.ndim - 2, data.ndim - 1),
+        dtype=bool,
+        meta=np.array((), dtype=bool),
     )
-    file_memmap["MAGIC"] = magics
-    file_memmap["ID"] = ids
-    if signal["attributes"]["_lazy"]:
-        cm = ProgressBar if show_progressbar else dummy_context_manager
-        with cm():
-            array_data.store(file_memmap["IMG"])
-    else:
-        file_memmap["IMG"] = array_data
-    file_memmap.flush()
+    compute_kwargs = {}
+    if max_workers is not None:
+        compute_kwargs["num_workers"] = max_workers
+    # the progress bar is only shown when writing lazy data
+    cm = ProgressBar if show_progressbar and lazy else dummy_context_manager
+    with cm():
+        written.compute(**compute_kwargs)
 
 
 file_writer.__doc__ %= (
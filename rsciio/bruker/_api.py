@@ -26,21 +26,38 @@
 import codecs
 import io
 import logging
+import mmap
+import os
 import xml.etree.ElementTree as ET
 from ast import literal_eval
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from math import ceil
 from os.path import basename, splitext
 from struct import unpack as strct_unp
+from struct import unpack_from as strct_unp_from
 from zlib import decompress as unzip_block
 
 import dask
 import dask.array as da
 import numpy as np
 
-from rsciio._docstrings import FILENAME_DOC, LAZY_DOC, RETURNS_DOC
+from rsciio._docstrings import (
+    ENERGY_WINDOWS_DOC,
+    FILENAME_DOC,
+    LAZY_DOC,
+    RETURNS_DOC,
+)
+from rsciio.bruker import _unbcf_numpy
 from rsciio.utils.date_time_tools import msfiletime_to_unix
+from rsciio.utils.index_cache import (
+    get_index_cache_filename,
+    load_index_cache,
+    save_index_cache,
+)
 from rsciio.utils.tools import XmlToDict, sanitize_msxml_float
+from rsciio.utils.windowed_maps import get_energy_windows, windowed_maps_dictionary
 
 _logger = logging.getLogger(__name__)
 
@@ -55,9 +72,13 @@ except ImportError:  # pragma: no cover
     fast_unbcf = False
     _logger.info(
         """unbcf_fast library is not present...
-Falling back to slow python only backend."""
+Falling back to vectorized numpy (or numba) backend."""
     )
 
+# if the cython library is not present, use the vectorized numpy/numba
+# backend (True) or the slow python only backend (False):
+vectorized_unbcf = True
+
 # create dictionizer customized to Bruker Xml streams:
 x2d = XmlToDict(dub_attr_pre_str="XmlClass", tags_to_flatten="ClassInstance")
 
@@ -75,13 +96,15 @@ class SFSTreeItem(object):
     Attributes:
     item_raw_string -- the bytes from sfs file table describing the file
     parent -- the item higher hierarchicaly in the sfs file tree
+    pointers -- the pointer table, if already known (e.g. from the index
+    cache), otherwise it is parsed from the sfs file
 
     Methods:
     read_piece, setup_compression_metadata, get_iter_and_properties,
     get_as_BytesIO_string
     """
 
-    def __init__(self, item_raw_string, parent):
+    def __init__(self, item_raw_string, parent, pointers=None):
         self.sfs = parent
         (
             self._pointer_to_pointer_table,
@@ -102,7 +125,10 @@ class SFSTreeItem(object):
         self.some_time = msfiletime_to_unix(some_time)
         self.name = name.strip(b"\x00").decode("utf-8")
         self.size_in_chunks = self._calc_pointer_table_size()
-        if self.is_dir == 0:
+        self._compr_block_table = None
+        if pointers is not None:
+            self.pointers = pointers
+        elif self.is_dir == 0:
             self._fill_pointer_table()
 
     def _calc_pointer_table_size(self):
@@ -125,64 +151,63 @@ class SFSTreeItem(object):
         """
         # table size in number of chunks:
         n_of_chunks = ceil(self.size_in_chunks / (self.sfs.usable_chunk // 4))
-        with open(self.sfs.filename, "rb") as fn:
-            if n_of_chunks > 1:
-                next_chunk = self._pointer_to_pointer_table
-                temp_string = io.BytesIO()
-                for dummy1 in range(n_of_chunks):
-                    fn.seek(self.sfs.chunksize * next_chunk + 0x118)
-                    next_chunk = strct_unp("<I", fn.read(4))[0]
-                    fn.seek(28, 1)
-                    temp_string.write(fn.read(self.sfs.usable_chunk))
-                temp_string.seek(0)
-                temp_table = temp_string.read()
-                temp_string.close()
-            else:
-                fn.seek(self.sfs.chunksize * self._pointer_to_pointer_table + 0x138)
-                temp_table = fn.read(self.sfs.usable_chunk)
-            self.pointers = (
-                np.frombuffer(
-                    temp_table[: self.size_in_chunks * 4], dtype="uint32"
-                ).astype(np.int64)
-                * self.sfs.chunksize
-                + 0x138
+        mm = self.sfs.get_mmap()
+        if n_of_chunks > 1:
+            next_chunk = self._pointer_to_pointer_table
+            temp_table = bytearray()
+            for dummy1 in range(n_of_chunks):
+                chunk_start = self.sfs.chunksize * next_chunk
+                next_chunk = strct_unp_from("<I", mm, chunk_start + 0x118)[0]
+                temp_table += mm[
+                    chunk_start + 0x138 : chunk_start + 0x138 + self.sfs.usable_chunk
+                ]
+        else:
+            chunk_start = self.sfs.chunksize * self._pointer_to_pointer_table
+            temp_table = mm[
+                chunk_start + 0x138 : chunk_start + 0x138 + self.sfs.usable_chunk
+            ]
+        self.pointers = (
+            np.frombuffer(temp_table, dtype="uint32", count=self.size_in_chunks).astype(
+                np.int64
             )
+            * self.sfs.chunksize
+            + 0x138
+        )
 
     def read_piece(self, offset, length):
-        """Read and returns raw byte string of the file without applying
+        """Read and returns raw bytes of the file without applying
         any decompression.
 
+        The bytes are sliced from the memory map of the sfs file: if the
+        piece lies inside one sfs chunk, no copy is made, otherwise the
+        parts are copied once into a new buffer (chunks are separated by
+        the chunk headers in the sfs file).
+
         Arguments:
         offset: seek value
         length: length of the data counting from the offset
 
         Returns:
-        io.ByteIO object
+        memoryview object
         """
-        data = io.BytesIO()
-        # first block index:
-        fb_idx = offset // self.sfs.usable_chunk
-        # first block offset:
-        fbo = offset % self.sfs.usable_chunk
-        # last block index:
-        lb_idx = (offset + length) // self.sfs.usable_chunk
-        # last block cut off:
-        lbco = (offset + length) % self.sfs.usable_chunk
-        with open(self.sfs.filename, "rb") as fn:
-            if fb_idx != lb_idx:
-                fn.seek(self.pointers[fb_idx] + fbo)
-                data.write(fn.read(self.sfs.usable_chunk - fbo))
-                for i in self.pointers[fb_idx + 1 : lb_idx]:
-                    fn.seek(i)
-                    data.write(fn.read(self.sfs.usable_chunk))
-                if lbco > 0:
-                    fn.seek(self.pointers[lb_idx])
-                    data.write(fn.read(lbco))
-            else:
-                fn.seek(self.pointers[fb_idx] + fbo)
-                data.write(fn.read(length))
-        data.seek(0)
-        return data.read()
+        view = self.sfs.get_mmap_view()
+        usable_chunk = self.sfs.usable_chunk
+        # first block index, first block offset:
+        fb_idx, fbo = divmod(offset, usable_chunk)
+        # last block index, last block cut off:
+        lb_idx, lbco = divmod(offset + length, usable_chunk)
+        if fb_idx == lb_idx or (lbco == 0 and lb_idx == fb_idx + 1):
+            start = int(self.pointers[fb_idx]) + fbo
+            return view[start : start + length]
+        data = bytearray()
+        start = int(self.pointers[fb_idx])
+        data += view[start + fbo : start + usable_chunk]
+        for i in self.pointers[fb_idx + 1 : lb_idx]:
+            data += view[int(i) : int(i) + usable_chunk]
+        if lbco > 0:
+            start = int(self.pointers[lb_idx])
+            data += view[start : start + lbco]
+        return memoryview(data)
 
     def _iter_read_chunks(self, first=0):
         """Generate and return iterator for reading and returning
@@ -197,16 +222,18 @@ class SFSTreeItem(object):
         chunks -- the number of chunks to read. (default False)
         """
         last = self.size_in_chunks
-        with open(self.sfs.filename, "rb") as fn:
-            for idx in range(first, last - 1):
-                fn.seek(self.pointers[idx])
-                yield fn.read(self.sfs.usable_chunk)
-            fn.seek(self.pointers[last - 1])
-            last_stuff = self.size % self.sfs.usable_chunk
-            if last_stuff != 0:
-                yield fn.read(last_stuff)
-            else:
-                yield fn.read(self.sfs.usable_chunk)
+        usable_chunk = self.sfs.usable_chunk
+        # slicing mmap returns bytes:
+        mm = self.sfs.get_mmap()
+        for idx in range(first, last - 1):
+            start = int(self.pointers[idx])
+            yield mm[start : start + usable_chunk]
+        start = int(self.pointers[last - 1])
+        last_stuff = self.size % usable_chunk
+        if last_stuff != 0:
+            yield mm[start : start + last_stuff]
+        else:
+            yield mm[start : start + usable_chunk]
 
     def setup_compression_metadata(self):
         """parse and setup the number of compression chunks
@@ -217,10 +244,10 @@ class SFSTreeItem(object):
         self.uncompressed_blk_size, self.no_of_compr_blk
 
         """
-        with open(self.sfs.filename, "rb") as fn:
-            fn.seek(self.pointers[0])
-            # AACS signature, uncompressed size, undef var, number of blocks
-            aacs, uc_size, _, n_of_blocks = strct_unp("<IIII", fn.read(16))
+        # AACS signature, uncompressed size, undef var, number of blocks
+        aacs, uc_size, _, n_of_blocks = strct_unp_from(
+            "<IIII", self.sfs.get_mmap(), int(self.pointers[0])
+        )
         if aacs == 0x53434141:  # AACS as string
             self.uncompressed_blk_size = uc_size
             self.no_of_compr_blk = n_of_blocks
@@ -230,16 +257,48 @@ class SFSTreeItem(object):
 but compression signature is missing in the header. Aborting...."""
             )
 
-    def _iter_read_compr_chunks(self):
+    def get_compr_block_table(self):
+        """Parse (once) and return the table of compression blocks.
+
+        Returns:
+        numpy array with (n_of_blocks, 2) shape, containing offset
+        (in the raw internal file) and size of every compressed block.
+        """
+        if self._compr_block_table is None:
+            table = np.empty((self.no_of_compr_blk, 2), dtype=np.int64)
+            offset = 0x80  # the 1st compression block header
+            for i in range(self.no_of_compr_blk):
+                cpr_size = strct_unp("<I12x", self.read_piece(offset, 16))[0]
+                offset += 16
+                table[i] = offset, cpr_size
+                offset += cpr_size
+            self._compr_block_table = table
+        return self._compr_block_table
+
+    def _iter_read_compr_chunks(self, first=0, max_workers=1):
         """Generate and return reader and decompressor iterator
         for compressed with zlib compression sfs internal file.
 
+        Keyword arguments:
+        first -- the index of first compression block from which to read.
+        (default 0)
+        max_workers -- number of threads decompressing the blocks, if
+        different than 1, see _iter_read_compr_chunks_parallel. (default 1)
+
         Returns:
         iterator of decompressed data chunks.
         """
-
+        if max_workers != 1 and (self.no_of_compr_blk - first) > 1:
+            yield from self._iter_read_compr_chunks_parallel(first, max_workers)
+            return
+        if first > 0 or self._compr_block_table is not None:
+            for offset, cpr_size in self.get_compr_block_table()[first:]:
+                yield unzip_block(self.read_piece(offset, cpr_size))
+            return
+        # the table of blocks is filled on the way:
+        table = np.empty((self.no_of_compr_blk, 2), dtype=np.int64)
         offset = 0x80  # the 1st compression block header
-        for dummy1 in range(self.no_of_compr_blk):
+        for i in range(self.no_of_compr_blk):
             cpr_size = strct_unp("<I12x", self.read_piece(offset, 16))[0]
             # cpr_size, dum_size, dum_unkn, dum_size2 = strct_unp('<IIII',...
             # dum_unkn is probably some kind of checksum but
@@ -248,28 +307,90 @@ but compression signature is missing in the header. Aborting...."""
             # dum_size, which is decompressed size, also have no use...
             # as it is the same in file compression_header
             offset += 16
+            table[i] = offset, cpr_size
             raw_string = self.read_piece(offset, cpr_size)
             offset += cpr_size
             yield unzip_block(raw_string)
+        self._compr_block_table = table
+
+    def _read_and_unzip_block(self, offset, cpr_size):
+        return unzip_block(self.read_piece(offset, cpr_size))
+
+    def _iter_read_compr_chunks_parallel(self, first=0, max_workers=None):
+        """Generate and return iterator of decompressed data chunks, where
+        the blocks are read and decompressed in a pool of threads (zlib
+        releases the GIL) and are yielded in order.
+
+        The table of blocks is parsed once and the number of blocks
+        being decompressed ahead of the consumer is limited to twice the
+        number of threads to keep the memory usage bounded.
 
-    def get_iter_and_properties(self):
+        Keyword arguments:
+        first -- the index of first compression block from which to read.
+        (default 0)
+        max_workers -- number of threads, if None, the default of
+        concurrent.futures.ThreadPoolExecutor is used. (default None)
+        """
+        if max_workers is None:
+            # same default as concurrent.futures.ThreadPoolExecutor
+            max_workers = min(32, (os.cpu_count() or 1) + 4)
+        blocks = iter(self.get_compr_block_table()[first:])
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            n_ahead = 2 * max_workers
+            futures = deque()
+            try:
+                for offset, cpr_size in blocks:
+                    futures.append(
+                        executor.submit(self._read_and_unzip_block, offset, cpr_size)
+                    )
+                    if len(futures) >= n_ahead:
+                        break
+                while futures:
+                    data = futures.popleft().result()
+                    for offset, cpr_size in blocks:
+                        futures.append(
+                            executor.submit(
+                                self._read_and_unzip_block, offset, cpr_size
+                            )
+                        )
+                        break
+                    yield data
+            finally:
+                # when the consumer stops early:
+                for future in futures:
+                    future.cancel()
+
+    def get_iter_and_properties(self, offset=0, max_workers=1):
         """Generate and return the iterator of data chunks and
         properties of such chunks such as size and count.
 
         Method detects if data is compressed and uses iterator with
         decompression involved, else uses simple iterator of chunks.
 
+        Keyword arguments:
+        offset -- offset in the (uncompressed) file from which the
+        iterator starts; the first returned chunk is then shorter
+        than chunk_size. (default 0)
+        max_workers -- number of threads used to decompress the
+        compressed data, 1 to decompress in the calling thread and None
+        for the default of concurrent.futures.ThreadPoolExecutor.
+        (default 1)
+
         Returns:
             (iterator, chunk_size, number_of_chunks)
         """
         if self.sfs.compression == "None":
-            return self._iter_read_chunks(), self.sfs.usable_chunk, self.size_in_chunks
+            chunk_size = self.sfs.usable_chunk
+            first, skip = divmod(offset, chunk_size)
+            iterator = self._iter_read_chunks(first=first)
+            n_chunks = self.size_in_chunks
         elif self.sfs.compression == "zlib":
-            return (
-                self._iter_read_compr_chunks(),
-                self.uncompressed_blk_size,
-                self.no_of_compr_blk,
+            chunk_size = self.uncompressed_blk_size
+            first, skip = divmod(offset, chunk_size)
+            iterator = self._iter_read_compr_chunks(
+                first=first, max_workers=max_workers
             )
+            n_chunks = self.no_of_compr_blk
         else:
             raise RuntimeError(
                 "file",
@@ -277,6 +398,9 @@ but compression signature is missing in the header. Aborting...."""
                 " is compressed by not known and not",
                 "implemented algorithm.\n Aborting...",
             )
+        if skip > 0:
+            iterator = _skip_bytes_in_iter(iterator, skip)
+        return iterator, chunk_size, n_chunks - first
 
     def get_as_BytesIO_string(self):
         """Get the whole file as io.BytesIO object (in memory!)."""
@@ -285,6 +409,12 @@ but compression signature is missing in the header. Aborting...."""
         return data
 
 
+def _skip_bytes_in_iter(iterator, skip):
+    """Cut off the first 'skip' bytes of the first chunk of iterator."""
+    yield next(iterator)[skip:]
+    yield from iterator
+
+
 class SFS_reader(object):
     """Class to read sfs file.
     SFS is AidAim software's(tm) single file system.
@@ -299,11 +429,27 @@ class SFS_reader(object):
     Attributes
     ----------
     filename
+    index_cache
+        If not False, the pointer tables of the files, the compression
+        metadata and any other index registered in ``self.cached_index``
+        are saved to (and later loaded from) a persistent cache, see
+        :py:func:`rsciio.utils.index_cache.get_index_cache_filename`.
 
     """
 
-    def __init__(self, filename):
+    def __init__(self, filename, index_cache=False):
         self.filename = filename
+        self.index_cache = index_cache
+        self.cached_index = {}
+        self._fh = None
+        self._mmap = None
+        if index_cache:
+            self._index_cache_filename = get_index_cache_filename(
+                filename, index_cache, "sfs"
+            )
+            self.cached_index = (
+                load_index_cache(filename, self._index_cache_filename) or {}
+            )
         # read the file header
         with open(filename, "rb") as fn:
             a = fn.read(8)
@@ -321,7 +467,47 @@ class SFS_reader(object):
             self.tree_address, self.n_tree_items, self.sfs_n_of_chunks = strct_unp(
                 "<III", fn.read(12)
             )
+        from_cache = "n_pointers" in self.cached_index
         self._setup_vfs()
+        if index_cache and not from_cache:
+            self.save_index_cache()
+
+    def get_mmap(self):
+        """Return the read-only memory map of the sfs file. The file is
+        opened once and the same map is used by all the virtual files.
+        """
+        if self._mmap is None:
+            self._fh = open(self.filename, "rb")
+            self._mmap = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mmap_view = memoryview(self._mmap)
+        return self._mmap
+
+    def get_mmap_view(self):
+        """Return a memoryview of the memory map of the sfs file, slicing
+        it does not copy the data."""
+        self.get_mmap()
+        return self._mmap_view
+
+    def close(self):
+        """Close the memory map and the file handle of the sfs file."""
+        if self._mmap is not None:
+            try:
+                self._mmap_view.release()
+                self._mmap.close()
+            except BufferError:
+                # memoryviews slices returned by read_piece are still in use,
+                # the map will be closed when they are garbage collected
+                pass
+            self._fh.close()
+            self._mmap = self._fh = self._mmap_view = None
+
+    def __getstate__(self):
+        # memory map and file handle are not picklable and are reopened
+        # on demand (e.g. in dask workers)
+        state = self.__dict__.copy()
+        state["_fh"] = state["_mmap"] = None
+        state.pop("_mmap_view", None)
+        return state
 
     def _setup_vfs(self):
         """Setup the virtual file system tree represented as python dictionary
@@ -331,46 +517,109 @@ class SFS_reader(object):
         --------
         SFSTreeItem
         """
-        with open(self.filename, "rb") as fn:
-            # check if file tree do not exceed one chunk:
-            n_file_tree_chunks = ceil(
-                (self.n_tree_items * 0x200) / (self.chunksize - 0x20)
-            )
-            if n_file_tree_chunks == 1:
-                # file tree do not exceed one chunk in bcf:
-                fn.seek(self.chunksize * self.tree_address + 0x138)
-                raw_tree = fn.read(0x200 * self.n_tree_items)
-            else:
-                temp_str = io.BytesIO()
-                tree_address = self.tree_address
-                tree_items_in_chunk = (self.chunksize - 0x20) // 0x200
-                for i in range(n_file_tree_chunks):
-                    # jump to tree/list address:
-                    fn.seek(self.chunksize * tree_address + 0x118)
-                    # next tree/list address:
-                    tree_address = strct_unp("<I", fn.read(4))[0]
-                    fn.seek(28, 1)
-                    temp_str.write(fn.read(tree_items_in_chunk * 0x200))
-                temp_str.seek(0)
-                raw_tree = temp_str.read(self.n_tree_items * 0x200)
-                temp_str.close()
-            temp_item_list = [
-                SFSTreeItem(raw_tree[i * 0x200 : (i + 1) * 0x200], self)
-                for i in range(self.n_tree_items)
-            ]
-            # temp list with parents of items
-            paths = [[h.parent] for h in temp_item_list]
-        # checking the compression header which can be different per file:
-        self._check_the_compresion(temp_item_list)
-        if self.compression == "zlib":
-            for c in temp_item_list:
-                if not c.is_dir:
-                    c.setup_compression_metadata()
+        mm = self.get_mmap()
+        # check if file tree do not exceed one chunk:
+        n_file_tree_chunks = ceil((self.n_tree_items * 0x200) / (self.chunksize - 0x20))
+        if n_file_tree_chunks == 1:
+            # file tree do not exceed one chunk in bcf:
+            start = self.chunksize * self.tree_address + 0x138
+            raw_tree = mm[start : start + 0x200 * self.n_tree_items]
+        else:
+            raw_tree = bytearray()
+            tree_address = self.tree_address
+            tree_items_in_chunk = (self.chunksize - 0x20) // 0x200
+            for i in range(n_file_tree_chunks):
+                # jump to tree/list address:
+                start = self.chunksize * tree_address
+                # next tree/list address:
+                tree_address = strct_unp_from("<I", mm, start + 0x118)[0]
+                raw_tree += mm[
+                    start + 0x138 : start + 0x138 + tree_items_in_chunk * 0x200
+                ]
+            raw_tree = bytes(raw_tree[: self.n_tree_items * 0x200])
+        pointers = self._get_cached_pointers()
+        temp_item_list = [
+            SFSTreeItem(raw_tree[i * 0x200 : (i + 1) * 0x200], self, pointers[i])
+            for i in range(self.n_tree_items)
+        ]
+        # temp list with parents of items
+        paths = [[h.parent] for h in temp_item_list]
+        self._items = temp_item_list
+        if "n_pointers" in self.cached_index:
+            self._set_cached_compression(temp_item_list)
+        else:
+            # checking the compression header which can be different per file:
+            self._check_the_compresion(temp_item_list)
+            if self.compression == "zlib":
+                for c in temp_item_list:
+                    if not c.is_dir:
+                        c.setup_compression_metadata()
         # convert the items to virtual file system tree
         dict_tree = self._flat_items_to_dict(paths, temp_item_list)
         # and finaly set the Virtual file system:
         self.vfs = dict_tree["root"]
 
+    def _get_cached_pointers(self):
+        """return the list of pointer tables of the tree items from the
+        index cache, or list of None if there is no cache"""
+        if "n_pointers" not in self.cached_index:
+            return [None] * self.n_tree_items
+        n_pointers = self.cached_index["n_pointers"]
+        pointers = np.split(
+            self.cached_index["pointers"], np.cumsum(np.maximum(n_pointers, 0))[:-1]
+        )
+        return [p if n >= 0 else None for p, n in zip(pointers, n_pointers)]
+
+    def _set_cached_compression(self, temp_item_list):
+        """set the compression metadata of the tree items from the
+        index cache"""
+        self.compression = str(self.cached_index["compression"])
+        compr_meta = self.cached_index["compr_meta"]
+        compr_tables = np.split(
+            self.cached_index["compr_tables"],
+            np.cumsum(np.maximum(compr_meta[:, 2], 0))[:-1],
+        )
+        for c, meta, table in zip(temp_item_list, compr_meta, compr_tables):
+            if self.compression == "zlib" and not c.is_dir:
+                c.uncompressed_blk_size, c.no_of_compr_blk = int(meta[0]), int(meta[1])
+                if meta[2] >= 0:
+                    c._compr_block_table = table
+
+    def save_index_cache(self):
+        """Save the pointer tables of the files, compression metadata and
+        the tables of compression blocks (if already parsed) together with
+        the arrays from self.cached_index to the persistent index cache."""
+        n_pointers = []
+        compr_meta = []
+        pointers = []
+        compr_tables = []
+        for c in self._items:
+            n_pointers.append(-1 if c.is_dir else len(c.pointers))
+            if not c.is_dir:
+                pointers.append(c.pointers)
+            table = c._compr_block_table
+            if table is not None:
+                compr_tables.append(table)
+            compr_meta.append(
+                (
+                    getattr(c, "uncompressed_blk_size", 0),
+                    getattr(c, "no_of_compr_blk", 0),
+                    -1 if table is None else len(table),
+                )
+            )
+        self.cached_index.update(
+            {
+                "n_pointers": np.array(n_pointers, dtype=np.int64),
+                "pointers": np.concatenate(pointers + [np.empty(0, dtype=np.int64)]),
+                "compression": np.array(self.compression),
+                "compr_meta": np.array(compr_meta, dtype=np.int64).reshape(-1, 3),
+                "compr_tables": np.concatenate(
+                    compr_tables + [np.empty((0, 2), dtype=np.int64)]
+                ),
+            }
+        )
+        save_index_cache(self.filename, self._index_cache_filename, **self.cached_index)
+
     def _flat_items_to_dict(self, paths, temp_item_list):
         """place items from flat list into dictionary tree
         of virtual file system
@@ -404,17 +653,17 @@ class SFS_reader(object):
 
     def _check_the_compresion(self, temp_item_list):
         """parse, check and setup the self.compression"""
-        with open(self.filename, "rb") as fn:
-            # Find if there is compression:
-            for c in temp_item_list:
-                if not c.is_dir:
-                    fn.seek(c.pointers[0])
-                    if fn.read(4) == b"\x41\x41\x43\x53":  # string AACS
-                        self.compression = "zlib"
-                    else:
-                        self.compression = "None"
-                    # compression is global, can't be diferent per file in sfs
-                    break
+        mm = self.get_mmap()
+        # Find if there is compression:
+        for c in temp_item_list:
+            if not c.is_dir:
+                start = int(c.pointers[0])
+                if mm[start : start + 4] == b"\x41\x41\x43\x53":  # string AACS
+                    self.compression = "zlib"
+                else:
+                    self.compression = "None"
+                # compression is global, can't be diferent per file in sfs
+                break
 
     def get_file(self, path):
         """Return the SFSTreeItem (aka internal file) object from
@@ -880,14 +1129,18 @@ class BCF_reader(SFS_reader):
     filename
 
     Methods:
-    check_index_valid, parse_hypermap
+    check_index_valid, get_line_offsets, parse_hypermap, parse_hypermaps,
+    parse_hypermap_sums
 
     The class instantiates HyperHeader class as self.header attribute
     where all metadata, sum eds spectras, (SEM) images are stored.
+
+    If index_cache is not False, the offsets of the hypermap lines are
+    saved in the persistent index cache together with the sfs index.
     """
 
-    def __init__(self, filename, instrument=None):
-        SFS_reader.__init__(self, filename)
+    def __init__(self, filename, instrument=None, index_cache=False):
+        SFS_reader.__init__(self, filename, index_cache=index_cache)
         header_file = self.get_file("EDSDatabase/HeaderData")
         self.available_indexes = []
         # get list of presented indexes from file tree of binary sfs container
@@ -902,6 +1155,10 @@ class BCF_reader(SFS_reader):
             sanitized_bytes, self.available_indexes, instrument=instrument
         )
         self.hypermap = {}
+        self._line_offsets = {}
+        for i in self.available_indexes:
+            if "line_offsets%i" % i in self.cached_index:
+                self._line_offsets[i] = self.cached_index["line_offsets%i" % i]
 
     def check_index_valid(self, index):
         """check and return if index is valid"""
@@ -916,13 +1173,67 @@ class BCF_reader(SFS_reader):
             )
         return index
 
-    def parse_hypermap(self, index=None, downsample=1, cutoff_at_kV=None, lazy=False):
+    def get_line_offsets(self, index=None, max_workers=None):
+        """Return the offsets of the lines of the hypermap in the
+        (uncompressed) SpectrumData stream.
+
+        The stream is scanned only once (skipping the pixel data) and the
+        result is kept for the later calls and saved in the index cache
+        (if enabled).
+
+        Parameters
+        ----------
+        index : None or int
+            The index of hypermap in bcf if there is more than one
+            hyper map in file.
+        max_workers : None or int
+            Number of threads decompressing the data (if compressed)
+            during the scan. Default is None, for the default number of
+            threads of concurrent.futures.ThreadPoolExecutor.
+
+        Returns
+        -------
+        line_offsets : numpy.ndarray
+            Array of height + 1 offsets, where the last item is the end
+            of the last line.
+        """
+        if index is None:
+            index = self.def_index
+        if index not in self._line_offsets:
+            vrt_file_hand = self.get_file("EDSDatabase/SpectrumData" + str(index))
+            if fast_unbcf:
+                index_func = unbcf_fast.index_lines
+            elif vectorized_unbcf:
+                index_func = _unbcf_numpy.index_lines
+            else:
+                index_func = py_index_hypermap_lines
+            self._line_offsets[index] = index_func(
+                vrt_file_hand, max_workers=max_workers
+            )
+            if self.compression == "zlib":
+                # complete the table of blocks, if not done during the scan:
+                vrt_file_hand.get_compr_block_table()
+            if self.index_cache:
+                self.cached_index["line_offsets%i" % index] = self._line_offsets[index]
+                self.save_index_cache()
+        return self._line_offsets[index]
+
+    def parse_hypermap(
+        self,
+        index=None,
+        downsample=1,
+        cutoff_at_kV=None,
+        lazy=False,
+        chunks="auto",
+        max_workers=None,
+    ):
         """Unpack the Delphi/Bruker binary spectral map and return
         numpy array in memory efficient way.
 
-        Pure python/numpy implementation -- slow, or
-        cython/memoryview/numpy implimentation if compilied and present
-        (fast) is used.
+        Cython/memoryview/numpy implimentation if compilied and present
+        (fast) is used, otherwise vectorized numpy (or numba if installed)
+        implementation. Pure python/numpy implementation -- slow, is used
+        if ``vectorized_unbcf`` is set to False.
 
         Parameters
         ----------
@@ -943,6 +1254,17 @@ class BCF_reader(SFS_reader):
         lazy : bool
             It True, returns dask.array otherwise a numpy.array. Default is
             False.
+        chunks : int, tuple or str
+            Chunking of the height axis of the lazy array, the width and
+            energy axes are never chunked. Every chunk parses only its own
+            band of lines. Default is "auto".
+        max_workers : None or int
+            Number of threads decompressing the data, if compressed, while
+            it is parsed. 1 disables the parallel decompression. Default is
+            None, for the default number of threads of
+            concurrent.futures.ThreadPoolExecutor. When lazy, it applies
+            only to the scan of lines as the chunks are decompressed in
+            parallel by dask.
 
         Returns
         -------
@@ -952,6 +1274,247 @@ class BCF_reader(SFS_reader):
         if index is None:
             index = self.def_index
 
+        shape = self._get_hypermap_shape(index, downsample, cutoff_at_kV)
+        sfs_file = SFS_reader(self.filename, index_cache=self.index_cache)
+        vrt_file_hand = sfs_file.get_file("EDSDatabase/SpectrumData" + str(index))
+        parse_func, parse_lines_func, for_numpy = _get_hypermap_parser()
+        dtype = self.header.estimate_map_depth(
+            index=index, downsample=downsample, for_numpy=for_numpy
+        )
+        if lazy:
+            # the lines are scanned by the first task of the graph, which
+            # every chunk depends on, and not when building the graph:
+            line_offsets = dask.delayed(_index_hypermap_lines)(
+                self, index, vrt_file_hand, max_workers=max_workers
+            )
+            height = self.header.image.height
+            # the parsers always return unsigned integers:
+            out_dtype = np.dtype("u%i" % np.dtype(dtype).itemsize)
+            if isinstance(chunks, (tuple, list)):
+                chunks = chunks[0]
+            row_chunks = da.core.normalize_chunks(
+                (chunks, -1, -1), shape=shape, dtype=out_dtype
+            )[0]
+            blocks = []
+            first_row = 0
+            for n_rows in row_chunks:
+                first_line = first_row * downsample
+                n_lines = min(n_rows * downsample, height - first_line)
+                block_shape = (n_rows,) + shape[1:]
+                value = dask.delayed(_parse_hypermap_lines)(
+                    parse_lines_func,
+                    vrt_file_hand,
+                    line_offsets,
+                    first_line,
+                    n_lines,
+                    block_shape,
+                    dtype,
+                    downsample=downsample,
+                )
+                blocks.append(
+                    da.from_delayed(value, shape=block_shape, dtype=out_dtype)
+                )
+                first_row += n_rows
+            result = da.concatenate(blocks, axis=0)
+        else:
+            try:
+                result = parse_func(
+                    vrt_file_hand,
+                    shape,
+                    dtype,
+                    downsample=downsample,
+                    max_workers=max_workers,
+                )
+            finally:
+                sfs_file.close()
+        return result
+
+    def parse_hypermaps(
+        self,
+        indexes=None,
+        downsample=1,
+        cutoff_at_kV=None,
+        stack=True,
+        max_workers=None,
+        processes=None,
+    ):
+        """Unpack several hypermaps of the bcf (e.g. a time or drift
+        series), sequentially or concurrently, every hypermap in its own
+        process.
+
+        All hypermaps are returned with the same dtype, large enough for
+        every hypermap (as estimated by HyperHeader.estimate_map_depth).
+        When stacked, the hypermaps must have the same height and width
+        and the number of channels is the largest one, the hypermaps with
+        less channels being padded with zeros.
+
+        Parameters
+        ----------
+        indexes : None or list of int
+            The indexes of the hypermaps, by default all available
+            indexes.
+        downsample : int
+            Downsampling factor, see parse_hypermap. Default is 1.
+        cutoff_at_kV : None, float, int or str
+            Value or method to truncate the array at energy in kV, see
+            parse_hypermap. Default is None.
+        stack : bool
+            If True, return one array with the hypermaps stacked along
+            the first axis, otherwise a list of arrays with their own
+            shape. Default is True.
+        max_workers : None or int
+            Number of threads decompressing the data, see parse_hypermap.
+            Only used when the hypermaps are decoded sequentially. Default
+            is None.
+        processes : None or int
+            Number of processes decoding the hypermaps concurrently. None
+            or 1 decodes the hypermaps sequentially in the calling process.
+            As the hypermaps are decoded in a
+            concurrent.futures.ProcessPoolExecutor, the calling script
+            needs to be guarded by ``if __name__ == "__main__":`` on
+            platforms starting the processes with "spawn" (Windows,
+            macOS). Default is None.
+
+        Returns
+        -------
+        result : numpy.ndarray or list of numpy.ndarray
+            Bruker hypermaps, with (index,y,x,E) shape if stacked, else
+            list of hypermaps with (y,x,E) shape.
+        """
+        if indexes is None:
+            indexes = self.available_indexes
+        indexes = [self.check_index_valid(index) for index in indexes]
+        parse_func, _, for_numpy = _get_hypermap_parser()
+        dtype = np.result_type(
+            *[
+                self.header.estimate_map_depth(
+                    index=index, downsample=downsample, for_numpy=for_numpy
+                )
+                for index in indexes
+            ]
+        )
+        shapes = [
+            self._get_hypermap_shape(index, downsample, cutoff_at_kV)
+            for index in indexes
+        ]
+        # the parsers always return unsigned integers:
+        out_dtype = np.dtype("u%i" % dtype.itemsize)
+        if stack:
+            if len(set(shape[:2] for shape in shapes)) > 1:
+                raise ValueError(
+                    "The hypermaps can't be stacked as their height and "
+                    f"width differ: {[shape[:2] for shape in shapes]}."
+                )
+            n_channels = max(shape[2] for shape in shapes)
+            result = np.zeros(
+                (len(indexes),) + shapes[0][:2] + (n_channels,), dtype=out_dtype
+            )
+        else:
+            result = [None] * len(indexes)
+        processes = min(processes or 1, len(indexes))
+        args = [
+            (
+                parse_func,
+                self.filename,
+                index,
+                shape,
+                dtype,
+                downsample,
+                self.index_cache,
+                # the processes are already parallel, decompress in the
+                # same thread
+                1 if processes > 1 else max_workers,
+            )
+            for index, shape in zip(indexes, shapes)
+        ]
+        if processes > 1:
+            executor = ProcessPoolExecutor(max_workers=processes)
+            hypermaps = executor.map(_parse_hypermap_in_process, *zip(*args))
+        else:
+            executor = None
+            hypermaps = (_parse_hypermap_in_process(*arg) for arg in args)
+        try:
+            for i, hypermap in enumerate(hypermaps):
+                if stack:
+                    result[i, ..., : hypermap.shape[2]] = hypermap
+                else:
+                    result[i] = hypermap
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return result
+
+    def parse_hypermap_sums(
+        self,
+        index=None,
+        downsample=1,
+        cutoff_at_kV=None,
+        counts=True,
+        spectrum=True,
+        energy_windows=None,
+        max_workers=None,
+    ):
+        """Unpack the Delphi/Bruker binary spectral map in a single pass
+        and return only the requested reductions, without the (y,x,E)
+        hypermap: memory usage is of the order of the size of the image
+        plus the number of channels.
+
+        Parameters
+        ----------
+        index : None or int
+            The index of hypermap in bcf if there is more than one
+            hyper map in file.
+        downsample : int
+            Downsampling factor, see parse_hypermap. Default is 1.
+        cutoff_at_kV : None, float, int or str
+            Value or method to truncate the energy range in kV, see
+            parse_hypermap. Default is None.
+        counts : bool
+            Whether to return the total counts of every pixel. Default is
+            True.
+        spectrum : bool
+            Whether to return the sum spectrum. Default is True.
+        energy_windows : None or list of (float, float)
+            The (start, end) energies in kV of the windows, for which the
+            counts of every pixel are returned. Default is None.
+        max_workers : None or int
+            Number of threads decompressing the data, if compressed, see
+            parse_hypermap. Default is None.
+
+        Returns
+        -------
+        result : dict
+            Dictionary of numpy.ndarray (uint64) with the requested
+            reductions: "counts" with (y,x) shape, "spectrum" with (E,)
+            shape and "windows" with (number of windows,y,x) shape.
+        """
+        if index is None:
+            index = self.def_index
+        shape = self._get_hypermap_shape(index, downsample, cutoff_at_kV)
+        windows = None
+        if energy_windows is not None:
+            eds = self.header.spectra_data[index]
+            windows = [
+                (eds.energy_to_channel(start), eds.energy_to_channel(end))
+                for start, end in energy_windows
+            ]
+        sfs_file = SFS_reader(self.filename, index_cache=self.index_cache)
+        vrt_file_hand = sfs_file.get_file("EDSDatabase/SpectrumData" + str(index))
+        try:
+            return _unbcf_numpy.reduce_to_numpy(
+                vrt_file_hand,
+                shape,
+                downsample=downsample,
+                counts=counts,
+                spectrum=spectrum,
+                windows=windows,
+                max_workers=max_workers,
+            )
+        finally:
+            sfs_file.close()
+
+    def _get_hypermap_shape(self, index, downsample=1, cutoff_at_kV=None):
+        """Return the shape of the (downsampled and cut off) hypermap."""
         if type(cutoff_at_kV) in (int, float):
             eds = self.header.spectra_data[index]
             n_channels = eds.energy_to_channel(cutoff_at_kV)
@@ -961,38 +1524,87 @@ class BCF_reader(SFS_reader):
             n_channels = self.header.get_consistent_min_channels(index=index)
         else:  # None
             n_channels = self.header.spectra_data[index].data.size
-
-        shape = (
+        return (
             ceil(self.header.image.height / downsample),
             ceil(self.header.image.width / downsample),
             n_channels,
         )
-        sfs_file = SFS_reader(self.filename)
-        vrt_file_hand = sfs_file.get_file("EDSDatabase/SpectrumData" + str(index))
-        if fast_unbcf:
-            parse_func = unbcf_fast.parse_to_numpy
-            dtype = self.header.estimate_map_depth(
-                index=index, downsample=downsample, for_numpy=False
-            )
-        else:
-            parse_func = py_parse_hypermap
-            dtype = self.header.estimate_map_depth(
-                index=index, downsample=downsample, for_numpy=True
-            )
-        if lazy:
-            value = dask.delayed(parse_func)(
-                vrt_file_hand, shape, dtype, downsample=downsample
-            )
-            result = da.from_delayed(value, shape=shape, dtype=dtype)
-        else:
-            result = parse_func(vrt_file_hand, shape, dtype, downsample=downsample)
-        return result
 
     def add_filename_to_general(self, item):
         """hypy helper method"""
         item["metadata"]["General"]["original_filename"] = basename(self.filename)
 
 
+def _get_hypermap_parser():
+    """Return the functions parsing the whole hypermap and a band of its
+    lines of the available (or selected) backend, and if the dtype of
+    the hypermap should be signed (see HyperHeader.estimate_map_depth)."""
+    if fast_unbcf:
+        return unbcf_fast.parse_to_numpy, unbcf_fast.parse_lines_to_numpy, False
+    elif vectorized_unbcf:
+        return _unbcf_numpy.parse_to_numpy, _unbcf_numpy.parse_lines_to_numpy, False
+    else:
+        return py_parse_hypermap, py_parse_hypermap_lines, True
+
+
+def _index_hypermap_lines(bcf, index, vrt_file, max_workers=None):
+    """Return the offsets of the lines of the hypermap of index, scanning
+    the hypermap if not already done, and share the table of compression
+    blocks indexed by the scan with vrt_file, so that it has not to be
+    parsed in every chunk."""
+    line_offsets = bcf.get_line_offsets(index, max_workers=max_workers)
+    if bcf.compression == "zlib":
+        vrt_file._compr_block_table = bcf.get_file(
+            "EDSDatabase/SpectrumData" + str(index)
+        ).get_compr_block_table()
+    return line_offsets
+
+
+def _parse_hypermap_lines(
+    parse_lines_func,
+    vrt_file,
+    line_offsets,
+    first_line,
+    n_lines,
+    shape,
+    dtype,
+    downsample=1,
+):
+    """Parse the band of n_lines lines from first_line of the hypermap
+    with the given offsets of the lines."""
+    return parse_lines_func(
+        vrt_file,
+        int(line_offsets[first_line]),
+        first_line,
+        n_lines,
+        shape,
+        dtype,
+        downsample=downsample,
+    )
+
+
+def _parse_hypermap_in_process(
+    parse_func,
+    filename,
+    index,
+    shape,
+    dtype,
+    downsample,
+    index_cache=False,
+    max_workers=1,
+):
+    """Parse the whole hypermap of index in a separate SFS_reader, which
+    can be used in a worker process."""
+    sfs_file = SFS_reader(filename, index_cache=index_cache)
+    try:
+        vrt_file = sfs_file.get_file("EDSDatabase/SpectrumData" + str(index))
+        return parse_func(
+            vrt_file, shape, dtype, downsample=downsample, max_workers=max_workers
+        )
+    finally:
+        sfs_file.close()
+
+
 def spx_reader(filename, lazy=False):
     with open(filename, "br") as fn:
         xml_str = fn.read()
@@ -1061,7 +1673,7 @@ def spx_reader(filename, lazy=False):
 st = {1: "B", 2: "B", 4: "H", 8: "I", 16: "Q"}
 
 
-def py_parse_hypermap(virtual_file, shape, dtype, downsample=1):
+def py_parse_hypermap(virtual_file, shape, dtype, downsample=1, max_workers=1):
     """Unpack the Delphi/Bruker binary spectral map and return
     numpy array in memory efficient way using pure python implementation.
     (Slow!)
@@ -1082,6 +1694,7 @@ def py_parse_hypermap(virtual_file, shape, dtype, downsample=1):
     shape -- numpy shape
     dtype -- numpy dtype
     downsample -- downsample factor
+    max_workers -- number of threads decompressing the data
 
     note!: downsample, shape and dtype are interconnected and needs
     to be properly calculated otherwise wrong output or segfault
@@ -1091,26 +1704,73 @@ def py_parse_hypermap(virtual_file, shape, dtype, downsample=1):
     -------
     numpy array of bruker hypermap, with (y, x, E) shape.
     """
-    iter_data, size_chnk = virtual_file.get_iter_and_properties()[:2]
-    dwn_factor = downsample
-    max_chan = shape[2]
+    iter_data = virtual_file.get_iter_and_properties(max_workers=max_workers)[0]
     buffer1 = next(iter_data)
     height, width = strct_unp("<ii", buffer1[:8])
     # hyper map as very flat array:
     vfa = np.zeros(shape[0] * shape[1] * shape[2], dtype=dtype)
-    offset = 0x1A0
-    size = size_chnk
-    for line_cnt in range(height):
+    _py_parse_lines(iter_data, buffer1, 0x1A0, vfa, shape, 0, height, downsample)
+    vfa.resize((ceil(height / downsample), ceil(width / downsample), shape[2]))
+    # check if array is signed, and convert to unsigned
+    if str(vfa.dtype)[0] == "i":
+        new_dtype = "".join(["u", str(vfa.dtype)])
+        vfa.dtype = new_dtype
+    return vfa
+
+
+def py_parse_hypermap_lines(
+    virtual_file, line_offset, first_line, n_lines, shape, dtype, downsample=1
+):
+    """Unpack the band of lines of the Delphi/Bruker binary spectral map
+    using pure python implementation. (Slow!)
+
+    Python counterpart of ``unbcf_fast.parse_lines_to_numpy``.
+
+    Parameters
+    ----------
+    virtual_file -- virtual file handle returned by SFS_reader instance
+    line_offset -- offset of the first line in the (uncompressed) stream,
+        as returned by py_index_hypermap_lines
+    first_line -- index of the first line, should be multiple of downsample
+    n_lines -- number of lines to unpack
+    shape -- numpy shape of the band
+    dtype -- numpy dtype
+    downsample -- downsample factor
+
+    Returns
+    -------
+    numpy array of the band of bruker hypermap, with (y, x, E) shape.
+    """
+    iter_data = virtual_file.get_iter_and_properties(offset=line_offset)[0]
+    buffer1 = next(iter_data)
+    vfa = np.zeros(shape[0] * shape[1] * shape[2], dtype=dtype)
+    _py_parse_lines(iter_data, buffer1, 0, vfa, shape, first_line, n_lines, downsample)
+    vfa.resize(shape)
+    if str(vfa.dtype)[0] == "i":
+        new_dtype = "".join(["u", str(vfa.dtype)])
+        vfa.dtype = new_dtype
+    return vfa
+
+
+def _py_parse_lines(
+    iter_data, buffer1, offset, vfa, shape, first_line, n_lines, dwn_factor
+):
+    """Unpack n_lines of the hypermap into the flat array vfa; buffer1 at
+    offset should point to the begining of the first_line."""
+    max_chan = shape[2]
+    row_offset = first_line // dwn_factor
+    size = len(buffer1)
+    for line_cnt in range(first_line, first_line + n_lines):
         if (offset + 4) >= size:
-            size = size_chnk + size - offset
-            buffer1 = buffer1[offset:] + next(iter_data)
+            buffer1 = buffer1[offset:] + next(iter_data, b"")
+            size = len(buffer1)
             offset = 0
         line_head = strct_unp("<i", buffer1[offset : offset + 4])[0]
         offset += 4
         for dummy1 in range(line_head):
             if (offset + 22) >= size:
-                size = size_chnk + size - offset
-                buffer1 = buffer1[offset:] + next(iter_data)
+                buffer1 = buffer1[offset:] + next(iter_data, b"")
+                size = len(buffer1)
                 offset = 0
             # the pixel header contains such information:
             # x index of pixel (uint32);
@@ -1136,12 +1796,12 @@ def py_parse_hypermap(virtual_file, shape, dtype, downsample=1):
                 data_size2,
             ) = strct_unp("<IHHIHHHI", buffer1[offset : offset + 22])
             pix_idx = (x_pix // dwn_factor) + (
-                ceil(width / dwn_factor) * (line_cnt // dwn_factor)
+                shape[1] * (line_cnt // dwn_factor - row_offset)
             )
             offset += 22
             if (offset + data_size2) >= size:
-                buffer1 = buffer1[offset:] + next(iter_data)
-                size = size_chnk + size - offset
+                buffer1 = buffer1[offset:] + next(iter_data, b"")
+                size = len(buffer1)
                 offset = 0
             if flag == 0:
                 data1 = buffer1[offset : offset + data_size2]
@@ -1215,8 +1875,8 @@ def py_parse_hypermap(virtual_file, shape, dtype, downsample=1):
                     add_s = strct_unp("<I", buffer1[offset : offset + 4])[0]
                     offset += 4
                     if (offset + add_s) >= size:
-                        buffer1 = buffer1[offset:] + next(iter_data)
-                        size = size_chnk + size - offset
+                        buffer1 = buffer1[offset:] + next(iter_data, b"")
+                        size = len(buffer1)
                         offset = 0
                     # the additional pulses:
                     add_pulses = strct_unp(
@@ -1236,12 +1896,63 @@ def py_parse_hypermap(virtual_file, shape, dtype, downsample=1):
                 vfa[max_chan * pix_idx : chan1 + max_chan * pix_idx] = pixel[:chan1]
             else:
                 vfa[max_chan * pix_idx : chan1 + max_chan * pix_idx] += pixel[:chan1]
-    vfa.resize((ceil(height / dwn_factor), ceil(width / dwn_factor), max_chan))
-    # check if array is signed, and convert to unsigned
-    if str(vfa.dtype)[0] == "i":
-        new_dtype = "".join(["u", str(vfa.dtype)])
-        vfa.dtype = new_dtype
-    return vfa
+
+
+def py_index_hypermap_lines(virtual_file, max_workers=1):
+    """Scan the Delphi/Bruker binary spectral map, skipping the pixel
+    data, and return the offsets of the begining of every line in the
+    (uncompressed) stream using pure python implementation.
+
+    Python counterpart of ``unbcf_fast.index_lines``.
+
+    Parameters
+    ----------
+    virtual_file -- virtual file handle returned by SFS_reader instance
+    max_workers -- number of threads decompressing the data
+
+    Returns
+    -------
+    numpy array (uint64) with height + 1 items, where the last item
+    is the offset of the end of the last line.
+    """
+    iter_data = virtual_file.get_iter_and_properties(max_workers=max_workers)[0]
+    buffer1 = next(iter_data)
+    height = strct_unp("<i", buffer1[:4])[0]
+    line_offsets = np.zeros(height + 1, dtype=np.uint64)
+    # absolute position of the begining of buffer1:
+    base = 0
+    offset = 0x1A0
+    for line_cnt in range(height + 1):
+        line_offsets[line_cnt] = base + offset
+        if line_cnt == height:
+            break
+        if (offset + 4) > len(buffer1):
+            base += offset
+            buffer1 = buffer1[offset:] + next(iter_data)
+            offset = 0
+        line_head = strct_unp("<i", buffer1[offset : offset + 4])[0]
+        offset += 4
+        for dummy1 in range(line_head):
+            if (offset + 22) > len(buffer1):
+                base += offset
+                buffer1 = buffer1[offset:] + next(iter_data)
+                offset = 0
+            flag, n_of_pulses, data_size2 = strct_unp(
+                "<12xH2xHI", buffer1[offset : offset + 22]
+            )
+            offset += 22
+            if flag < 2:
+                offset += data_size2
+            elif n_of_pulses > 0:
+                offset += data_size2 + 2 * n_of_pulses
+            else:
+                offset += data_size2
+            # skip whole chunks without concatenating them:
+            while offset > len(buffer1):
+                offset -= len(buffer1)
+                base += len(buffer1)
+                buffer1 = next(iter_data)
+    return line_offsets
 
 
 def file_reader(
@@ -1252,6 +1963,11 @@ def file_reader(
     downsample=1,
     cutoff_at_kV=None,
     instrument=None,
+    chunks="auto",
+    index_cache=False,
+    max_workers=None,
+    energy_windows=None,
+    processes=None,
 ):
     """
     Read a Bruker ``.bcf`` or ``.spx`` file.
@@ -1288,6 +2004,36 @@ def file_reader(
         the full channel range.
     instrument : str or None, default=None
         Can be either ``'TEM'`` or ``'SEM'``.
+    chunks : int, tuple or ``'auto'``, default='auto'
+        The chunks of the height axis used when reading the hypermap lazily;
+        width and energy axes are not chunked. Each chunk decodes only its own
+        band of lines, which are located by a single scan of the hypermap
+        when the first chunk is computed (or read from the index cache).
+        Only relevant for ``.bcf`` files and ``lazy=True``.
+    index_cache : bool or str, default=False
+        Whether to save the index of the ``.bcf`` file (the tables of the
+        internal file system, of the compression blocks and the offsets of the
+        lines of the hypermaps) to a persistent cache, so that later opening
+        and lazy reading of the same file skip parsing it again. If ``True``,
+        the cache is saved in the user cache directory, if a string, in the
+        given directory (e.g. the directory of the file). The cache is ignored
+        as soon as the size or the modification time of the file changes.
+    max_workers : int or None, default=None
+        Number of threads used to decompress the zlib compressed ``.bcf``
+        files while the hypermap is parsed. ``1`` decompresses in the calling
+        thread. The default (``None``) uses the default number of threads of
+        :py:class:`concurrent.futures.ThreadPoolExecutor`.
+    processes : int or None, default=None
+        Number of processes decoding the hypermaps concurrently, when several
+        hypermaps are loaded (``index='all'``) and ``lazy=False``. The
+        hypermaps are then returned with the same dtype, large enough for all
+        of them. The default (``None``) decodes them sequentially in the
+        calling process, each hypermap with its own dtype. As the
+        hypermaps are decoded in a
+        :py:class:`concurrent.futures.ProcessPoolExecutor`, the calling script
+        must be guarded by ``if __name__ == "__main__":`` on platforms
+        starting processes with ``spawn`` (Windows and macOS).
+    %s
 
     %s
 
@@ -1323,6 +2069,11 @@ def file_reader(
             downsample=downsample,
             cutoff_at_kV=cutoff_at_kV,
             instrument=instrument,
+            chunks=chunks,
+            index_cache=index_cache,
+            max_workers=max_workers,
+            energy_windows=energy_windows,
+            processes=processes,
         )
     elif ext == "spx":
         to_return = spx_reader(
@@ -1335,7 +2086,7 @@ def file_reader(
     return to_return
 
 
-file_reader.__doc__ %= (FILENAME_DOC, LAZY_DOC, RETURNS_DOC)
+file_reader.__doc__ %= (FILENAME_DOC, LAZY_DOC, ENERGY_WINDOWS_DOC, RETURNS_DOC)
 
 
 def bcf_reader(
@@ -1346,6 +2097,11 @@ def bcf_reader(
     downsample=1,
     cutoff_at_kV=None,
     instrument=None,
+    chunks="auto",
+    index_cache=False,
+    max_workers=None,
+    energy_windows=None,
+    processes=None,
 ):
     """
     Reads a bruker ``.bcf`` file and loads the data into the appropriate class,
@@ -1372,10 +2128,24 @@ def bcf_reader(
         crop or enlarge energy range at max values.
     instrument : str or None, default=None
         Can be either 'TEM' or 'SEM'.
+    chunks : int, tuple or str, default="auto"
+        Chunks of the height axis of lazily loaded hypermaps.
+    index_cache : bool or str, default=False
+        Whether to use the persistent index cache, and where: True for the
+        user cache directory or the path of the cache directory.
+    max_workers : int or None, default=None
+        Number of threads decompressing the hypermap.
+    energy_windows : None, list or dict, default=None
+        Energy windows, for which maps are returned instead of the
+        hypermaps.
+    processes : int or None, default=None
+        Number of processes decoding the hypermaps, with a common dtype, if
+        several are loaded eagerly; by default they are decoded sequentially,
+        each with its own dtype.
     """
 
     # objectified bcf file:
-    obj_bcf = BCF_reader(filename, instrument=instrument)
+    obj_bcf = BCF_reader(filename, instrument=instrument, index_cache=index_cache)
     if select_type == "image":
         return bcf_images(obj_bcf)
     elif select_type == "spectrum_image":
@@ -1385,6 +2155,10 @@ def bcf_reader(
             downsample=downsample,
             cutoff_at_kV=cutoff_at_kV,
             lazy=lazy,
+            chunks=chunks,
+            max_workers=max_workers,
+            energy_windows=energy_windows,
+            processes=processes,
         )
     else:
         return bcf_images(obj_bcf) + bcf_hyperspectra(
@@ -1393,6 +2167,10 @@ def bcf_reader(
             downsample=downsample,
             cutoff_at_kV=cutoff_at_kV,
             lazy=lazy,
+            chunks=chunks,
+            max_workers=max_workers,
+            energy_windows=energy_windows,
+            processes=processes,
         )
 
 
@@ -1415,13 +2193,19 @@ def bcf_hyperspectra(
     downsample=None,
     cutoff_at_kV=None,
     lazy=False,  # noqa
+    chunks="auto",
+    max_workers=None,
+    energy_windows=None,
+    processes=None,
 ):
-    """Returns list of dict with eds hyperspectra and metadata."""
+    """Returns list of dict with eds hyperspectra and metadata, or with
+    the maps of the energy windows if energy_windows is not None."""
     global warn_once
     if (fast_unbcf is False) and warn_once:
         _logger.warning(
             """unbcf_fast library is not present...
-Parsing BCF with Python-only backend, which is slow... please wait.
+Parsing BCF with the vectorized numpy backend (numba backend if numba is
+installed), which is slower than the cython backend... please wait.
 If parsing is uncomfortably slow, first install cython, then reinstall RosettaSciIO.
 For more information, check the 'Installing RosettaSciIO' section in the documentation."""
         )
@@ -1435,18 +2219,53 @@ For more information, check the 'Installing RosettaSciIO' section in the documen
     hyperspectra = []
     mode = obj_bcf.header.mode
     mapping = get_mapping(mode)
-    for index in indexes:
-        hypermap = obj_bcf.parse_hypermap(
-            index=index, downsample=downsample, cutoff_at_kV=cutoff_at_kV, lazy=lazy
+    if energy_windows is not None:
+        # bin the counts in the windows without building the hypermaps:
+        names, energies = get_energy_windows(energy_windows)
+        hypermaps = [
+            obj_bcf.parse_hypermap_sums(
+                index=index,
+                downsample=downsample,
+                cutoff_at_kV=cutoff_at_kV,
+                counts=False,
+                spectrum=False,
+                energy_windows=energies,
+                max_workers=max_workers,
+            )["windows"]
+            for index in indexes
+        ]
+    elif len(indexes) > 1 and not lazy and processes is not None:
+        # decode the hypermaps with a common dtype in a process pool:
+        hypermaps = obj_bcf.parse_hypermaps(
+            indexes=indexes,
+            downsample=downsample,
+            cutoff_at_kV=cutoff_at_kV,
+            stack=False,
+            max_workers=max_workers,
+            processes=processes,
         )
+    else:
+        hypermaps = [
+            obj_bcf.parse_hypermap(
+                index=index,
+                downsample=downsample,
+                cutoff_at_kV=cutoff_at_kV,
+                lazy=lazy,
+                chunks=chunks,
+                max_workers=max_workers,
+            )
+            for index in indexes
+        ]
+    for index, hypermap in zip(indexes, hypermaps):
         eds_metadata = obj_bcf.header.get_spectra_metadata(index=index)
+        shape = obj_bcf._get_hypermap_shape(index, downsample, cutoff_at_kV)
         hyperspectra.append(
             {
                 "data": hypermap,
                 "axes": [
                     {
                         "name": "height",
-                        "size": hypermap.shape[0],
+                        "size": shape[0],
                         "offset": 0,
                         "scale": obj_bcf.header.y_res * downsample,
                         "units": obj_bcf.header.units,
@@ -1454,7 +2273,7 @@ For more information, check the 'Installing RosettaSciIO' section in the documen
                     },
                     {
                         "name": "width",
-                        "size": hypermap.shape[1],
+                        "size": shape[1],
                         "offset": 0,
                         "scale": obj_bcf.header.y_res * downsample,
                         "units": obj_bcf.header.units,
@@ -1462,7 +2281,7 @@ For more information, check the 'Installing RosettaSciIO' section in the documen
                     },
                     {
                         "name": "Energy",
-                        "size": hypermap.shape[2],
+                        "size": shape[2],
                         "offset": eds_metadata.offset,
                         "scale": eds_metadata.scale,
                         "units": "keV",
@@ -1507,6 +2326,17 @@ For more information, check the 'Installing RosettaSciIO' section in the documen
                 "mapping": mapping,
             }
         )
+        if energy_windows is not None:
+            signal = hyperspectra[-1]
+            hyperspectra[-1] = windowed_maps_dictionary(
+                hypermap,
+                names,
+                energies,
+                signal["axes"][:2],
+                signal["metadata"],
+                signal["original_metadata"],
+            )
+            hyperspectra[-1]["mapping"] = mapping
     return hyperspectra
 
 
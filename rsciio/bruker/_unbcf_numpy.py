@@ -0,0 +1,656 @@
+# -*- coding: utf-8 -*-
+# Copyright 2007-2024 The HyperSpy developers
+#
+# This file is part of RosettaSciIO.
+#
+# RosettaSciIO is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RosettaSciIO is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with RosettaSciIO. If not, see <https://www.gnu.org/licenses/#GPL>.
+
+# Vectorized parser of the Bruker hypermap (the SpectrumData stream of bcf),
+# used when the cython parser (unbcf_fast) is not compiled. It has the same
+# functions and signatures as unbcf_fast. It also provides the reduced
+# parsing of the hypermap (total counts per pixel, sum spectrum, counts in
+# energy windows), which does not allocate the (y, x, E) hypermap.
+#
+# The stream is parsed in rounds: the decompressed chunks are joined until
+# at least one complete line is available, the offsets of all pixel headers
+# of the complete lines are found and then the pixels are decoded at once.
+# If numba is installed, the offsets are found and the pixels decoded by
+# compiled loops, otherwise the offsets are found with struct and the pixels
+# decoded with batched numpy operations.
+
+import importlib.util
+import logging
+from math import ceil
+from struct import unpack_from as strct_unp_from
+
+import numpy as np
+
+from rsciio.utils.tools import jit_ifnumba
+
+_logger = logging.getLogger(__name__)
+
+use_numba = importlib.util.find_spec("numba") is not None
+
+# the pixel header (22 bytes):
+# x index of pixel (uint32);
+# number of channels for whole mapping (unit16);
+# number of channels for pixel (uint16);
+# dummy placehollder (same value in every known bcf) (32bit);
+# flag distinguishing packing data type (16bit):
+#    0 - 16bit packed pulses, 1 - 12bit packed pulses,
+#    >1 - instructively packed spectra;
+# value which sometimes shows the size of packed data (uint16);
+# number of pulses if pulse data are present (uint16) or
+#      additional pulses to the instructively packed data;
+# packed data size (32bit) (without additional pulses) \
+#       next header is after that amount of bytes;
+pixel_header_dtype = np.dtype(
+    [
+        ("x", "<u4"),
+        ("chan1", "<u2"),
+        ("chan2", "<u2"),
+        ("dummy1", "<u4"),
+        ("flag", "<u2"),
+        ("dummy_size1", "<u2"),
+        ("n_of_pulses", "<u2"),
+        ("data_size2", "<u4"),
+    ]
+)
+
+# 4 pulses packed in 12 bits are stored in 6 bytes (as 3 little endian
+# uint16); byte indexes of the high and low byte of every pulse and the
+# shift of the resulting 16 bits:
+_12BIT_HIGH = np.array([1, 0, 2, 5])
+_12BIT_LOW = np.array([0, 3, 5, 4])
+_12BIT_SHIFT = np.array([4, 0, 4, 0])
+
+
+def parse_to_numpy(virtual_file, shape, dtype, downsample=1, max_workers=1):
+    """Unpack the Delphi/Bruker binary spectral map and return
+    numpy array in memory efficient way.
+
+    Parameters
+    ----------
+    virtual_file -- virtual file handle returned by SFS_reader instance
+        or by object inheriting it (e.g. BCF_reader instance)
+    shape -- numpy shape
+    dtype -- numpy dtype
+    downsample -- downsample factor
+    max_workers -- number of threads decompressing the data
+
+    Returns
+    -------
+    numpy array of bruker hypermap, with (y, x, E) shape.
+    """
+    iter_data = virtual_file.get_iter_and_properties(max_workers=max_workers)[0]
+    buffer1 = next(iter_data)
+    height, width = strct_unp_from("<ii", buffer1)
+    hypermap = np.zeros(shape, dtype=_unsigned(dtype))
+    _parse_lines(iter_data, buffer1, 0x1A0, hypermap, 0, height, downsample)
+    return hypermap
+
+
+def parse_lines_to_numpy(
+    virtual_file, line_offset, first_line, n_lines, shape, dtype, downsample=1
+):
+    """Unpack the band of lines of the Delphi/Bruker binary spectral map.
+
+    Parameters
+    ----------
+    virtual_file -- virtual file handle returned by SFS_reader instance
+    line_offset -- offset of the first line in the (uncompressed) stream,
+        as returned by index_lines
+    first_line -- index of the first line, should be multiple of downsample
+    n_lines -- number of lines to unpack
+    shape -- numpy shape of the band
+    dtype -- numpy dtype
+    downsample -- downsample factor
+
+    Returns
+    -------
+    numpy array of the band of bruker hypermap, with (y, x, E) shape.
+    """
+    iter_data = virtual_file.get_iter_and_properties(offset=line_offset)[0]
+    buffer1 = next(iter_data)
+    hypermap = np.zeros(shape, dtype=_unsigned(dtype))
+    _parse_lines(iter_data, buffer1, 0, hypermap, first_line, n_lines, downsample)
+    return hypermap
+
+
+def reduce_to_numpy(
+    virtual_file,
+    shape,
+    downsample=1,
+    counts=True,
+    spectrum=True,
+    windows=None,
+    max_workers=1,
+):
+    """Unpack the Delphi/Bruker binary spectral map in a single pass,
+    accumulating only the requested reductions, without the (y, x, E)
+    hypermap.
+
+    Parameters
+    ----------
+    virtual_file -- virtual file handle returned by SFS_reader instance
+    shape -- numpy shape of the (downsampled) hypermap, the pulses at
+        channels larger than shape[2] are ignored
+    downsample -- downsample factor
+    counts -- if True, accumulate the total counts of every pixel
+    spectrum -- if True, accumulate the sum spectrum
+    windows -- None or array of (first channel, end channel) pairs, for
+        which the counts of every pixel are accumulated
+    max_workers -- number of threads decompressing the data
+
+    Returns
+    -------
+    dict with the requested reductions (uint64 arrays):
+    "counts" with (y, x) shape, "spectrum" with (E,) shape and
+    "windows" with (number of windows, y, x) shape.
+    """
+    n_pixels = shape[0] * shape[1]
+    windows = np.zeros((0, 2), dtype=np.int64) if windows is None else windows
+    windows = np.asarray(windows, dtype=np.int64).reshape(-1, 2)
+    result = {
+        "counts": np.zeros(n_pixels if counts else 0, dtype=np.uint64),
+        "spectrum": np.zeros(shape[2] if spectrum else 0, dtype=np.uint64),
+        "windows": np.zeros((len(windows), n_pixels), dtype=np.uint64),
+    }
+    iter_data = virtual_file.get_iter_and_properties(max_workers=max_workers)[0]
+    buffer1 = next(iter_data)
+    height = strct_unp_from("<i", buffer1)[0]
+    line = 0
+    for buffer, _, (pix_offsets, pix_lines), line_ends in _iter_complete_lines(
+        iter_data, buffer1, 0x1A0, height
+    ):
+        pix_lines += line
+        line += len(line_ends)
+        if use_numba:
+            _nb_reduce_pixels(
+                buffer,
+                pix_offsets,
+                pix_lines,
+                shape[1],
+                shape[2],
+                downsample,
+                result["counts"],
+                result["spectrum"],
+                result["windows"],
+                windows,
+            )
+        else:
+
+            def accumulate(pixels, channels, values):
+                _np_reduce(result, windows, pixels, channels, values)
+
+            _np_decode_pixels(
+                buffer, pix_offsets, pix_lines, shape, 0, downsample, accumulate
+            )
+    if counts:
+        result["counts"] = result["counts"].reshape(shape[:2])
+    else:
+        del result["counts"]
+    if not spectrum:
+        del result["spectrum"]
+    if len(windows):
+        result["windows"] = result["windows"].reshape((len(windows),) + shape[:2])
+    else:
+        del result["windows"]
+    return result
+
+
+def index_lines(virtual_file, max_workers=1):
+    """Scan the Delphi/Bruker binary spectral map, skipping the pixel
+    data, and return the offsets of the begining of every line in the
+    (uncompressed) stream.
+
+    Parameters
+    ----------
+    virtual_file -- virtual file handle returned by SFS_reader instance
+    max_workers -- number of threads decompressing the data
+
+    Returns
+    -------
+    numpy array (uint64) with height + 1 items, where the last item
+    is the offset of the end of the last line.
+    """
+    iter_data = virtual_file.get_iter_and_properties(max_workers=max_workers)[0]
+    buffer1 = next(iter_data)
+    height = strct_unp_from("<i", buffer1)[0]
+    line_offsets = np.zeros(height + 1, dtype=np.uint64)
+    line_offsets[0] = 0x1A0
+    n_done = 0
+    for _, base, _, line_ends in _iter_complete_lines(
+        iter_data, buffer1, 0x1A0, height
+    ):
+        line_offsets[n_done + 1 : n_done + 1 + len(line_ends)] = base + line_ends
+        n_done += len(line_ends)
+    return line_offsets
+
+
+def _unsigned(dtype):
+    # the parsers always return unsigned integers
+    return np.dtype("u%i" % np.dtype(dtype).itemsize)
+
+
+def _iter_complete_lines(iter_data, buffer1, offset, n_lines):
+    """Join the data chunks until complete lines are available and yield
+    the buffer (as uint8 array), the absolute offset of the buffer in the
+    stream, the offsets of the pixels headers, the line (counted from the
+    first line) of these pixels and the offsets of the end of every
+    complete line."""
+    base = offset
+    buffer = np.frombuffer(buffer1, dtype=np.uint8)[offset:]
+    lines_left = n_lines
+    while lines_left > 0:
+        if use_numba:
+            pix_offsets, pix_lines, line_ends = _nb_scan_lines(buffer, lines_left)
+        else:
+            pix_offsets, pix_lines, line_ends = _py_scan_lines(buffer, lines_left)
+        if len(line_ends) > 0:
+            yield buffer, base, (pix_offsets, pix_lines), line_ends
+            lines_left -= len(line_ends)
+            end = int(line_ends[-1])
+        else:
+            end = 0
+        if lines_left == 0:
+            break
+        # read at least as much data as is left in the buffer, so that
+        # an incomplete line is not scanned too many times:
+        chunks = [buffer[end:]]
+        n_read = 0
+        while n_read == 0 or n_read < len(chunks[0]):
+            chunk = next(iter_data, None)
+            if chunk is None:
+                break
+            chunks.append(np.frombuffer(chunk, dtype=np.uint8))
+            n_read += len(chunk)
+        if n_read == 0:
+            _logger.warning(
+                "The hypermap stream ended before all the lines were read, "
+                "the %i last lines are left empty." % lines_left
+            )
+            break
+        base += end
+        buffer = np.concatenate(chunks)
+
+
+def _parse_lines(iter_data, buffer1, offset, hypermap, first_line, n_lines, ds):
+    """Unpack n_lines of the hypermap into the 3D array hypermap; buffer1 at
+    offset should point to the begining of the first_line."""
+    line = first_line
+    for buffer, base, (pix_offsets, pix_lines), line_ends in _iter_complete_lines(
+        iter_data, buffer1, offset, n_lines
+    ):
+        pix_lines += line
+        if use_numba:
+            _nb_decode_pixels(buffer, pix_offsets, pix_lines, hypermap, first_line, ds)
+        else:
+            flat_hypermap = hypermap.reshape(-1)
+            max_chan = hypermap.shape[2]
+
+            def accumulate(pixels, channels, values):
+                if not np.isscalar(values):
+                    values = values.astype(hypermap.dtype)
+                np.add.at(flat_hypermap, pixels * max_chan + channels, values)
+
+            _np_decode_pixels(
+                buffer,
+                pix_offsets,
+                pix_lines,
+                hypermap.shape,
+                first_line,
+                ds,
+                accumulate,
+            )
+        line += len(line_ends)
+
+
+def _py_scan_lines(buffer, n_lines):
+    """Find the offsets of the pixel headers of (at most n_lines) complete
+    lines in buffer."""
+    size = len(buffer)
+    pix_offsets = []
+    pix_lines = []
+    line_ends = []
+    offset = 0
+    for line in range(n_lines):
+        if offset + 4 > size:
+            break
+        n_pixels = strct_unp_from("<i", buffer, offset)[0]
+        offset += 4
+        line_pixels = []
+        for _ in range(n_pixels):
+            if offset + 22 > size:
+                offset = size + 1
+                break
+            line_pixels.append(offset)
+            flag, n_of_pulses, data_size2 = strct_unp_from("<12xH2xHI", buffer, offset)
+            offset += 22 + data_size2
+            if flag > 1 and n_of_pulses > 0:
+                offset += 2 * n_of_pulses
+        if offset > size:
+            break
+        pix_offsets += line_pixels
+        pix_lines += [line] * n_pixels
+        line_ends.append(offset)
+    return (
+        np.array(pix_offsets, dtype=np.int64),
+        np.array(pix_lines, dtype=np.int64),
+        np.array(line_ends, dtype=np.int64),
+    )
+
+
+def _ragged_arange(starts, counts, step=1):
+    """Concatenate ``starts[i] + step * arange(counts[i])`` for every i, also
+    return the index of the item in its range."""
+    total = counts.sum()
+    range_starts = np.cumsum(counts) - counts
+    local = np.arange(total) - np.repeat(range_starts, counts)
+    return np.repeat(starts, counts) + step * local, local
+
+
+def _read_uint(buffer, offsets, n_bytes):
+    """Read little endian unsigned integers of n_bytes at offsets."""
+    values = np.zeros(len(offsets), dtype=np.int64)
+    for i in range(n_bytes):
+        values |= buffer[offsets + i].astype(np.int64) << (8 * i)
+    return values
+
+
+def _np_decode_pixels(
+    buffer, pix_offsets, pix_lines, shape, first_line, ds, accumulate
+):
+    """Decode the pixels at pix_offsets with numpy and pass the pixels
+    (index in the flattened (y, x) shape), the channels and the values
+    to accumulate."""
+    if len(pix_offsets) == 0:
+        return
+    headers = buffer[pix_offsets[:, None] + np.arange(22)].view(pixel_header_dtype)[
+        :, 0
+    ]
+    pix_index = (pix_lines // ds - first_line // ds) * shape[1] + headers["x"].astype(
+        np.int64
+    ) // ds
+    n_chan = np.minimum(headers["chan1"], shape[2]).astype(np.int64)
+    data_offsets = pix_offsets + 22
+    data_size = headers["data_size2"].astype(np.int64)
+    n_pulses = headers["n_of_pulses"].astype(np.int64)
+    flag = headers["flag"]
+
+    def add(px, counts, channels, values=1):
+        pixels = np.repeat(px, counts)
+        keep = channels < n_chan[pixels]
+        if not np.isscalar(values):
+            values = values[keep]
+        accumulate(pix_index[pixels[keep]], channels[keep], values)
+
+    # 16bit packed pulses:
+    px = np.nonzero(flag == 0)[0]
+    offsets, _ = _ragged_arange(data_offsets[px], data_size[px] // 2, 2)
+    add(px, data_size[px] // 2, _read_uint(buffer, offsets, 2))
+
+    # 12bit packed pulses:
+    px = np.nonzero(flag == 1)[0]
+    group_starts, k = _ragged_arange(data_offsets[px], n_pulses[px], 0)
+    group_starts += 6 * (k // 4)
+    k %= 4
+    channels = (
+        (buffer[group_starts + _12BIT_HIGH[k]].astype(np.int64) << 8)
+        | buffer[group_starts + _12BIT_LOW[k]]
+    ) >> _12BIT_SHIFT[k] & 0x0FFF
+    add(px, n_pulses[px], channels)
+
+    # instructively packed spectra:
+    px = np.nonzero(flag > 1)[0]
+    if len(px) == 0:
+        return
+    blocks = _py_scan_instructions(buffer, data_offsets[px], data_size[px] - 4)
+    (blk_pixel, blk_channel, blk_size_p, blk_channels, blk_gain, blk_offset) = blocks
+    blk_pixel = px[blk_pixel]
+    for size_p in (1, 2, 4, 8):
+        b = np.nonzero(blk_size_p == size_p)[0]
+        if len(b) == 0:
+            continue
+        channels, _ = _ragged_arange(blk_channel[b], blk_channels[b])
+        if size_p == 1:
+            # special case with nibble switching
+            offsets, i = _ragged_arange(blk_offset[b], blk_channels[b], 0)
+            values = buffer[offsets + i // 2] >> (4 * (i % 2)) & 0x0F
+        else:
+            offsets, _ = _ragged_arange(blk_offset[b], blk_channels[b], size_p // 2)
+            values = _read_uint(buffer, offsets, size_p // 2)
+        values = values + np.repeat(blk_gain[b], blk_channels[b])
+        add(blk_pixel[b], blk_channels[b], channels, values)
+    # the additional pulses:
+    px = px[n_pulses[px] > 0]
+    offsets, _ = _ragged_arange(data_offsets[px] + data_size[px], n_pulses[px], 2)
+    add(px, n_pulses[px], _read_uint(buffer, offsets, 2))
+
+
+def _np_reduce(result, windows, pixels, channels, values):
+    """Accumulate the reductions of the decoded pulses or channels."""
+    if np.isscalar(values):
+        values = np.full(len(pixels), values, dtype=np.uint64)
+    else:
+        values = values.astype(np.uint64)
+    if len(result["counts"]):
+        np.add.at(result["counts"], pixels, values)
+    if len(result["spectrum"]):
+        np.add.at(result["spectrum"], channels, values)
+    for w, (start, end) in enumerate(windows):
+        keep = (channels >= start) & (channels < end)
+        np.add.at(result["windows"][w], pixels[keep], values[keep])
+
+
+def _py_scan_instructions(buffer, data_offsets, data_ends_size):
+    """Find the blocks of the instructively packed spectra. Return, for
+    every block, the index of its pixel, the first channel, the size of
+    the values in nibbles, the number of channels, the gain and the
+    offset of the values."""
+    blocks = []
+    for i, (offset, size) in enumerate(zip(data_offsets.tolist(), data_ends_size)):
+        the_end = offset + int(size)
+        channel = 0
+        while offset < the_end:
+            size_p, channels = strct_unp_from("<BB", buffer, offset)
+            offset += 2
+            if size_p == 0:
+                channel += channels
+                continue
+            gain = int.from_bytes(buffer[offset : offset + size_p], "little")
+            offset += size_p
+            blocks.append((i, channel, size_p, channels, gain, offset))
+            if size_p == 1:
+                offset += ceil(channels / 2)
+            else:
+                offset += channels * size_p // 2
+            channel += channels
+    blocks = np.array(blocks, dtype=np.int64).reshape(-1, 6)
+    return blocks.T
+
+
+@jit_ifnumba(cache=True)
+def _nb_read_uint(buffer, offset, n_bytes):  # pragma: no cover
+    value = 0
+    for i in range(n_bytes):
+        value |= np.int64(buffer[offset + i]) << (8 * i)
+    return value
+
+
+@jit_ifnumba(cache=True)
+def _nb_scan_lines(buffer, n_lines):  # pragma: no cover
+    size = buffer.shape[0]
+    pix_offsets = np.empty(size // 22 + 1, dtype=np.int64)
+    pix_lines = np.empty(size // 22 + 1, dtype=np.int64)
+    line_ends = np.empty(n_lines, dtype=np.int64)
+    n_done = 0
+    n_pix_done = 0
+    offset = 0
+    for line in range(n_lines):
+        if offset + 4 > size:
+            break
+        n_pixels = _nb_read_uint(buffer, offset, 4)
+        offset += 4
+        n_pix = n_pix_done
+        for _ in range(n_pixels):
+            if offset + 22 > size:
+                offset = size + 1
+                break
+            pix_offsets[n_pix] = offset
+            pix_lines[n_pix] = line
+            n_pix += 1
+            flag = _nb_read_uint(buffer, offset + 12, 2)
+            n_of_pulses = _nb_read_uint(buffer, offset + 16, 2)
+            offset += 22 + _nb_read_uint(buffer, offset + 18, 4)
+            if flag > 1 and n_of_pulses > 0:
+                offset += 2 * n_of_pulses
+        if offset > size:
+            break
+        n_pix_done = n_pix
+        line_ends[n_done] = offset
+        n_done += 1
+    return pix_offsets[:n_pix_done], pix_lines[:n_pix_done], line_ends[:n_done]
+
+
+@jit_ifnumba(cache=True)
+def _nb_decode_pixel(buffer, offset, max_chan, channels, values):  # pragma: no cover
+    """Decode the pixel at offset into the channels and values arrays,
+    which should be large enough, return the number of decoded items."""
+    n = 0
+    n_chan = min(_nb_read_uint(buffer, offset + 4, 2), max_chan)
+    flag = _nb_read_uint(buffer, offset + 12, 2)
+    n_of_pulses = _nb_read_uint(buffer, offset + 16, 2)
+    data_size2 = _nb_read_uint(buffer, offset + 18, 4)
+    offset += 22
+    if flag == 0:
+        for i in range(data_size2 // 2):
+            channel = _nb_read_uint(buffer, offset + 2 * i, 2)
+            if channel < n_chan:
+                channels[n] = channel
+                values[n] = 1
+                n += 1
+    elif flag == 1:
+        for i in range(n_of_pulses):
+            group = offset + 6 * (i // 4)
+            j = i % 4
+            channel = (
+                (np.int64(buffer[group + _12BIT_HIGH[j]]) << 8)
+                | buffer[group + _12BIT_LOW[j]]
+            ) >> _12BIT_SHIFT[j] & 0x0FFF
+            if channel < n_chan:
+                channels[n] = channel
+                values[n] = 1
+                n += 1
+    else:
+        the_end = offset + data_size2 - 4
+        channel = 0
+        while offset < the_end:
+            size_p = np.int64(buffer[offset])
+            n_channels = np.int64(buffer[offset + 1])
+            offset += 2
+            if size_p != 0:
+                gain = _nb_read_uint(buffer, offset, size_p)
+                offset += size_p
+                n_bytes = size_p // 2
+                for i in range(min(n_channels, n_chan - channel)):
+                    if size_p == 1:
+                        # special case with nibble switching
+                        value = buffer[offset + i // 2] >> (4 * (i % 2)) & 0x0F
+                    else:
+                        value = _nb_read_uint(buffer, offset + n_bytes * i, n_bytes)
+                    channels[n] = channel + i
+                    values[n] = value + gain
+                    n += 1
+                if size_p == 1:
+                    offset += (n_channels + 1) // 2
+                else:
+                    offset += n_channels * n_bytes
+            channel += n_channels
+        # the additional pulses:
+        if n_of_pulses > 0:
+            offset = the_end + 4
+            for i in range(n_of_pulses):
+                channel = _nb_read_uint(buffer, offset + 2 * i, 2)
+                if channel < n_chan:
+                    channels[n] = channel
+                    values[n] = 1
+                    n += 1
+    return n
+
+
+@jit_ifnumba(cache=True)
+def _nb_decode_buffers(buffer, offset, max_chan, channels, values):  # pragma: no cover
+    """Return the channels and values arrays, enlarged if they could be
+    too small to decode the pixel at offset."""
+    n_max = max_chan + max(
+        _nb_read_uint(buffer, offset + 18, 4) // 2,
+        _nb_read_uint(buffer, offset + 16, 2),
+    )
+    if n_max > channels.shape[0]:
+        channels = np.empty(n_max, dtype=np.int64)
+        values = np.empty(n_max, dtype=np.int64)
+    return channels, values
+
+
+@jit_ifnumba(cache=True)
+def _nb_decode_pixels(
+    buffer, pix_offsets, pix_lines, hypermap, first_line, ds
+):  # pragma: no cover
+    max_chan = hypermap.shape[2]
+    channels = np.empty(0, dtype=np.int64)
+    values = np.empty(0, dtype=np.int64)
+    for p in range(pix_offsets.shape[0]):
+        offset = pix_offsets[p]
+        y = pix_lines[p] // ds - first_line // ds
+        x = _nb_read_uint(buffer, offset, 4) // ds
+        channels, values = _nb_decode_buffers(
+            buffer, offset, max_chan, channels, values
+        )
+        n = _nb_decode_pixel(buffer, offset, max_chan, channels, values)
+        for i in range(n):
+            hypermap[y, x, channels[i]] += values[i]
+
+
+@jit_ifnumba(cache=True)
+def _nb_reduce_pixels(
+    buffer,
+    pix_offsets,
+    pix_lines,
+    width,
+    max_chan,
+    ds,
+    counts,
+    spectrum,
+    windows_counts,
+    windows,
+):  # pragma: no cover
+    channels = np.empty(0, dtype=np.int64)
+    values = np.empty(0, dtype=np.int64)
+    for p in range(pix_offsets.shape[0]):
+        offset = pix_offsets[p]
+        pixel = (pix_lines[p] // ds) * width + _nb_read_uint(buffer, offset, 4) // ds
+        channels, values = _nb_decode_buffers(
+            buffer, offset, max_chan, channels, values
+        )
+        n = _nb_decode_pixel(buffer, offset, max_chan, channels, values)
+        for i in range(n):
+            value = np.uint64(values[i])
+            if counts.shape[0] > 0:
+                counts[pixel] += value
+            if spectrum.shape[0] > 0:
+                spectrum[channels[i]] += value
+            for w in range(windows.shape[0]):
+                if windows[w, 0] <= channels[i] and channels[i] < windows[w, 1]:
+                    windows_counts[w, pixel] += value
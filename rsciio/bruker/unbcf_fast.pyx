@@ -61,6 +61,7 @@ cdef class DataStream:
     cdef unsigned char *buffer2
     cdef int size, size_chnk
     cdef int offset
+    cdef long long base  # absolute stream position of the buffer start
     cdef bytes raw_bytes
     cdef public object blocks  # public - because it is python object
 
@@ -68,10 +69,13 @@ cdef class DataStream:
         self.size_chnk = size_chnk
         self.size = size_chnk
         self.offset = 0
+        self.base = 0
 
     def __init__(self, blocks, int size_chnk):
         self.blocks = blocks
         self.raw_bytes = next(self.blocks)  # python bytes buffer
+        # first block can be shorter if stream is read from an offset:
+        self.size = len(self.raw_bytes)
         self.buffer2 = <bytes>self.raw_bytes  # C unsigned char buffer
 
     cdef void seek(self, int value):
@@ -79,11 +83,15 @@ cdef class DataStream:
         NOTE: it do not check if value is in bounds of buffer!"""
         self.offset = value
 
+    cdef long long tell(self):
+        """return the absolute position in the stream"""
+        return self.base + self.offset
+
     cdef void skip(self, int length):
         """increase offset by given value,
         check if new offset is in bounds of buffer length
         else load up next block"""
-        if (self.offset + length) > self.size:
+        while (self.offset + length) > self.size:
             self.load_next_block()
         self.offset = self.offset + length
 
@@ -118,7 +126,7 @@ cdef class DataStream:
         making sure the array have the required length
         counting from the offset, increase the internal offset
         by given length"""
-        if (self.offset + length) > self.size:
+        while (self.offset + length) > self.size:
             self.load_next_block()
         self.offset += length
         return &self.buffer2[self.offset-length]
@@ -127,9 +135,10 @@ cdef class DataStream:
         """take the reminder of buffer (offset:end) and
         append new block of raw data, and overwrite old buffer
         handle with new, set offset to 0"""
-        self.size = self.size_chnk + self.size - self.offset
+        self.base += self.offset
         self.buffer2 = b''
         self.raw_bytes = self.raw_bytes[self.offset:] + next(self.blocks)
+        self.size = len(self.raw_bytes)
         self.offset = 0
         self.buffer2 = <bytes>self.raw_bytes
 
@@ -143,15 +152,34 @@ cdef bin_to_numpy(DataStream data_stream,
                   int max_chan,
                   int downsample):
 
-    cdef uint32_t height, width, pix_in_line, pixel_x, add_pulse_size
-    cdef uint32_t dummy1, line_cnt, data_size2
-    cdef uint16_t chan1, chan2, flag, data_size1, n_of_pulses
-    cdef uint16_t add_val, j
+    cdef uint32_t height, width
 
     height = data_stream.read_32()
     width = data_stream.read_32()
     data_stream.seek(<int>0x1A0) #the begining of the array
-    for line_cnt in range(height):
+    bin_lines_to_numpy(data_stream, hypermap, max_chan, downsample, 0, height)
+
+
+@cython.cdivision(True)
+@cython.boundscheck(False)
+cdef bin_lines_to_numpy(DataStream data_stream,
+                        channel_t[:, :, :] hypermap,
+                        int max_chan,
+                        int downsample,
+                        uint32_t first_line,
+                        uint32_t n_lines):
+    """parse n_lines starting with first_line; data_stream have to
+    be positioned at the begining of the first_line.
+    first_line is expected to be a multiple of downsample"""
+
+    cdef uint32_t pix_in_line, pixel_x, add_pulse_size
+    cdef uint32_t dummy1, line_cnt, data_size2, y
+    cdef uint32_t row_offset = first_line // downsample
+    cdef uint16_t chan1, chan2, flag, data_size1, n_of_pulses
+    cdef uint16_t add_val, j
+
+    for line_cnt in range(first_line, first_line + n_lines):
+        y = line_cnt // downsample - row_offset
         pix_in_line = data_stream.read_32()
         for dummy1 in range(pix_in_line):
             pixel_x = data_stream.read_32()
@@ -165,21 +193,21 @@ cdef bin_to_numpy(DataStream data_stream,
             if flag == 0:
                 unpack16bit(hypermap,
                             pixel_x // downsample,
-                            line_cnt // downsample,
+                            y,
                             data_stream.ptr_to(data_size2),
                             n_of_pulses,
                             max_chan)
             elif flag == 1:
                 unpack12bit(hypermap,
                             pixel_x // downsample,
-                            line_cnt // downsample,
+                            y,
                             data_stream.ptr_to(data_size2),
                             n_of_pulses,
                             max_chan)
             else:
                 unpack_instructed(hypermap,
                                   pixel_x // downsample,
-                                  line_cnt // downsample,
+                                  y,
                                   data_stream.ptr_to(data_size2 - 4),
                                   data_size2 - 4,
                                   max_chan)
@@ -188,13 +216,45 @@ cdef bin_to_numpy(DataStream data_stream,
                     for j in range(n_of_pulses):
                         add_val = data_stream.read_16()
                         if add_val < max_chan:
-                            hypermap[line_cnt // downsample,
+                            hypermap[y,
                                      pixel_x // downsample,
                                      add_val] += 1
                 else:
                     data_stream.skip(4)
 
 
+@cython.boundscheck(False)
+cdef index_lines_of_stream(DataStream data_stream,
+                           uint64_t[:] line_offsets,
+                           uint32_t height):
+    """walk through pixel headers, skipping the pixel data, and
+    record the absolute stream offset at begining of every line"""
+
+    cdef uint32_t pix_in_line, dummy1, line_cnt, data_size2
+    cdef uint16_t flag, n_of_pulses
+
+    for line_cnt in range(height):
+        line_offsets[line_cnt] = <uint64_t>data_stream.tell()
+        pix_in_line = data_stream.read_32()
+        for dummy1 in range(pix_in_line):
+            # pixel_x, chan1, chan2 and unknown static value:
+            data_stream.skip(12)
+            flag = data_stream.read_16()
+            data_stream.skip(2)  # data_size1
+            n_of_pulses = data_stream.read_16()
+            data_size2 = data_stream.read_32()
+            if flag < 2:
+                data_stream.skip(data_size2)
+            else:
+                data_stream.skip(data_size2 - 4)
+                if n_of_pulses > 0:
+                    data_stream.skip(4)  # additional pulse data size
+                    data_stream.skip(2 * n_of_pulses)
+                else:
+                    data_stream.skip(4)
+    line_offsets[height] = <uint64_t>data_stream.tell()
+
+
 #functions to extract pixel spectrum:
 
 @cython.cdivision(True)
@@ -298,7 +358,7 @@ cdef void unpack16bit(channel_t[:, :, :] dest, int x, int y,
 
 #the main function:
 
-def parse_to_numpy(virtual_file, shape, dtype, downsample=1):
+def parse_to_numpy(virtual_file, shape, dtype, downsample=1, max_workers=1):
     """Parse the hyperspectral cube from brukers bcf binary file
     and return it as numpy array
     
@@ -312,9 +372,13 @@ def parse_to_numpy(virtual_file, shape, dtype, downsample=1):
         Data type of the dataset.
     downsample : int, optional
         Value for downsampling in navigation space. Default is 1.
-        
+    max_workers : int or None, optional
+        Number of threads decompressing the data (if compressed).
+        Default is 1.
+
     """
-    blocks, block_size = virtual_file.get_iter_and_properties()[:2]
+    blocks, block_size = virtual_file.get_iter_and_properties(
+        max_workers=max_workers)[:2]
     map_depth = shape[2]
     hypermap = np.zeros(shape, dtype=dtype)
     cdef DataStream data_stream = DataStream(blocks, block_size)
@@ -329,3 +393,77 @@ def parse_to_numpy(virtual_file, shape, dtype, downsample=1):
         return hypermap
     else:
         raise NotImplementedError('64bit array not implemented!')
+
+
+def parse_lines_to_numpy(virtual_file, line_offset, first_line, n_lines,
+                         shape, dtype, downsample=1):
+    """Parse the band of lines of hyperspectral cube from brukers bcf
+    binary file and return it as numpy array
+
+    Parameters
+    ----------
+    virtual_file : SFSTreeItem
+        Virtual file handle returned by SFS_reader instance.
+    line_offset : int
+        Offset of the first line in the (uncompressed) virtual file, as
+        returned by :py:func:`index_lines`.
+    first_line : int
+        Index of the first line to parse, should be a multiple of
+        ``downsample``.
+    n_lines : int
+        Number of lines to parse.
+    shape : tuple
+        Shape of the returned band.
+    dtype : numpy.dtype
+        Data type of the dataset.
+    downsample : int, optional
+        Value for downsampling in navigation space. Default is 1.
+
+    """
+    blocks, block_size = virtual_file.get_iter_and_properties(
+        offset=line_offset)[:2]
+    map_depth = shape[2]
+    hypermap = np.zeros(shape, dtype=dtype)
+    cdef DataStream data_stream = DataStream(blocks, block_size)
+    if dtype == np.uint8:
+        bin_lines_to_numpy[uint8_t](data_stream, hypermap, map_depth,
+                                    downsample, first_line, n_lines)
+        return hypermap
+    elif dtype == np.uint16:
+        bin_lines_to_numpy[uint16_t](data_stream, hypermap, map_depth,
+                                     downsample, first_line, n_lines)
+        return hypermap
+    elif dtype == np.uint32:
+        bin_lines_to_numpy[uint32_t](data_stream, hypermap, map_depth,
+                                     downsample, first_line, n_lines)
+        return hypermap
+    else:
+        raise NotImplementedError('64bit array not implemented!')
+
+
+def index_lines(virtual_file, max_workers=1):
+    """Scan the hyperspectral stream of brukers bcf binary file and
+    return the offsets of the begining of every line
+
+    Parameters
+    ----------
+    virtual_file : SFSTreeItem
+        Virtual file handle returned by SFS_reader instance.
+    max_workers : int or None, optional
+        Number of threads decompressing the data (if compressed).
+        Default is 1.
+
+    Returns
+    -------
+    numpy.ndarray
+        uint64 array with height + 1 items, where the last item is
+        the offset of the end of the last line.
+    """
+    blocks, block_size = virtual_file.get_iter_and_properties(
+        max_workers=max_workers)[:2]
+    cdef DataStream data_stream = DataStream(blocks, block_size)
+    height = data_stream.read_32()
+    data_stream.seek(<int>0x1A0)
+    line_offsets = np.zeros(height + 1, dtype=np.uint64)
+    index_lines_of_stream(data_stream, line_offsets, height)
+    return line_offsets
@@ -23,6 +23,7 @@
 
 import logging
 import os
+import struct
 from copy import deepcopy
 
 import dateutil.parser
@@ -30,12 +31,23 @@ import numpy as np
 from box import Box
 
 import rsciio.utils.readfile as iou
-from rsciio._docstrings import FILENAME_DOC, LAZY_DOC, RETURNS_DOC
+from rsciio._docstrings import (
+    CHUNKS_READ_DOC,
+    FILENAME_DOC,
+    LAZY_DOC,
+    METADATA_ONLY_DOC,
+    RETURNS_DOC,
+)
+from rsciio.utils.distributed import memmap_distributed
 from rsciio.utils.exceptions import DM3DataTypeError, DM3TagIDError, DM3TagTypeError
-from rsciio.utils.tools import ensure_unicode
+from rsciio.utils.tools import ensure_unicode, get_data_placeholder
 
 _logger = logging.getLogger(__name__)
 
+# number of elements above which the arrays of the tags are deferred when
+# reading only the metadata
+_DEFERRED_ARRAY_SIZE = 256
+
 
 class DigitalMicrographReader(object):
     """Class to read Gatan Digital Micrograph (TM) files.
@@ -54,12 +66,50 @@ class DigitalMicrographReader(object):
 
     _complex_type = (15, 18, 20)
     simple_type = (2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12)
-
-    def __init__(self, f):
+    # struct format characters of the simple types, used to read several
+    # values at once, see get_data_reader
+    _struct_format = {
+        2: "h",
+        3: "l",
+        4: "H",
+        5: "L",
+        6: "f",
+        7: "d",
+        8: "B",
+        9: "c",
+        10: "b",
+        11: "q",
+        12: "Q",
+    }
+    # numpy dtypes of the numeric simple types, for the deferred arrays
+    _numpy_dtype = {
+        2: "i2",
+        3: "i4",
+        5: "u4",
+        6: "f4",
+        7: "f8",
+        8: "u1",
+        10: "i1",
+        11: "i8",
+        12: "u8",
+    }
+
+    def __init__(self, f, deferred_array_size=None):
+        """
+        Parameters
+        ----------
+        f : file object
+            The DM file opened in binary mode.
+        deferred_array_size : int or None
+            If not None, the numeric arrays of the tags with more elements
+            than this value are not read when parsing the tags and are stored
+            as :py:class:`DeferredTagArray`, which are read on first access.
+        """
         self.dm_version = None
         self.endian = None
         self.tags_dict = None
         self.f = f
+        self.deferred_array_size = deferred_array_size
 
     def parse_file(self):
         self.f.seek(0)
@@ -96,8 +146,11 @@ class DigitalMicrographReader(object):
             group_dict = {}
         unnammed_data_tags = 0
         unnammed_group_tags = 0
+        # avoid the cost of the debug calls (and of their arguments)
+        debug = _logger.isEnabledFor(logging.DEBUG)
         for tag in range(ntags):
-            _logger.debug("Reading tag name at address: %s", self.f.tell())
+            if debug:
+                _logger.debug("Reading tag name at address: %s", self.f.tell())
             tag_header = self.parse_tag_header()
             tag_name = tag_header["tag_name"]
             if "." in tag_name:
@@ -106,34 +159,40 @@ class DigitalMicrographReader(object):
                 tag_name = tag_name.replace(".", "")
 
             skip = True if (group_name == "ImageData" and tag_name == "Data") else False
-            _logger.debug("Tag name: %s", tag_name[:20])
-            _logger.debug("Tag ID: %s", tag_header["tag_id"])
+            if debug:
+                _logger.debug("Tag name: %s", tag_name[:20])
+                _logger.debug("Tag ID: %s", tag_header["tag_id"])
 
             if tag_header["tag_id"] == 21:  # it's a TagType (DATA)
                 if not tag_name:
                     tag_name = "Data%i" % unnammed_data_tags
                     unnammed_data_tags += 1
 
-                _logger.debug("Reading data tag at address: %s", self.f.tell())
+                if debug:
+                    _logger.debug("Reading data tag at address: %s", self.f.tell())
 
                 # Start reading the data
                 # Raises IOError if it is wrong
                 self.check_data_tag_delimiter()
                 infoarray_size = self.read_l_or_q(self.f, "big")
-                _logger.debug("Infoarray size: %s", infoarray_size)
+                if debug:
+                    _logger.debug("Infoarray size: %s", infoarray_size)
                 if infoarray_size == 1:  # Simple type
-                    _logger.debug("Reading simple data")
+                    if debug:
+                        _logger.debug("Reading simple data")
                     etype = self.read_l_or_q(self.f, "big")
                     data = self.read_simple_data(etype)
                 elif infoarray_size == 2:  # String
-                    _logger.debug("Reading string")
+                    if debug:
+                        _logger.debug("Reading string")
                     enctype = self.read_l_or_q(self.f, "big")
                     if enctype != 18:
                         raise IOError("Expected 18 (string), got %i" % enctype)
                     string_length = self.parse_string_definition()
                     data = self.read_string(string_length, skip=skip)
                 elif infoarray_size == 3:  # Array of simple type
-                    _logger.debug("Reading simple array")
+                    if debug:
+                        _logger.debug("Reading simple array")
                     # Read array header
                     enctype = self.read_l_or_q(self.f, "big")
                     if enctype != 20:  # Should be 20 if it is an array
@@ -143,9 +202,11 @@ class DigitalMicrographReader(object):
                 elif infoarray_size > 3:
                     enctype = self.read_l_or_q(self.f, "big")
                     if enctype == 15:  # It is a struct
-                        _logger.debug("Reading struct")
+                        if debug:
+                            _logger.debug("Reading struct")
                         definition = self.parse_struct_definition()
-                        _logger.debug("Struct definition %s", definition)
+                        if debug:
+                            _logger.debug("Struct definition %s", definition)
                         data = self.read_struct(definition, skip=skip)
                     elif enctype == 20:  # It is an array of complex type
                         # Read complex array info
@@ -154,11 +215,13 @@ class DigitalMicrographReader(object):
                         # size <4>
                         enc_eltype = self.read_l_or_q(self.f, "big")
                         if enc_eltype == 15:  # Array of structs
-                            _logger.debug("Reading array of structs")
+                            if debug:
+                                _logger.debug("Reading array of structs")
                             definition = self.parse_struct_definition()
                             size = self.read_l_or_q(self.f, "big")
-                            _logger.debug("Struct definition: %s", definition)
-                            _logger.debug("Array size: %s", size)
+                            if debug:
+                                _logger.debug("Struct definition: %s", definition)
+                                _logger.debug("Array size: %s", size)
                             data = self.read_array(
                                 size=size,
                                 enc_eltype=enc_eltype,
@@ -166,7 +229,8 @@ class DigitalMicrographReader(object):
                                 skip=skip,
                             )
                         elif enc_eltype == 18:  # Array of strings
-                            _logger.debug("Reading array of strings")
+                            if debug:
+                                _logger.debug("Reading array of strings")
                             string_length = self.parse_string_definition()
                             size = self.read_l_or_q(self.f, "big")
                             data = self.read_array(
@@ -176,7 +240,8 @@ class DigitalMicrographReader(object):
                                 skip=skip,
                             )
                         elif enc_eltype == 20:  # Array of arrays
-                            _logger.debug("Reading array of arrays")
+                            if debug:
+                                _logger.debug("Reading array of arrays")
                             el_length, enc_eltype = self.parse_array_definition()
                             size = self.read_l_or_q(self.f, "big")
                             data = self.read_array(
@@ -195,7 +260,8 @@ class DigitalMicrographReader(object):
                 if not tag_name:
                     tag_name = "TagGroup%i" % unnammed_group_tags
                     unnammed_group_tags += 1
-                _logger.debug("Reading Tag group at address: %s", self.f.tell())
+                if debug:
+                    _logger.debug("Reading Tag group at address: %s", self.f.tell())
                 ntags = self.parse_tag_group(size=True)[2]
                 group_dict[tag_name] = {}
                 self.parse_tags(
@@ -314,13 +380,8 @@ class DigitalMicrographReader(object):
                 "offset": offset,
                 "endian": self.endian,
             }
-        data = b""
-        if self.endian == "little":
-            s = iou.L_char
-        elif self.endian == "big":
-            s = iou.B_char
-        for char in range(length):
-            data += s.unpack(self.f.read(1))[0]
+        # 1-Byte chars: the endianness doesn't matter
+        data = self.f.read(length)
         try:
             data = data.decode("utf8")
         except Exception:
@@ -337,23 +398,17 @@ class DigitalMicrographReader(object):
         endian can be either 'big' or 'little'.
 
         """
-        field_value = []
-        size_bytes = 0
-        offset = self.f.tell()
         for dtype in definition:
-            if dtype in self.simple_type:
-                if skip is False:
-                    data = self.get_data_reader(dtype)[0](self.f, self.endian)
-                    field_value.append(data)
-                else:
-                    sbytes = self.get_data_reader(dtype)[1]
-                    self.f.seek(sbytes, 1)
-                    size_bytes += sbytes
-            else:
+            if dtype not in self.simple_type:
                 raise DM3DataTypeError(dtype)
         if skip is False:
-            return tuple(field_value)
+            # read all the fields at once
+            fmt = self._get_struct_format(definition)
+            return fmt.unpack(self.f.read(fmt.size))
         else:
+            offset = self.f.tell()
+            size_bytes = sum(self.get_data_reader(dtype)[1] for dtype in definition)
+            self.f.seek(size_bytes, 1)
             return {
                 "size": len(definition),
                 "size_bytes": size_bytes,
@@ -384,14 +439,38 @@ class DigitalMicrographReader(object):
                 data["size"] = size
                 data["size_bytes"] *= size
         else:
-            if enc_eltype in self.simple_type:  # simple type
-                data = [eltype(self.f, self.endian) for element in range(size)]
+            if (
+                self.deferred_array_size is not None
+                and size > self.deferred_array_size
+                and enc_eltype in self._numpy_dtype
+            ):
+                data = DeferredTagArray(
+                    filename=self.f.name,
+                    offset=self.f.tell(),
+                    dtype=self._numpy_dtype[enc_eltype],
+                    count=size,
+                    endian=self.endian,
+                )
+                self.f.seek(data.nbytes, 1)
+            elif enc_eltype in self.simple_type:  # simple type
+                # read all the elements at once
+                fmt = self._get_struct_format((enc_eltype,), count=size)
+                data = list(fmt.unpack(self.f.read(fmt.size)))
                 if enc_eltype == 4 and data:  # it's actually a string
                     data = "".join([chr(i) for i in data])
             elif enc_eltype in self._complex_type:
                 data = [eltype(**extra) for element in range(size)]
         return data
 
+    def _get_struct_format(self, types, count=1):
+        """Return the struct.Struct reading at once the given simple types,
+        or ``count`` times the given simple type."""
+        endian = "<" if self.endian == "little" else ">"
+        fmt = "".join(self._struct_format[dtype] for dtype in types)
+        if count != 1:
+            fmt = "%i%s" % (count, fmt)
+        return struct.Struct(endian + fmt)
+
     def parse_tag_group(self, size=False):
         """Parse the root TagGroup of the given DM3 file f.
         Returns the tuple (is_sorted, is_open, n_tags).
@@ -446,6 +525,60 @@ class DigitalMicrographReader(object):
         return images
 
 
+class DeferredTagArray(object):
+    """Numeric array of a tag which is read from the file on first access.
+
+    Large arrays of the tags (e.g. calibration tables or annotations) are
+    stored as a reference to their location in the file when parsing the
+    tags with ``deferred_array_size``, see :py:class:`DigitalMicrographReader`.
+    The array is read when converted to a numpy array (or indexed, iterated,
+    etc.) and then kept.
+
+    Attributes
+    ----------
+    filename, offset, dtype, count
+    """
+
+    def __init__(self, filename, offset, dtype, count, endian="little"):
+        self.filename = filename
+        self.offset = offset
+        self.dtype = np.dtype(dtype).newbyteorder("<" if endian == "little" else ">")
+        self.count = count
+        self._data = None
+
+    @property
+    def nbytes(self):
+        return self.dtype.itemsize * self.count
+
+    def load(self):
+        """Read the array from the file (once) and return it."""
+        if self._data is None:
+            with open(self.filename, "rb") as f:
+                f.seek(self.offset)
+                self._data = np.fromfile(f, dtype=self.dtype, count=self.count)
+        return self._data
+
+    def __array__(self, dtype=None, copy=None):
+        data = self.load()
+        return data if dtype is None else data.astype(dtype)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, key):
+        return self.load()[key]
+
+    def __iter__(self):
+        return iter(self.load().tolist())
+
+    def __repr__(self):
+        return "<DeferredTagArray of %i %s at offset %i>" % (
+            self.count,
+            self.dtype.name,
+            self.offset,
+        )
+
+
 class ImageObject(object):
     def __init__(self, imdict, file, order="C"):
         self.imdict = Box(imdict, box_dots=True)
@@ -654,6 +787,51 @@ class ImageObject(object):
             )
         return data.reshape(self.shape, order=self.order)
 
+    def get_lazy_data(self, chunks="auto"):
+        """Return the data as a dask array memory-mapping the file.
+
+        The packed complex and ABGR data types, which need to be converted
+        after reading, are read in a single chunk.
+
+        Parameters
+        ----------
+        chunks : tuple, int or str
+            The chunks of the dask array. If ``"auto"``, the signal axes are
+            not chunked.
+        """
+        import dask.array as da
+
+        if isinstance(self.imdict.ImageData.Data, np.ndarray):
+            return da.from_array(self.imdict.ImageData.Data, chunks=chunks)
+        if self.imdict.ImageData.DataType in (5, 8, 23, 27, 28):
+            import dask.delayed as dd
+
+            val = dd(self.get_data, pure=True)()
+            return da.from_delayed(val, shape=self.shape, dtype=self.dtype)
+        if chunks == "auto":
+            # one signal per chunk at least
+            chunks = tuple("auto" if nav else -1 for nav in self.navigate)
+        return memmap_distributed(
+            self.filename,
+            dtype=np.dtype(self.dtype),
+            offset=self.imdict.ImageData.Data.offset,
+            shape=self.shape,
+            order=self.order,
+            chunks=chunks,
+        )
+
+    def get_data_placeholder(self):
+        """Return a placeholder with the shape and dtype of the data, without
+        reading it."""
+        shape, dtype = self.shape, self.dtype
+        if self.imdict.ImageData.DataType in (27, 28):  # New packed complex
+            shape = (shape[0], 2 * int(shape[1] / 2 + 1) - 2)
+        elif self.imdict.ImageData.DataType == 5:  # Old packed complex
+            dtype = "complex64"
+        elif self.imdict.ImageData.DataType in (8, 23):  # ABGR
+            dtype = [("R", "u1"), ("G", "u1"), ("B", "u1"), ("A", "u1")]
+        return get_data_placeholder(shape, dtype)
+
     def unpack_new_packed_complex(self, data):
         packed_shape = (self.shape[0], int(self.shape[1] / 2 + 1))
         data = data.reshape(packed_shape, order=self.order)
@@ -1250,7 +1428,9 @@ class ImageObject(object):
         return mapping
 
 
-def file_reader(filename, lazy=False, order=None, optimize=True):
+def file_reader(
+    filename, lazy=False, order=None, optimize=True, chunks="auto", metadata_only=False
+):
     """
     Read a DM3/4 file and loads the data into the appropriate class.
 
@@ -1271,12 +1451,25 @@ def file_reader(filename, lazy=False, order=None, optimize=True):
         during data loading, which for large data sets can lead to a slow down on
         machines with limited memory. When operating on lazy signals, if ``True``,
         the chunks are optimised for the new axes configuration.
+    %s
+        If ``"auto"``, the signal axes are not chunked. The data is read
+        through a memory map, so that every chunk reads only its own part of
+        the file, except for the packed complex and RGBA data types, which are
+        read as a single chunk.
+    %s
+        The large numeric arrays of the tags are then read from the file
+        only when they are accessed.
 
     %s
     """
+    if metadata_only:
+        # the placeholder of the data must not be copied
+        optimize = False
 
     with open(filename, "rb") as f:
-        dm = DigitalMicrographReader(f)
+        dm = DigitalMicrographReader(
+            f, deferred_array_size=_DEFERRED_ARRAY_SIZE if metadata_only else None
+        )
         dm.parse_file()
         images = [
             ImageObject(imdict, f, order=order)
@@ -1295,13 +1488,11 @@ def file_reader(filename, lazy=False, order=None, optimize=True):
             if image.to_spectrum is True:
                 post_process.append(lambda s: s.to_signal1D(optimize=optimize))
             post_process.append(lambda s: s.squeeze())
-            if lazy:
+            if metadata_only:
+                data = image.get_data_placeholder()
+            elif lazy:
                 image.filename = filename
-                import dask.delayed as dd
-                from dask.array import from_delayed
-
-                val = dd(image.get_data, pure=True)()
-                data = from_delayed(val, shape=image.shape, dtype=image.dtype)
+                data = image.get_lazy_data(chunks=chunks)
             else:
                 data = image.get_data()
             # in the event there are multiple signals contained within this
@@ -1324,4 +1515,10 @@ def file_reader(filename, lazy=False, order=None, optimize=True):
     return imd
 
 
-file_reader.__doc__ %= (FILENAME_DOC, LAZY_DOC, RETURNS_DOC)
+file_reader.__doc__ %= (
+    FILENAME_DOC,
+    LAZY_DOC,
+    CHUNKS_READ_DOC,
+    METADATA_ONLY_DOC,
+    RETURNS_DOC,
+)
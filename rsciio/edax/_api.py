@@ -29,10 +29,11 @@ from rsciio._docstrings import (
     ENDIANESS_DOC,
     FILENAME_DOC,
     LAZY_DOC,
+    METADATA_ONLY_DOC,
     RETURNS_DOC,
 )
 from rsciio.utils.elements import atomic_number2name
-from rsciio.utils.tools import sarray2dict
+from rsciio.utils.tools import get_data_placeholder, sarray2dict
 
 _logger = logging.getLogger(__name__)
 
@@ -684,7 +685,14 @@ def _add_spc_metadata(metadata, spc_header):
     return metadata
 
 
-def spc_reader(filename, lazy=False, endianess="<", load_all_spc=False, **kwds):
+def spc_reader(
+    filename,
+    lazy=False,
+    endianess="<",
+    load_all_spc=False,
+    metadata_only=False,
+    **kwds,
+):
     """
     Read data from an SPC spectrum specified by filename.
 
@@ -696,6 +704,7 @@ def spc_reader(filename, lazy=False, endianess="<", load_all_spc=False, **kwds):
     load_all_spc : bool, Default=False
         Switch to control whether the complete .spc header is read, or just the
         important parts for import into RosettaSciIO.
+    %s
     **kwds
         Remaining arguments are passed to the Numpy ``memmap`` function
 
@@ -715,10 +724,13 @@ def spc_reader(filename, lazy=False, endianess="<", load_all_spc=False, **kwds):
         if lazy:
             mode = "r"
 
-        # Read data from file into a numpy memmap object
-        data = np.memmap(
-            f, mode=mode, offset=data_offset, dtype="u4", shape=(1, nz), **kwds
-        ).squeeze()
+        if metadata_only:
+            data = get_data_placeholder((1, nz), "u4").squeeze()
+        else:
+            # Read data from file into a numpy memmap object
+            data = np.memmap(
+                f, mode=mode, offset=data_offset, dtype="u4", shape=(1, nz), **kwds
+            ).squeeze()
 
     # create the energy axis dictionary:
     energy_axis = {
@@ -755,7 +767,13 @@ def spc_reader(filename, lazy=False, endianess="<", load_all_spc=False, **kwds):
     ]
 
 
-spc_reader.__doc__ %= (FILENAME_DOC, LAZY_DOC, ENDIANESS_DOC, RETURNS_DOC)
+spc_reader.__doc__ %= (
+    FILENAME_DOC,
+    LAZY_DOC,
+    ENDIANESS_DOC,
+    METADATA_ONLY_DOC,
+    RETURNS_DOC,
+)
 
 
 def spd_reader(
@@ -765,6 +783,7 @@ def spd_reader(
     spc_fname=None,
     ipr_fname=None,
     load_all_spc=False,
+    metadata_only=False,
     **kwds,
 ):
     """
@@ -792,6 +811,7 @@ def spd_reader(
     load_all_spc : bool, Default=False
         Switch to control whether the complete .spc header is read, or just the
         important parts for import into HyperSpy.
+    %s
     **kwds
         Remaining arguments are passed to the Numpy ``memmap`` function.
 
@@ -814,13 +834,16 @@ def spd_reader(
         if lazy:
             mode = "r"
 
-        # Read data from file into a numpy memmap object
-        data = (
-            np.memmap(f, mode=mode, offset=data_offset, dtype=data_type, **kwds)
-            .squeeze()
-            .reshape((nz, nx, ny), order="F")
-            .T
-        )
+        if metadata_only:
+            data = get_data_placeholder((ny, nx, nz), data_type)
+        else:
+            # Read data from file into a numpy memmap object
+            data = (
+                np.memmap(f, mode=mode, offset=data_offset, dtype=data_type, **kwds)
+                .squeeze()
+                .reshape((nz, nx, ny), order="F")
+                .T
+            )
 
     # Convert char arrays to strings:
     original_metadata["spd_header"]["tag"] = spd_header["tag"][0].view("S16")[0]
@@ -948,7 +971,13 @@ def spd_reader(
     ]
 
 
-spd_reader.__doc__ %= (FILENAME_DOC, LAZY_DOC, ENDIANESS_DOC, RETURNS_DOC)
+spd_reader.__doc__ %= (
+    FILENAME_DOC,
+    LAZY_DOC,
+    ENDIANESS_DOC,
+    METADATA_ONLY_DOC,
+    RETURNS_DOC,
+)
 
 
 def file_reader(
@@ -958,6 +987,7 @@ def file_reader(
     spc_fname=None,
     ipr_fname=None,
     endianess="<",
+    metadata_only=False,
     **kwds,
 ):
     """
@@ -988,6 +1018,7 @@ def file_reader(
         Otherwise, the name of the .ipr file to use for spatial calibration
         can be explicitly given as a string.
     %s
+    %s
     **kwds : dict, optional
         Remaining arguments are passed to :py:class:`numpy.memmap`.
 
@@ -1007,12 +1038,26 @@ def file_reader(
             spc_fname=spc_fname,
             ipr_fname=ipr_fname,
             load_all_spc=load_all_spc,
+            metadata_only=metadata_only,
             **kwds,
         )
     elif ext == "spc":
-        return spc_reader(filename, lazy, endianess, load_all_spc=load_all_spc, **kwds)
+        return spc_reader(
+            filename,
+            lazy,
+            endianess,
+            load_all_spc=load_all_spc,
+            metadata_only=metadata_only,
+            **kwds,
+        )
     else:
         raise ValueError(f"'{ext}' is not a supported extension for the edax reader.")
 
 
-file_reader.__doc__ %= (FILENAME_DOC, LAZY_DOC, ENDIANESS_DOC, RETURNS_DOC)
+file_reader.__doc__ %= (
+    FILENAME_DOC,
+    LAZY_DOC,
+    ENDIANESS_DOC,
+    METADATA_ONLY_DOC,
+    RETURNS_DOC,
+)
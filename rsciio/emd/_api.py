@@ -30,6 +30,7 @@ import h5py
 
 from rsciio._docstrings import (
     CHUNKS_DOC,
+    ENERGY_WINDOWS_DOC,
     FILENAME_DOC,
     LAZY_DOC,
     RETURNS_DOC,
@@ -115,6 +116,7 @@ def file_reader(
     rebin_energy=1,
     SI_dtype=None,
     load_SI_image_stack=False,
+    energy_windows=None,
 ):
     """
     Read EMD file, which can be an NCEM or a Velox variant of the EMD format.
@@ -165,6 +167,10 @@ def file_reader(
         simultaneously with the EDS spectrum image. This option can be useful to
         monitor any specimen changes during the acquisition or to correct the
         spatial drift in the spectrum image by using the STEM images.
+    %s
+        Velox only: the maps are binned directly from the spectrum stream and
+        are always read into memory (``lazy`` is ignored for the spectrum
+        image).
 
     %s
     """
@@ -185,6 +191,7 @@ def file_reader(
                 rebin_energy=rebin_energy,
                 SI_dtype=SI_dtype,
                 load_SI_image_stack=load_SI_image_stack,
+                energy_windows=energy_windows,
             )
             emd_reader.read_file(file)
         elif is_EMD_NCEM(file):
@@ -208,7 +215,7 @@ def file_reader(
     return dictionaries
 
 
-file_reader.__doc__ %= (FILENAME_DOC, LAZY_DOC, RETURNS_DOC)
+file_reader.__doc__ %= (FILENAME_DOC, LAZY_DOC, ENERGY_WINDOWS_DOC, RETURNS_DOC)
 
 
 def file_writer(filename, signal, chunks=None, **kwds):
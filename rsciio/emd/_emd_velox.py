@@ -41,6 +41,11 @@ from rsciio.utils.hdf5 import (
     _parse_sub_data_group_metadata,
 )
 from rsciio.utils.tools import _UREG, convert_units
+from rsciio.utils.windowed_maps import (
+    energy_windows_to_channels,
+    get_energy_windows,
+    windowed_maps_dictionary,
+)
 
 _logger = logging.getLogger(__name__)
 
@@ -99,9 +104,9 @@ class FeiEMDReader(object):
         SI_dtype=None,
         load_SI_image_stack=False,
         lazy=False,
+        energy_windows=None,
     ):
-        # TODO: Finish lazy implementation using the `FrameLocationTable`
-        # Parallelise streams reading
+        # TODO: Parallelise streams reading
         self.filename = filename
         self.select_type = select_type
         self.dictionaries = []
@@ -113,6 +118,11 @@ class FeiEMDReader(object):
         self.SI_data_dtype = SI_dtype
         self.load_SI_image_stack = load_SI_image_stack
         self.lazy = lazy
+        self.energy_windows = energy_windows
+        if energy_windows is not None:
+            self.energy_windows_names, self.energy_windows_energies = (
+                get_energy_windows(energy_windows)
+            )
         self.detector_name = None
         self.original_metadata = {}
         # UUID: label mapping
@@ -586,11 +596,16 @@ class FeiEMDReader(object):
             # add other stream streams
             if len(subgroup_keys) > 1:
                 for key in subgroup_keys[1:]:
+                    if self.lazy and self.energy_windows is None:
+                        lazy_array = s0.stream_to_lazy_array(
+                            stream_data=spectrum_stream_group[key]["Data"]
+                        )
+                        s0.spectrum_image = s0.spectrum_image + lazy_array
+                        continue
                     stream_data = spectrum_stream_group[key]["Data"][:].T[0]
-                    if self.lazy:
-                        s0.spectrum_image = (
-                            s0.spectrum_image
-                            + s0.stream_to_sparse_array(stream_data=stream_data)
+                    if self.energy_windows is not None:
+                        s0.stream_to_windowed_maps(
+                            stream_data=stream_data, maps=s0.spectrum_image
                         )
                     else:
                         s0.stream_to_array(
@@ -598,12 +613,19 @@ class FeiEMDReader(object):
                         )
         else:
             streams = [_read_stream(key) for key in subgroup_keys]
-        if self.lazy:
+        if self.lazy and self.energy_windows is None:
             for stream in streams:
                 sa = stream.spectrum_image.astype(self.SI_data_dtype)
                 stream.spectrum_image = sa
 
         spectrum_image_shape = streams[0].shape
+        if self.energy_windows is not None:
+            # shape of the spectrum image: remove the window axis of the maps
+            spectrum_image_shape = (
+                spectrum_image_shape[:-3]
+                + spectrum_image_shape[-2:]
+                + (streams[0].bin_count // self.rebin_energy,)
+            )
         original_metadata = streams[0].original_metadata
         original_metadata.update(self.original_metadata)
 
@@ -682,15 +704,29 @@ class FeiEMDReader(object):
         for stream in streams:
             original_metadata = stream.original_metadata
             original_metadata.update(self.original_metadata)
+            mapping = self._get_mapping(
+                parse_individual_EDS_detector_metadata=not self.sum_frames
+            )
+            if self.energy_windows is not None:
+                dictionary = windowed_maps_dictionary(
+                    stream.spectrum_image,
+                    self.energy_windows_names,
+                    self.energy_windows_energies,
+                    axes[-3:-1],
+                    md,
+                    original_metadata,
+                    navigation_axes=axes[:-3],
+                )
+                dictionary["mapping"] = mapping
+                self.dictionaries.append(dictionary)
+                continue
             self.dictionaries.append(
                 {
                     "data": stream.spectrum_image,
                     "axes": axes,
                     "metadata": md,
                     "original_metadata": original_metadata,
-                    "mapping": self._get_mapping(
-                        parse_individual_EDS_detector_metadata=not self.sum_frames
-                    ),
+                    "mapping": mapping,
                 }
             )
 
@@ -901,8 +937,20 @@ class FeiSpectrumStream(object):
             self.reader.SI_data_dtype = acquisition_settings["StreamEncoding"]
         # Parse the rest of the metadata for storage
         self.original_metadata = _parse_sub_data_group_metadata(stream_group)
+        if self.reader.lazy and self.reader.energy_windows is None:
+            # The stream is not loaded in memory, only the start of the lines
+            # of pixels are indexed and read by the blocks of the dask array.
+            stream_data = self.stream_group["Data"]
+            self.line_starts = self.get_line_starts(stream_data)
+            if self.reader.last_frame is None:
+                last_frame = int(
+                    np.ceil(len(self.line_starts) / self.reader.spatial_shape[0])
+                )
+                self.reader.last_frame = last_frame
+                self.reader.number_of_frames = last_frame
+        else:
+            stream_data = self.stream_group["Data"][:].T[0]
         # If last_frame is None, compute it
-        stream_data = self.stream_group["Data"][:].T[0]
         if self.reader.last_frame is None:
             # The information could not be retrieved from metadata
             # we compute, which involves iterating once over the whole stream.
@@ -925,8 +973,12 @@ class FeiSpectrumStream(object):
             "Number_of_channels": self.bin_count,
         }
         # Convert stream to spectrum image
-        if self.reader.lazy:
-            self.spectrum_image = self.stream_to_sparse_array(stream_data=stream_data)
+        if self.reader.energy_windows is not None:
+            self.spectrum_image = self.stream_to_windowed_maps(stream_data=stream_data)
+        elif self.reader.lazy:
+            self.spectrum_image = self.stream_to_lazy_array(
+                stream_data=stream_data, line_starts=self.line_starts
+            )
         else:
             self.spectrum_image = self.stream_to_array(stream_data=stream_data)
 
@@ -938,29 +990,46 @@ class FeiSpectrumStream(object):
         om_br = self.original_metadata["BinaryResult"]
         return om_br["PixelSize"], om_br["Offset"], om_br["PixelUnitX"]
 
-    def stream_to_sparse_array(self, stream_data):
+    def get_line_starts(self, stream_data):
+        """Index the start of the lines of pixels of a stream.
+
+        Parameters
+        ----------
+        stream_data: array or h5py dataset
+
+        """
         import rsciio.utils.fei_stream_readers as stream_readers
 
-        """Convert stream in sparse array
+        return stream_readers.get_line_boundaries(
+            stream_data, xsize=self.reader.spatial_shape[1]
+        )
+
+    def stream_to_lazy_array(self, stream_data, line_starts=None):
+        """Convert stream to a dask array.
 
         Parameters
         ----------
-        stream_data: array
+        stream_data: array or h5py dataset
+        line_starts: array or None
+            The start of the lines of pixels in the stream. If None, the
+            stream is indexed.
 
         """
-        # Here we load the stream data into memory, which is fine is the
-        # arrays are small. We could load them lazily when lazy.
-        stream_data = self.stream_group["Data"][:].T[0]
-        sparse_array = stream_readers.stream_to_sparse_COO_array(
-            stream_data=stream_data,
+        import rsciio.utils.fei_stream_readers as stream_readers
+
+        if line_starts is None:
+            line_starts = self.get_line_starts(stream_data)
+        return stream_readers.stream_to_lazy_array(
+            stream=stream_data,
             spatial_shape=self.reader.spatial_shape,
             first_frame=self.reader.first_frame,
             last_frame=self.reader.last_frame,
             channels=self.bin_count,
             sum_frames=self.reader.sum_frames,
             rebin_energy=self.reader.rebin_energy,
+            dtype=self.reader.SI_data_dtype,
+            line_starts=line_starts,
         )
-        return sparse_array
 
     def stream_to_array(self, stream_data, spectrum_image=None):
         """Convert stream to array.
@@ -987,3 +1056,33 @@ class FeiSpectrumStream(object):
             dtype=self.reader.SI_data_dtype,
         )
         return spectrum_image
+
+    def stream_to_windowed_maps(self, stream_data, maps=None):
+        """Convert stream to the maps of the energy windows of the reader.
+
+        Parameters
+        ----------
+        stream_data: array
+        maps: array or None
+            If array, the counts of the stream are added to the maps.
+            Otherwise it creates new maps and returns them.
+
+        """
+        import rsciio.utils.fei_stream_readers as stream_readers
+
+        original_metadata = dict(self.original_metadata)
+        original_metadata.update(self.reader.original_metadata)
+        dispersion, offset, _ = self.reader._get_dispersion_offset(original_metadata)
+        windows = energy_windows_to_channels(
+            self.reader.energy_windows_energies, offset, dispersion
+        )
+        return stream_readers.stream_to_windowed_maps(
+            stream=stream_data,
+            spatial_shape=self.reader.spatial_shape,
+            windows=windows,
+            first_frame=self.reader.first_frame,
+            last_frame=self.reader.last_frame,
+            rebin_energy=self.reader.rebin_energy,
+            sum_frames=self.reader.sum_frames,
+            maps=maps,
+        )
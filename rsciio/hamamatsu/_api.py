@@ -25,7 +25,13 @@ from pathlib import Path
 import numpy as np
 from numpy.polynomial.polynomial import polyfit
 
-from rsciio._docstrings import FILENAME_DOC, LAZY_DOC, RETURNS_DOC
+from rsciio._docstrings import (
+    FILENAME_DOC,
+    LAZY_DOC,
+    METADATA_ONLY_DOC,
+    RETURNS_DOC,
+)
+from rsciio.utils.tools import get_data_placeholder
 
 _logger = logging.getLogger(__name__)
 
@@ -110,11 +116,19 @@ class Scaling_Type(IntEnum, metaclass=DefaultEnumMeta):
 
 
 class IMGReader:
-    def __init__(self, file, filesize, filename, use_uniform_signal_axes):
+    def __init__(
+        self,
+        file,
+        filesize,
+        filename,
+        use_uniform_signal_axes,
+        metadata_only=False,
+    ):
         self._file_obj = file
         self._filesize = filesize
         self._original_filename = filename
         self._use_uniform_signal_axes = use_uniform_signal_axes
+        self._metadata_only = metadata_only
 
         self.original_metadata = {}
         self._h_lines = None
@@ -186,7 +200,11 @@ class IMGReader:
             dtype = "uint32"
         else:
             raise RuntimeError(f"reading type: {file_type} not implemented")
-        data = self.__read_numeric(dtype, size=w_px * self._h_lines)
+        if self._metadata_only:
+            # same dtype as the integers converted by __read_numeric
+            data = get_data_placeholder((w_px * self._h_lines,), "<i8")
+        else:
+            data = self.__read_numeric(dtype, size=w_px * self._h_lines)
         self.original_metadata.update(header)
         return data, comment
 
@@ -271,7 +289,7 @@ class IMGReader:
                 axes_sizes.append(ax["size"])
 
         self.data = np.reshape(self.data, axes_sizes)
-        if self._reverse_signal:
+        if self._reverse_signal and not self._metadata_only:
             self.data = np.ascontiguousarray(self.data[:, ::-1])
 
     @staticmethod
@@ -495,7 +513,9 @@ class IMGReader:
         return metadata
 
 
-def file_reader(filename, lazy=False, use_uniform_signal_axes=False, **kwds):
+def file_reader(
+    filename, lazy=False, use_uniform_signal_axes=False, metadata_only=False, **kwds
+):
     """
     Read Hamamatsu's ``.img`` file.
 
@@ -508,6 +528,7 @@ def file_reader(filename, lazy=False, use_uniform_signal_axes=False, **kwds):
         If ``True``, the ``scale`` attribute is calculated from the average delta
         along the signal axis and a warning is raised in case the delta varies
         by more than 1 percent.
+    %s
     **kwds : dict, optional
         Extra keyword argument will be ignored.
 
@@ -522,6 +543,7 @@ def file_reader(filename, lazy=False, use_uniform_signal_axes=False, **kwds):
             filesize=filesize,
             filename=original_filename,
             use_uniform_signal_axes=use_uniform_signal_axes,
+            metadata_only=metadata_only,
         )
 
         result["data"] = img.data
@@ -534,4 +556,4 @@ def file_reader(filename, lazy=False, use_uniform_signal_axes=False, **kwds):
     ]
 
 
-file_reader.__doc__ %= (FILENAME_DOC, LAZY_DOC, RETURNS_DOC)
+file_reader.__doc__ %= (FILENAME_DOC, LAZY_DOC, METADATA_ONLY_DOC, RETURNS_DOC)
@@ -17,24 +17,37 @@
 # along with RosettaSciIO. If not, see <https://www.gnu.org/licenses/#GPL>.
 
 import logging
+import zlib
 from pathlib import Path
 
 import dask.array as da
 import h5py
+import numpy as np
 from dask.diagnostics import ProgressBar
 from packaging.version import Version
 
 from rsciio._docstrings import (
+    ACCESS_PATTERN_DOC,
+    APPEND_DOC,
     CHUNKS_DOC,
     COMPRESSION_HDF5_DOC,
     COMPRESSION_HDF5_NOTES_DOC,
     FILENAME_DOC,
     LAZY_DOC,
+    PACK_RAGGED_DOC,
+    RECHUNK_ON_SAVE_DOC,
     RETURNS_DOC,
     SHOW_PROGRESSBAR_DOC,
     SIGNAL_DOC,
+    SLICES_DOC,
+)
+from rsciio._hierarchical import (
+    HierarchicalReader,
+    HierarchicalWriter,
+    compatible_version,
+    set_format_version,
+    version,
 )
-from rsciio._hierarchical import HierarchicalReader, HierarchicalWriter, version
 from rsciio.utils.tools import dummy_context_manager, get_file_handle
 
 _logger = logging.getLogger(__name__)
@@ -55,6 +68,65 @@ class HyperspyReader(HierarchicalReader):
         self.Group = h5py.Group
 
 
+def _get_direct_chunk_write_filters(dset):
+    """
+    Return the filters of the dataset if they are supported when compressing
+    the chunks without h5py, otherwise ``None``. The supported filters are
+    ``shuffle`` and ``gzip``.
+    """
+    if dset.chunks is None or dset.dtype.kind == "O":
+        return None
+    plist = dset.id.get_create_plist()
+    filters = [plist.get_filter(i) for i in range(plist.get_nfilters())]
+    filter_ids = [filter_[0] for filter_ in filters]
+    if filter_ids not in [
+        [],
+        [h5py.h5z.FILTER_SHUFFLE],
+        [h5py.h5z.FILTER_DEFLATE],
+        [h5py.h5z.FILTER_SHUFFLE, h5py.h5z.FILTER_DEFLATE],
+    ]:
+        return None
+    return [(filter_[0], filter_[2]) for filter_ in filters]
+
+
+def _compress_chunk(block, dset, filters, block_info=None):
+    """
+    Apply the filters to a chunk and write it to the dataset with a direct
+    chunk write. The compression is done without holding the h5py lock and
+    can therefore run in parallel threads.
+    """
+    offsets = tuple(start for start, _ in block_info[0]["array-location"])
+    block = np.asarray(block, dtype=dset.dtype)
+    if block.shape != dset.chunks:
+        # Edge chunks are stored with the full chunk shape
+        padded = np.full(dset.chunks, dset.fillvalue, dtype=dset.dtype)
+        padded[tuple(slice(0, n) for n in block.shape)] = block
+        block = padded
+    buffer = np.ascontiguousarray(block)
+    for filter_id, options in filters:
+        if filter_id == h5py.h5z.FILTER_SHUFFLE:
+            itemsize = block.itemsize
+            buffer = np.ascontiguousarray(buffer.view(np.uint8).reshape(-1, itemsize).T)
+        elif filter_id == h5py.h5z.FILTER_DEFLATE:
+            buffer = zlib.compress(buffer, options[0])
+    dset.id.write_direct_chunk(offsets, bytes(buffer))
+    return np.ones((1,) * block.ndim, dtype=bool)
+
+
+class _ObjectDatasetTarget:
+    """
+    Write the blocks of a variable length dataset with ``write_direct``, as
+    h5py fails to broadcast object arrays of arrays with a single item (e.g.
+    the shapes of a ragged array of 1D arrays) when assigning a region.
+    """
+
+    def __init__(self, dset):
+        self.dset = dset
+
+    def __setitem__(self, key, value):
+        self.dset.write_direct(np.asarray(value), dest_sel=key)
+
+
 class HyperspyWriter(HierarchicalWriter):
     """
     An object used to simplify and organize the process for
@@ -71,7 +143,15 @@ class HyperspyWriter(HierarchicalWriter):
         self.Group = h5py.Group
 
     @staticmethod
-    def _store_data(data, dset, group, key, chunks, show_progressbar=True):
+    def _store_data(
+        data,
+        dset,
+        group,
+        key,
+        chunks,
+        show_progressbar=True,
+        parallel_compression=False,
+    ):
         # Tuple of dask arrays can also be passed, in which case the task graphs
         # are merged and the data is written in a single `da.store` call.
         # This is useful when saving a ragged array, where we need to write
@@ -87,6 +167,14 @@ class HyperspyWriter(HierarchicalWriter):
                 dset,
             ]
 
+        if parallel_compression is not False and len(data) == 1:
+            filters = _get_direct_chunk_write_filters(dset[0])
+            if filters is not None and data[0].size > 0:
+                HyperspyWriter._store_data_direct_chunk(
+                    data[0], dset[0], filters, show_progressbar, parallel_compression
+                )
+                return
+
         for i, (data_, dset_) in enumerate(zip(data, dset)):
             if isinstance(data_, da.Array):
                 if data_.chunks != dset_.chunks:
@@ -108,7 +196,42 @@ class HyperspyWriter(HierarchicalWriter):
             cm = ProgressBar if show_progressbar else dummy_context_manager
             with cm():
                 # da.store of tuple helps to merge task graphs and avoid computing twice
-                da.store(data, dset)
+                da.store(
+                    data,
+                    [
+                        _ObjectDatasetTarget(dset_)
+                        if dset_.dtype.kind == "O"
+                        else dset_
+                        for dset_ in dset
+                    ],
+                )
+
+    @staticmethod
+    def _store_data_direct_chunk(
+        data, dset, filters, show_progressbar=True, parallel_compression=True
+    ):
+        if isinstance(data, da.Array):
+            data = data.rechunk(dset.chunks)
+        else:
+            data = da.from_array(data, chunks=dset.chunks)
+        written = data.map_blocks(
+            _compress_chunk,
+            dset=dset,
+            filters=filters,
+            chunks=(1,) * data.ndim,
+            dtype=bool,
+            meta=np.array((), dtype=bool),
+        )
+        compute_kwds = {"scheduler": "threads"}
+        if parallel_compression is not True:
+            compute_kwds["num_workers"] = parallel_compression
+        cm = ProgressBar if show_progressbar else dummy_context_manager
+        with cm():
+            written.compute(**compute_kwds)
+
+    @staticmethod
+    def _get_resizable_kwds(shape):
+        return {"maxshape": (None,) + tuple(shape[1:])}
 
     @staticmethod
     def _get_object_dset(group, data, key, chunks, dtype=None, **kwds):
@@ -128,7 +251,7 @@ class HyperspyWriter(HierarchicalWriter):
         return dset
 
 
-def file_reader(filename, lazy=False, **kwds):
+def file_reader(filename, lazy=False, slices=None, **kwds):
     """
     Read data from hdf5-files saved with the HyperSpy hdf5-format
     specification (``.hspy``).
@@ -137,6 +260,7 @@ def file_reader(filename, lazy=False, **kwds):
     ----------
     %s
     %s
+    %s
     **kwds : dict, optional
         The keyword arguments are passed to :py:class:`h5py.File`.
 
@@ -154,7 +278,7 @@ def file_reader(filename, lazy=False, **kwds):
     reader = HyperspyReader(f)
     # Use try, except, finally to close file when an error is raised
     try:
-        exp_dict_list = reader.read(lazy=lazy)
+        exp_dict_list = reader.read(lazy=lazy, slices=slices)
     except BaseException as err:
         raise err
     finally:
@@ -164,7 +288,7 @@ def file_reader(filename, lazy=False, **kwds):
     return exp_dict_list
 
 
-file_reader.__doc__ %= (FILENAME_DOC, LAZY_DOC, RETURNS_DOC)
+file_reader.__doc__ %= (FILENAME_DOC, LAZY_DOC, SLICES_DOC, RETURNS_DOC)
 
 
 def file_writer(
@@ -175,6 +299,11 @@ def file_writer(
     close_file=True,
     write_dataset=True,
     show_progressbar=True,
+    parallel_compression=False,
+    append=False,
+    access_pattern=None,
+    rechunk_on_save=False,
+    pack_ragged=False,
     **kwds,
 ):
     """
@@ -194,6 +323,19 @@ def file_writer(
         overwrite attributes (for example ``axes_manager``) only without having
         to write the whole dataset.
     %s
+    parallel_compression : bool or int, default=False
+        If not ``False``, the chunks of the data are compressed in a pool of
+        threads and written to the file with HDF5 direct chunk writes, so that
+        the compression doesn't hold the HDF5 lock and scales with the number
+        of cores. If an integer, it is the number of threads, otherwise the
+        default number of threads of the dask threaded scheduler is used.
+        It is supported for the ``gzip`` compression (and ``compression=None``),
+        with or without ``shuffle``; for other compression filters, the data
+        is written as with ``parallel_compression=False``.
+    %s
+    %s
+    %s
+    %s
     **kwds
         The keyword argument are passed to the
         :external+h5py:meth:`h5py.Group.require_dataset` function.
@@ -228,13 +370,13 @@ def file_writer(
     if f is None:
         # with "write_dataset=False", we need mode='a', otherwise the dataset
         # will be flushed with using 'w' mode
-        mode = kwds.get("mode", "w" if write_dataset else "a")
+        mode = kwds.get("mode", "w" if write_dataset and not append else "a")
         if mode != "a" and not write_dataset:
-            raise ValueError("`mode='a'` is required to use " "`write_dataset=False`.")
+            raise ValueError("`mode='a'` is required to use `write_dataset=False`.")
         f = h5py.File(filename, mode=mode)
 
     f.attrs["file_format"] = "HyperSpy"
-    f.attrs["file_format_version"] = version
+    set_format_version(f.attrs, compatible_version)
     exps = f.require_group("Experiments")
     title = signal["metadata"]["General"]["title"]
     group_name = title if title else "__unnamed__"
@@ -251,6 +393,11 @@ def file_writer(
         compression=compression,
         write_dataset=write_dataset,
         show_progressbar=show_progressbar,
+        parallel_compression=parallel_compression,
+        append=append,
+        access_pattern=access_pattern,
+        rechunk_on_save=rechunk_on_save,
+        pack_ragged=pack_ragged,
         **kwds,
     )
     # Use try, except, finally to close file when an error is raised
@@ -269,6 +416,10 @@ file_writer.__doc__ %= (
     CHUNKS_DOC,
     COMPRESSION_HDF5_DOC,
     SHOW_PROGRESSBAR_DOC,
+    APPEND_DOC,
+    ACCESS_PATTERN_DOC,
+    RECHUNK_ON_SAVE_DOC,
+    PACK_RAGGED_DOC,
     COMPRESSION_HDF5_NOTES_DOC,
 )
 
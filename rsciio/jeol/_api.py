@@ -24,8 +24,19 @@ from datetime import datetime, timedelta
 
 import numpy as np
 
-from rsciio._docstrings import FILENAME_DOC, LAZY_DOC, RETURNS_DOC
+from rsciio._docstrings import (
+    ENERGY_WINDOWS_DOC,
+    FILENAME_DOC,
+    LAZY_DOC,
+    RETURNS_DOC,
+)
 from rsciio.utils.tools import jit_ifnumba
+from rsciio.utils.windowed_maps import (
+    add_to_windows,
+    energy_windows_to_channels,
+    get_energy_windows,
+    windowed_maps_dictionary,
+)
 
 _logger = logging.getLogger(__name__)
 
@@ -64,6 +75,7 @@ def file_reader(
     frame_list=None,
     frame_shifts=None,
     frame_start_index=None,
+    energy_windows=None,
 ):
     """
     File reader for JEOL Analysist Station software format.
@@ -113,6 +125,10 @@ def file_reader(
     frame_start_index : list, None, default=None
         The list of offset pointers of each frame in the raw data.
         The pointer for frame0 is 0.
+    %s
+        For ``.pts`` files only, the maps are always read into memory
+        (``lazy`` is ignored) and the width of the windows of the X-ray lines
+        is calculated from the energy resolution of the detector.
 
     %s
     """
@@ -127,6 +143,7 @@ def file_reader(
         read_em_image=read_em_image,
         frame_list=frame_list,
         frame_shifts=frame_shifts,
+        energy_windows=energy_windows,
     )
     file_ext = os.path.splitext(filename)[-1][1:].lower()
     if file_ext in extension_to_reader_mapping:
@@ -178,7 +195,7 @@ def _read_asw(filename, **kwargs):
     return image_list
 
 
-file_reader.__doc__ %= (FILENAME_DOC, LAZY_DOC, RETURNS_DOC)
+file_reader.__doc__ %= (FILENAME_DOC, LAZY_DOC, ENERGY_WINDOWS_DOC, RETURNS_DOC)
 
 
 def _read_img(filename, **kwargs):
@@ -283,6 +300,7 @@ def _read_pts(
     frame_start_index=None,
     frame_shifts=None,
     lazy=False,
+    energy_windows=None,
     **kwargs,
 ):
     """
@@ -321,6 +339,10 @@ def _read_pts(
     lazy : bool, default False
         Read spectrum image into sparse array if lazy == True
         SEM/STEM image is always read into dense array (numpy.ndarray)
+    energy_windows : list, dict or None, default None
+        If not None, read the maps of the energy windows with shape
+        ([frame,] window, y, x) instead of the spectrum image. The maps
+        are always read into dense array.
     **kwargs : dict
         Not used.
 
@@ -418,6 +440,16 @@ def _read_pts(
             channel_number = int(
                 np.round((cutoff_at_kV - energy_offset) / energy_scale)
             )
+        detector_hearder = header["PTTD Param"]["Params"]["PARAMPAGE0_SEM"]
+        if energy_windows is not None:
+            names, energies = get_energy_windows(
+                energy_windows, energy_resolution_MnKa=detector_hearder["MnKaRES"]
+            )
+            windows = energy_windows_to_channels(energies, energy_offset, energy_scale)
+            # the maps are small, they are read into memory
+            lazy = False
+        else:
+            windows = np.zeros((0, 2), dtype=np.int64)
         # pixel time in milliseconds
         pixel_time = meas_data_header["Doc"]["DwellTime(msec)"]
 
@@ -510,6 +542,7 @@ def _read_pts(
             read_em_image,
             only_valid_data,
             lazy,
+            windows,
         )
         header["jeol_pts_frame_origin"] = origin
         header["jeol_pts_frame_shifts"] = frame_shifts_1
@@ -518,8 +551,6 @@ def _read_pts(
         # axes for spectrum image  count[(frame,) y, x, energy]
         if sum_frames:
             axes_em = []
-            width = data.shape[1]
-            height = data.shape[0]
         else:
             axes_em = [
                 {
@@ -532,8 +563,10 @@ def _read_pts(
                     "navigate": True,
                 }
             ]
-            width = data.shape[2]
-            height = data.shape[1]
+        if energy_windows is None:
+            height, width = data.shape[-3:-1]
+        else:
+            height, width = data.shape[-2:]
         axes_em.extend(
             [
                 {
@@ -578,7 +611,6 @@ def _read_pts(
         else:
             mode = "TEM"
 
-        detector_hearder = header["PTTD Param"]["Params"]["PARAMPAGE0_SEM"]
         metadata = {
             "Acquisition_instrument": {
                 mode: {
@@ -630,6 +662,16 @@ def _read_pts(
                 "original_metadata": header,
             }
         ]
+        if energy_windows is not None:
+            image_list[0] = windowed_maps_dictionary(
+                data,
+                names,
+                energies,
+                axes_em[-2:],
+                metadata,
+                header,
+                navigation_axes=axes_em[:-2],
+            )
         if read_em_image and has_em_image:
             image_list.append(
                 {
@@ -738,6 +780,7 @@ def _readcube(
     read_em_image,
     only_valid_data,
     lazy,
+    windows,
 ):  # pragma: no cover
     """
         Read spectrum image (and SEM/STEM image) from pts file
@@ -764,6 +807,10 @@ def _readcube(
         frame_shifts : list
             The list of image positions [[x0,y0,z0], ...]. The x, y, z values can
             be negative. The data points outside data cube are ignored.
+        windows : numpy.ndarray
+            The (first, end) channels of the energy windows with shape
+            (windows, 2). If not empty, the maps of the windows are read
+            instead of the spectrum image (not lazily).
 
         Returns
         -------
@@ -771,6 +818,8 @@ def _readcube(
             The spectrum image with shape (frame, x, y, energy) if sum_frames is
             False, otherwise (x, y, energy).
             If lazy is True, the dask array is a COO sparse array.
+            If windows is not empty, the maps with shape (frame, window, x, y)
+            if sum_frames is False, otherwise (window, x, y).
         em_data : numpy.ndarray or dask.array
             The SEM/STEM image with shape (frame, x, y) if sum_frames is False,
             otherwise (x, y).
@@ -805,6 +854,8 @@ def _readcube(
     if lazy:
         hypermap = np.zeros((n_frames), dtype=EM_dtype)  # dummy variable, not used
         data_list = []
+    elif len(windows):
+        hypermap = np.zeros((n_frames, len(windows), height, width), dtype=np.uint32)
     else:
         hypermap = np.zeros((n_frames, height, width, channel_number), dtype=SI_dtype)
 
@@ -873,6 +924,7 @@ def _readcube(
             fs[0],
             fs[2],
             max_value,
+            windows,
         )
         has_em_image = has_em_image or has_em
         if length == 0:  # no data
@@ -902,6 +954,7 @@ def _readcube(
                     fs[0],
                     fs[2],
                     max_value,
+                    windows,
                 )
                 _logger.info(
                     "The last frame (sweep) is incomplete because the acquisition stopped during this frame. The partially acquired frame is ignored. Use 'sum_frames=False, only_valid_data=False' to read all frames individually, including the last partially completed frame."
@@ -913,10 +966,14 @@ def _readcube(
             frame_start_index[frame_num] = p_start
 
     if not lazy:
+        # crop the navigation dimension of the spectrum image or of the maps
+        crop = (slice(height), slice(width))
+        if len(windows):
+            crop = (slice(None),) + crop
         if sum_frames:
             # the first frame has integrated intensity
             return (
-                hypermap[0, :height, :width],
+                hypermap[(0,) + crop],
                 em_image[0, :height, :width],
                 has_em_image,
                 frame_num,
@@ -927,7 +984,7 @@ def _readcube(
             )
         else:
             return (
-                hypermap[:target_frame_num, :height, :width],
+                hypermap[(slice(target_frame_num),) + crop],
                 em_image[:target_frame_num, :height, :width],
                 has_em_image,
                 frame_num,
@@ -1005,6 +1062,7 @@ def _readframe_dense(
     dy,
     dz,
     max_value,
+    windows,
 ):  # pragma: no cover
     """
     Read one frame from pts file. Used in a inner loop of _readcube function.
@@ -1017,7 +1075,9 @@ def _readframe_dense(
         slice of one frame raw data from whole raw data
     countup : 1 for summing up the X-ray events, -1 to cancel selected frame
     hypermap : numpy.ndarray(width, height, channel_number)
-        numpy.ndarray to store decoded spectrum image.
+        numpy.ndarray to store decoded spectrum image, or
+        numpy.ndarray(windows, width, height) to store the maps of the
+        energy windows if windows is not empty.
     em_image : numpy.ndarray
         numpy.ndarray to store decoded SEM/TEM image with dimension (width, height)
         and dtype np.uint16 or np.uint32
@@ -1035,6 +1095,8 @@ def _readframe_dense(
         information of frame shift for drift correction.
     max_value : int
         limit of the data type used in hypermap array
+    windows : numpy.ndarray
+        (first, end) channels of the energy windows, with shape (windows, 2)
 
     Returns
     -------
@@ -1080,13 +1142,16 @@ def _readframe_dense(
         elif value_type == 0xB000:
             z = value // rebin_energy + dz
             if z < channel_number and x >= 0 and y >= 0 and z >= 0:
-                hypermap[y, x, z] += countup
-                if hypermap[y, x, z] == max_value:
-                    raise ValueError(
-                        "The range of the dtype is too small, "
-                        "use `SI_dtype` to set a dtype with "
-                        "higher range."
-                    )
+                if windows.shape[0]:
+                    add_to_windows(hypermap, y, x, z, windows, countup)
+                else:
+                    hypermap[y, x, z] += countup
+                    if hypermap[y, x, z] == max_value:
+                        raise ValueError(
+                            "The range of the dtype is too small, "
+                            "use `SI_dtype` to set a dtype with "
+                            "higher range."
+                        )
         count += 1
 
     if previous_y >= MAX_VAL - height_norm and (
@@ -1118,6 +1183,7 @@ def _readframe_lazy(
     dy,
     dz,
     _3,
+    _4,
 ):  # pragma: no cover
     """
     Read one frame from pts file. Used in a inner loop of _readcube function.
@@ -1145,7 +1211,7 @@ def _readframe_lazy(
     dx, dy, dz : int
         information of frame shift for drift correction.
     _3 : dummy parameter, not used
-
+    _4 : dummy parameter, not used
 
     Returns
     -------
@@ -1,9 +1,18 @@
-from ._api import file_reader, load_mib_data, parse_exposures, parse_timestamps
+from ._api import (
+    file_reader,
+    follow_mib_data,
+    load_mib_data,
+    parse_exposures,
+    parse_headers,
+    parse_timestamps,
+)
 
 __all__ = [
     "file_reader",
+    "follow_mib_data",
     "load_mib_data",
     "parse_exposures",
+    "parse_headers",
     "parse_timestamps",
 ]
 
@@ -21,7 +21,7 @@
 
 import logging
 import os
-import warnings
+import time
 from pathlib import Path
 
 import dask.array as da
@@ -53,6 +53,17 @@ _FIRST_LAST_FRAME = """first_frame, last_frame : int or None, default=None
             first/last index.
         """
 
+_CHECK_FRAME_NUMBERS = """check_frame_numbers : bool, default=False
+        If True, the frame number in the header of each frame is used to
+        place the frames at their position in the scan, which handles
+        dropped, duplicated or out-of-order frames. The missing frames
+        are filled with ``fill_value``, including the frames missing at
+        the end of an interrupted acquisition. ``first_frame`` and
+        ``last_frame`` are then positions in the scan.
+    fill_value : int, default=0
+        The value of the missing frames when ``check_frame_numbers=True``.
+    """
+
 
 class MIBProperties:
     """Class covering Merlin MIB file properties."""
@@ -201,6 +212,8 @@ def load_mib_data(
     return_headers=False,
     print_info=False,
     return_mmap=True,
+    check_frame_numbers=False,
+    fill_value=0,
 ):
     """
     Load Quantum Detectors MIB file from a path or a memory buffer.
@@ -223,6 +236,8 @@ def load_mib_data(
         If True, display information when loading the file.
     return_mmap : bool
         If True, return the :class:`numpy.memmap` object. Default is True.
+        Not supported with ``check_frame_numbers=True``.
+    %s
 
     Returns
     -------
@@ -253,9 +268,34 @@ def load_mib_data(
     # find the number of frames in the file
     frame_number_in_file = mib_prop.file_size // merlin_frame_dtype.itemsize
 
+    if check_frame_numbers:
+        if isinstance(path, bytes):
+            frames = np.frombuffer(
+                path,
+                dtype=merlin_frame_dtype,
+                count=frame_number_in_file,
+                offset=mib_prop.offset,
+            )
+        else:
+            frames = np.memmap(
+                mib_prop.path,
+                dtype=merlin_frame_dtype,
+                mode="r",
+                offset=mib_prop.offset,
+                shape=frame_number_in_file,
+            )
+        # position of the frames in the scan, the frame numbers start at 1
+        frame_positions = _get_header_field(frames["header"], 1).astype(np.int64) - 1
+        if navigation_shape is None:
+            number_of_positions = int(frame_positions.max()) + 1
+        else:
+            number_of_positions = int(np.prod(navigation_shape))
+    else:
+        number_of_positions = frame_number_in_file
+
     # Get the frame slice to load, taking into `None` and negative indexing
     first_frame, last_frame, _ = slice(first_frame, last_frame).indices(
-        frame_number_in_file
+        number_of_positions
     )
     number_of_frames_to_load = int(last_frame - first_frame)
 
@@ -264,7 +304,7 @@ def load_mib_data(
         navigation_shape = (number_of_frames_to_load,)
     elif isinstance(navigation_shape, tuple):
         frame_number = np.prod(navigation_shape)
-        if frame_number > frame_number_in_file:
+        if frame_number > frame_number_in_file and not check_frame_numbers:
             # Case of interrupted acquisition
             # Set the corrected number of lines
             # To keep the implementation simple only load completed line
@@ -300,12 +340,45 @@ def load_mib_data(
     if mib_prop.raw:  # pragma: no cover
         raise NotImplementedError("RAW MIB data not supported.")
 
+    if check_frame_numbers:
+        frame_index = _get_frame_index(frame_positions - first_frame, int(mib_prop.xy))
+        if isinstance(chunks, tuple) and len(chunks) > 2:
+            # Since the data is reshaped later on, we set only the
+            # signal dimension chunks here
+            _chunks = ("auto",) + chunks[-2:]
+        else:
+            _chunks = chunks
+        if lazy or distributed:
+            data_chunks = da.core.normalize_chunks(
+                _chunks,
+                shape=frame_index.shape + mib_prop.merlin_size,
+                dtype=data_dtype,
+            )
+            data = da.map_blocks(
+                _take_frames_from_file,
+                da.from_array(frame_index, chunks=data_chunks[:1]),
+                filename=mib_prop.path,
+                frame_dtype=merlin_frame_dtype,
+                offset=mib_prop.offset,
+                frame_number=frame_number_in_file,
+                fill_value=fill_value,
+                dtype=data_dtype,
+                chunks=data_chunks,
+                new_axis=(1, 2),
+            )
+            if not lazy:
+                data = data.compute()
+        else:
+            data = _take_frames(frame_index, frames["data"], fill_value)
+        headers = np.zeros(frame_index.shape, dtype=frames["header"].dtype)
+        headers[frame_index >= 0] = frames["header"][frame_index[frame_index >= 0]]
+        del frames
     # map the file to memory, if a numpy or memmap array is given, work with
     # it as with a buffer
     # buffer needs to have the exact structure of MIB file,
     # if it is read from TCPIP interface it needs to drop first 15 bytes which
     # describe the stream size. Also watch for the coma in front of the stream.
-    if isinstance(mib_prop.path, str):
+    elif isinstance(mib_prop.path, str):
         memmap_kwargs = dict(
             filename=mib_prop.path,
             # take into account first_frame
@@ -332,10 +405,10 @@ def load_mib_data(
     else:  # pragma: no cover
         raise TypeError("`path` must be a str or a buffer.")
 
-    if not distributed:
+    if not distributed and not check_frame_numbers:
         headers = data["header"]
         data = data["data"]
-    if not return_mmap:
+    if not return_mmap and not check_frame_numbers:
         if not distributed and lazy:
             if isinstance(chunks, tuple) and len(chunks) > 2:
                 # Since the data is reshaped later on, we set only the
@@ -355,7 +428,7 @@ def load_mib_data(
         data = data.rechunk(chunks)
 
     if return_headers:
-        if distributed:
+        if distributed and not check_frame_numbers:
             raise ValueError(
                 "Retuning headers is not supported with `distributed=True`."
             )
@@ -372,9 +445,186 @@ load_mib_data.__doc__ %= (
     NAVIGATION_SHAPE,
     _FIRST_LAST_FRAME,
     DISTRIBUTED_DOC,
+    _CHECK_FRAME_NUMBERS,
 )
 
 
+def _get_frame_index(frame_positions, number_of_frames):
+    """
+    Get the index in the file of the frame at each position of the scan.
+
+    Parameters
+    ----------
+    frame_positions : numpy.ndarray
+        The position in the scan of each frame of the file.
+    number_of_frames : int
+        The number of positions of the scan.
+
+    Returns
+    -------
+    numpy.ndarray
+        The index of the frame at each position, -1 for the missing frames.
+        For duplicated frames, the first one is used.
+    """
+    frame_index = np.full(number_of_frames, -1, dtype=np.int64)
+    in_scan = np.flatnonzero(
+        (frame_positions >= 0) & (frame_positions < number_of_frames)
+    )
+    positions, first = np.unique(frame_positions[in_scan], return_index=True)
+    frame_index[positions] = in_scan[first]
+
+    missing = number_of_frames - len(positions)
+    duplicated = len(in_scan) - len(positions)
+    out_of_order = np.count_nonzero(np.diff(frame_positions[in_scan]) < 0)
+    if missing or duplicated or out_of_order:
+        _logger.warning(
+            f"{missing} missing, {duplicated} duplicated and {out_of_order} "
+            "out-of-order frames have been found from the frame numbers. "
+            "The frames are placed at their position in the scan and the "
+            "missing frames are filled."
+        )
+    return frame_index
+
+
+def _take_frames(frame_index, frames, fill_value):
+    valid = frame_index >= 0
+    data = np.full(frame_index.shape + frames.shape[1:], fill_value, dtype=frames.dtype)
+    data[valid] = frames[frame_index[valid]]
+    return data
+
+
+def _take_frames_from_file(
+    frame_index, filename, frame_dtype, offset, frame_number, fill_value
+):
+    frames = np.memmap(
+        filename, dtype=frame_dtype, mode="r", offset=offset, shape=frame_number
+    )
+    return _take_frames(frame_index, frames["data"], fill_value)
+
+
+def follow_mib_data(
+    path,
+    number_of_frames=None,
+    batch_size=1,
+    poll_interval=0.1,
+    timeout=10.0,
+    mib_prop=None,
+    return_headers=False,
+):
+    """
+    Iterate over the frames of a MIB file while it is being written, for
+    example during a live acquisition.
+
+    The file is checked every ``poll_interval`` and the frames completed since
+    the previous iteration are memory-mapped and returned, without reading the
+    frames returned previously again.
+
+    Parameters
+    ----------
+    path : str
+        The path to the ``mib`` file.
+    number_of_frames : int or None, default=None
+        The number of frames of the acquisition. The iteration stops once all
+        frames have been returned. If None, the iteration stops when the file
+        doesn't grow during ``timeout``.
+    batch_size : int, default=1
+        The minimum number of frames returned at each iteration, except for
+        the last one. All completed frames are returned at each iteration.
+    poll_interval : float, default=0.1
+        The time in seconds between two checks of the size of the file.
+    timeout : float, default=10.0
+        The time in seconds after which the iteration stops when the file
+        doesn't grow.
+    mib_prop : ``MIBProperties``, default=None
+        The ``MIBProperties`` instance of the file. If None, it will be
+        parsed from the file once its first header has been written.
+        Its ``file_size`` and ``number_of_frames_in_file`` attributes are
+        updated at each iteration.
+    return_headers : bool, default=False
+        If True, also return the headers of the frames.
+
+    Yields
+    ------
+    numpy.ndarray
+        The new frames with shape (frames, y, x). If ``return_headers`` is
+        True, a tuple of the frames and their headers.
+
+    Examples
+    --------
+    Compute a virtual image while the file is written:
+
+    >>> from rsciio.quantumdetector import follow_mib_data
+    >>> intensities = []
+    >>> for frames in follow_mib_data("file.mib", number_of_frames=256 * 256):
+    ...     intensities.extend(frames[:, 100:150, 100:150].sum(axis=(1, 2)))
+    """
+    path = str(path)
+    last_change = time.monotonic()
+    while mib_prop is None:
+        # wait for the first header to be written
+        if os.path.exists(path) and os.path.getsize(path) >= 768:
+            mib_prop = MIBProperties()
+            mib_prop.parse_file(path)
+        elif time.monotonic() - last_change > timeout:
+            return
+        else:
+            time.sleep(poll_interval)
+
+    if mib_prop.raw:  # pragma: no cover
+        raise NotImplementedError("RAW MIB data not supported.")
+
+    # As we save the dtype name, we don't have the endianess and we
+    # need to specify it here
+    merlin_frame_dtype = np.dtype(
+        [
+            ("header", np.bytes_, mib_prop.head_size),
+            (
+                "data",
+                np.dtype(mib_prop.dtype).newbyteorder(">"),
+                mib_prop.merlin_size,
+            ),
+        ]
+    )
+    frames_read = 0
+    frames_written = 0
+    while number_of_frames is None or frames_read < number_of_frames:
+        mib_prop.file_size = os.path.getsize(path)
+        frame_number_in_file = (
+            mib_prop.file_size - mib_prop.offset
+        ) // merlin_frame_dtype.itemsize
+        if number_of_frames is not None:
+            frame_number_in_file = min(frame_number_in_file, number_of_frames)
+        mib_prop.number_of_frames_in_file = frame_number_in_file
+        new_frames = frame_number_in_file - frames_read
+        now = time.monotonic()
+        if frame_number_in_file > frames_written:
+            frames_written = frame_number_in_file
+            last_change = now
+        timed_out = now - last_change > timeout
+        if new_frames >= batch_size or (
+            new_frames > 0 and (timed_out or frame_number_in_file == number_of_frames)
+        ):
+            # map only the frames which haven't been read yet
+            frames = np.memmap(
+                path,
+                dtype=merlin_frame_dtype,
+                mode="r",
+                offset=mib_prop.offset + merlin_frame_dtype.itemsize * frames_read,
+                shape=new_frames,
+            )
+            data = np.array(frames["data"])
+            if return_headers:
+                yield data, np.array(frames["header"])
+            else:
+                yield data
+            del frames
+            frames_read = frame_number_in_file
+        elif timed_out:
+            return
+        else:
+            time.sleep(poll_interval)
+
+
 def parse_hdr_file(path):
     result = {}
     with open(path, "r") as f:
@@ -401,9 +651,119 @@ _HEADERS_DOCSTRING = """headers : bytes str or iterable of bytes str
 
 _MAX_INDEX_DOCSTRING = """max_index : int
         Define the maximum index of the frame to be considered to avoid
-        reading the header of all frames. If -1 (default), all frames will
-        be read.
+        reading the header of all frames. If -1, all frames will be read.
+    """
+
+
+def _get_headers_array(headers, max_index=-1):
+    if isinstance(headers, bytes):
+        headers = [headers]
+    # for the memmap of the headers, this is a view without copy
+    headers = np.asarray(headers)
+    if max_index != -1:
+        headers = headers[:max_index]
+    return headers
+
+
+def _get_header_field(headers, index):
+    """
+    Get a field of the comma separated headers of all frames.
+
+    The position of the field is located in the first header only and the
+    field of all headers is sliced at once from the bytes of the headers.
+    The field of the headers which don't have the same layout as the first
+    header is obtained by splitting these headers.
+
+    Parameters
+    ----------
+    headers : numpy.ndarray
+        The headers as a fixed-width bytes array.
+    index : int
+        The index of the field, as for the list of the split header.
+
+    Returns
+    -------
+    numpy.ndarray
+        The field of the headers as a fixed-width bytes array.
+    """
+    if len(headers) == 0:
+        return np.array([], dtype="S1")
+    comma = ord(",")
+    # (frames, header size) bytes, without copy
+    chars = headers[:, np.newaxis].view(np.uint8)
+    boundaries = np.concatenate(
+        [[-1], np.flatnonzero(chars[0] == comma), [chars.shape[1]]]
+    )
+    field_index = range(len(boundaries) - 1)[index]
+    start = boundaries[field_index] + 1
+    stop = boundaries[field_index + 1]
+    field_chars = chars[:, start:stop]
+    same_layout = ~np.any(field_chars == comma, axis=1)
+    for position in (start - 1, stop):
+        if 0 <= position < chars.shape[1]:
+            same_layout &= chars[:, position] == comma
+    field = np.ascontiguousarray(field_chars).view(f"S{stop - start}")[:, 0]
+    if not same_layout.all():
+        _logger.debug("The layout of the headers varies between frames.")
+        field = list(field)
+        for i in np.flatnonzero(~same_layout):
+            field[i] = bytes(headers[i]).split(b",")[index]
+        field = np.array(field)
+    return field
+
+
+def _exposures_to_ms(exposures):
+    # exposure is in "ns", remove unit, convert to float and to ms
+    return np.char.rstrip(exposures, b"ns").astype(float) / 1e6
+
+
+def _timestamps_to_datetime64(timestamps):
+    # The timestamps are in UTC, the "Z" is removed to avoid the
+    # deprecation of timezone aware datetime in numpy
+    return np.char.rstrip(timestamps, b"Z").astype("datetime64[ns]")
+
+
+def parse_headers(headers, max_index=-1):
+    """
+    Parse the frame number, the timestamp and the exposure time from the
+    header of all frames at once.
+
+    The position of the fields is located in the first header and the fields
+    of all headers are sliced at once from the headers, which makes it
+    suitable for files with a large number of frames.
+
+    Parameters
+    ----------
+    %s
+    %s
+
+    Returns
+    -------
+    dict
+        Dictionary with the following arrays:
+
+        - ``"frame_number"`` – the sequence number of each frame (int)
+        - ``"timestamp"`` – the timestamp of each frame (``numpy.datetime64``
+          in ns, UTC)
+        - ``"exposure"`` – the exposure in ms of each frame (float)
+
+    Examples
+    --------
+    >>> from rsciio.quantumdetector import load_mib_data, parse_headers
+    >>> data, headers = load_mib_data(path, return_headers=True)
+    >>> parsed_headers = parse_headers(headers)
+    >>> parsed_headers["timestamp"].shape
+    (65536,)
     """
+    headers = _get_headers_array(headers, max_index)
+    return {
+        "frame_number": _get_header_field(headers, 1).astype(int),
+        "timestamp": _timestamps_to_datetime64(_get_header_field(headers, -4)),
+        "exposure": _exposures_to_ms(_get_header_field(headers, -3)),
+    }
+
+
+parse_headers.__doc__ %= (_HEADERS_DOCSTRING, _MAX_INDEX_DOCSTRING)
 
 
 def parse_exposures(headers, max_index=10000):
@@ -436,17 +796,8 @@ def parse_exposures(headers, max_index=10000):
     >>> len(timestamps)
     65536
     """
-    if isinstance(headers, bytes):
-        headers = [headers]
-
-    if max_index > 1:
-        max_index = min(max_index, len(headers))
-
-    # exposure time are in ns
-    return [
-        _parse_exposure_to_ms(header.decode().split(",")[-3])
-        for header in headers[:max_index]
-    ]
+    headers = _get_headers_array(headers, max_index)
+    return _exposures_to_ms(_get_header_field(headers, -3)).tolist()
 
 
 parse_exposures.__doc__ %= (_HEADERS_DOCSTRING, _MAX_INDEX_DOCSTRING)
@@ -485,13 +836,8 @@ def parse_timestamps(headers, max_index=10000):
     65536
 
     """
-    if isinstance(headers, bytes):
-        headers = [headers]
-
-    if max_index > 1:
-        max_index = min(max_index, len(headers))
-
-    return [header.decode().split(",")[-4] for header in headers[:max_index]]
+    headers = _get_headers_array(headers, max_index)
+    return np.char.decode(_get_header_field(headers, -4)).tolist()
 
 
 parse_timestamps.__doc__ %= (_HEADERS_DOCSTRING, _MAX_INDEX_DOCSTRING)
@@ -507,6 +853,8 @@ def file_reader(
     last_frame=None,
     distributed=False,
     print_info=False,
+    check_frame_numbers=False,
+    fill_value=0,
 ):
     """
     Read a Quantum Detectors ``mib`` file.
@@ -525,13 +873,14 @@ def file_reader(
     %s
     print_info : bool
         Display information about the mib file.
+    %s
 
     %s
 
     Notes
     -----
     In case of interrupted acquisition, only the completed lines are read and
-    the incomplete line are discarded.
+    the incomplete line are discarded, unless ``check_frame_numbers=True``.
 
     When the scanning shape (i. e. navigation shape) is not available from the
     metadata (for example with acquisition using pixel trigger), the timestamps
@@ -575,14 +924,9 @@ def file_reader(
         if frame_per_trigger == 1:
             if headers is None:
                 _, headers = load_mib_data(filename, return_headers=True)
-            # Use parse_timestamps to find the number of frame per line
+            # Use the timestamps to find the number of frame per line
             # we will get a difference of timestamps at the beginning of each line
-            with warnings.catch_warnings():
-                # Filter warning for converting timezone aware datetime
-                # The time zone is dropped
-                # Changed from `DeprecationWarning` to `UserWarning` in numpy 2.0
-                warnings.simplefilter("ignore")
-                times = np.array(parse_timestamps(headers)).astype(dtype="datetime64")
+            times = parse_headers(headers, max_index=10000)["timestamp"]
 
             times_diff = np.diff(times).astype(float)
             if len(times_diff) > 0:
@@ -611,6 +955,8 @@ def file_reader(
         mib_prop=mib_prop,
         print_info=print_info,
         return_mmap=False,
+        check_frame_numbers=check_frame_numbers,
+        fill_value=fill_value,
     )
     data = np.flip(data, axis=-2)
 
@@ -673,5 +1019,6 @@ file_reader.__doc__ %= (
     NAVIGATION_SHAPE,
     _FIRST_LAST_FRAME,
     DISTRIBUTED_DOC,
+    _CHECK_FRAME_NUMBERS,
     RETURNS_DOC,
 )
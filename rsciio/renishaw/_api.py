@@ -71,8 +71,14 @@ from pathlib import Path
 import numpy as np
 from numpy.polynomial.polynomial import polyfit
 
-from rsciio._docstrings import FILENAME_DOC, LAZY_DOC, RETURNS_DOC
+from rsciio._docstrings import (
+    FILENAME_DOC,
+    LAZY_DOC,
+    METADATA_ONLY_DOC,
+    RETURNS_DOC,
+)
 from rsciio.utils import rgb_tools
+from rsciio.utils.tools import get_data_placeholder
 
 _logger = logging.getLogger(__name__)
 
@@ -412,11 +418,19 @@ class WDFReader(object):
         "BKXL",
     ]
 
-    def __init__(self, f, filename, use_uniform_signal_axis, load_unmatched_metadata):
+    def __init__(
+        self,
+        f,
+        filename,
+        use_uniform_signal_axis,
+        load_unmatched_metadata,
+        metadata_only=False,
+    ):
         self._file_obj = f
         self._filename = filename
         self._use_uniform_signal_axis = use_uniform_signal_axis
         self._load_unmatched_metadata = load_unmatched_metadata
+        self._metadata_only = metadata_only
 
         self.original_metadata = {}
         self._unmatched_metadata = {}
@@ -1117,6 +1131,8 @@ class WDFReader(object):
         pos, block_size = self._block_info["DATA_0"]
         size = self._points_per_spectrum * self._num_spectra
         self._check_block_size("DATA", "Data", block_size - 16, 4 * size)
+        if self._metadata_only:
+            return get_data_placeholder((size,), TypeNames["float"])
         self._file_obj.seek(pos)
         return self.__read_numeric("float", size=size)
 
@@ -1136,7 +1152,10 @@ class WDFReader(object):
                 "Axes sizes do not match data size.\n"
                 "Data is averaged over multiple collected spectra."
             )
-            self.data = np.mean(self.data.reshape(self._num_spectra, -1), axis=0)
+            if self._metadata_only:
+                self.data = self.data.reshape(self._num_spectra, -1)[0]
+            else:
+                self.data = np.mean(self.data.reshape(self._num_spectra, -1), axis=0)
 
         axes_sizes.append(signal_size)
         self.data = np.reshape(self.data, axes_sizes)
@@ -1311,6 +1330,7 @@ def file_reader(
     lazy=False,
     use_uniform_signal_axis=False,
     load_unmatched_metadata=False,
+    metadata_only=False,
 ):
     """
     Read Renishaw's ``.wdf`` file. In case of mapping data, the image area will
@@ -1332,6 +1352,7 @@ def file_reader(
         `True`, this metadata will be included and can be accessed by
         ``s.original_metadata.UNMATCHED``,
         otherwise the ``UNMATCHED`` tag will not exist.
+    %s
 
     %s
     """
@@ -1347,6 +1368,7 @@ def file_reader(
             filename=original_filename,
             use_uniform_signal_axis=use_uniform_signal_axis,
             load_unmatched_metadata=load_unmatched_metadata,
+            metadata_only=metadata_only,
         )
         wdf.read_file(filesize)
 
@@ -1364,4 +1386,4 @@ def file_reader(
     return dict_list
 
 
-file_reader.__doc__ %= (FILENAME_DOC, LAZY_DOC, RETURNS_DOC)
+file_reader.__doc__ %= (FILENAME_DOC, LAZY_DOC, METADATA_ONLY_DOC, RETURNS_DOC)
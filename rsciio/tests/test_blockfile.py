@@ -36,7 +36,10 @@ except NameError:
 pytest.importorskip("skimage", reason="scikit-image not installed")
 hs = pytest.importorskip("hyperspy.api", reason="hyperspy not installed")
 
-from rsciio.blockfile._api import get_default_header  # noqa: E402
+from rsciio.blockfile._api import (  # noqa: E402
+    _sample_intensity_range,
+    get_default_header,
+)
 
 TEST_DATA_DIR = Path(__file__).parent / "data" / "blockfile"
 FILE1 = TEST_DATA_DIR / "test1.blo"
@@ -386,6 +389,40 @@ def test_lazy_save(save_path, fake_signal):
     np.testing.assert_allclose(sig_reload.data, compare)
 
 
+@pytest.mark.parametrize("lazy", [True, False])
+def test_sample_lims(save_path, fake_signal, lazy):
+    if lazy:
+        fake_signal = fake_signal.as_lazy()
+    fake_signal.save(save_path, intensity_scaling="sample", overwrite=True)
+    sig_reload = hs.load(save_path)
+    # the sample includes the first and last frames
+    compare = (fake_signal.data / fake_signal.data.max() * 255).astype(np.uint8)
+    np.testing.assert_allclose(sig_reload.data, compare)
+
+
+def test_sample_intensity_range():
+    data = np.arange(1000 * 4).reshape(1000, 2, 2)
+    assert _sample_intensity_range(data, number_of_frames=10) == (0, 3999)
+    minimum, maximum = _sample_intensity_range(data[1:-1], number_of_frames=10)
+    assert (minimum, maximum) == (4, 3995)
+
+
+@pytest.mark.parametrize("max_workers", [None, 1, 4])
+def test_save_chunks_navigator(save_path, max_workers):
+    data = np.arange(6 * 7 * 5 * 5, dtype=np.uint16).reshape(6, 7, 5, 5)
+    signal = hs.signals.Signal2D(data).as_lazy()
+    signal.data = signal.data.rechunk((4, 3, 5, 5))
+    signal.save(
+        save_path, intensity_scaling="minmax", max_workers=max_workers, overwrite=True
+    )
+    sig_reload = hs.load(save_path)
+    compare = (data / data.max() * 255).astype(np.uint8)
+    np.testing.assert_allclose(sig_reload.data, compare)
+    navigator = data.mean(axis=(-2, -1)) / data.max() * 255
+    np.testing.assert_allclose(sig_reload.navigator.data, navigator.astype(np.uint8))
+    assert sig_reload.original_metadata.blockfile_header.NX == 7
+
+
 @pytest.mark.parametrize("navigator", [None, "navigator", "array"])
 def test_vbfs(save_path, fake_signal, navigator):
     fake_signal = fake_signal.as_lazy()
@@ -437,26 +474,60 @@ def test_load_to_memory():
 
 def test_load_readonly():
     s = hs.load(FILE2, lazy=True)
-    k = next(
-        filter(
-            # The or statement with both "array-original" and "original-array"
-            # is due to dask changing the name of this key. After dask-2022.1.1
-            # the key is "original-array", before it is "array-original"
-            lambda x: isinstance(x, str)
-            and (x.startswith("original-array") or x.startswith("array-original")),
-            s.data.dask.keys(),
-        )
-    )
-    mm = s.data.dask[k]
+    mm = s.data.blocks[0, 0, 0, 0].compute()
     assert isinstance(mm, np.memmap)
     assert not mm.flags["WRITEABLE"]
 
 
+def test_load_lazy_copy_on_write():
+    s = hs.load(FILE2, lazy=True, mmap_mode="c")
+    mm = s.data.blocks[0, 0, 0, 0].compute()
+    assert isinstance(mm, np.memmap)
+    assert mm.flags["WRITEABLE"]
+    mm[:] = 0
+    assert hs.load(FILE2).data.any()
+
+
+@pytest.mark.parametrize("chunks", ["auto", (1, 2, -1, -1), {0: 1, 2: 3}])
+def test_load_lazy_chunks(chunks):
+    s = hs.load(FILE2)
+    s_lazy = hs.load(FILE2, lazy=True, chunks=chunks)
+    if chunks == "auto":
+        assert s_lazy.data.chunks == ((2,), (3,), (5,), (5,))
+    elif isinstance(chunks, tuple):
+        assert s_lazy.data.chunks == ((1, 1), (2, 1), (5,), (5,))
+    else:
+        assert s_lazy.data.chunks == ((1, 1), (3,), (3, 2), (5,))
+    np.testing.assert_array_equal(s_lazy.data.compute(), s.data)
+
+
+@pytest.mark.parametrize("lazy", [True, False])
+def test_load_navigator(lazy):
+    s = hs.load(FILE1, lazy=lazy)
+    navigator = s.navigator
+    assert navigator.data.shape == s.data.shape[:2]
+    assert navigator.data.dtype == np.uint8
+    assert navigator.metadata.General.title == "Virtual bright field"
+    assert [axis.scale for axis in navigator.axes_manager.signal_axes] == [
+        axis.scale for axis in s.axes_manager.navigation_axes
+    ]
+
+
 def test_load_inplace():
     with pytest.raises(ValueError):
         hs.load(FILE2, lazy=True, mmap_mode="r+")
 
 
+@pytest.mark.parametrize("lazy", [True, False])
+def test_write_show_progressbar(save_path, capsys, lazy):
+    signal = hs.signals.Signal2D((255 * np.random.rand(3, 4, 5, 5)).astype(np.uint8))
+    if lazy:
+        signal = signal.as_lazy()
+    signal.save(save_path, overwrite=True, show_progressbar=True)
+    # the progress bar is only shown for lazy data
+    assert ("Completed" in capsys.readouterr().out) == lazy
+
+
 def test_write_fresh(save_path):
     signal = hs.signals.Signal2D((255 * np.random.rand(10, 3, 5, 5)).astype(np.uint8))
     signal.save(save_path, overwrite=True)
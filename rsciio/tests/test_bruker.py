@@ -272,6 +272,330 @@ def test_fast_bcf():
             np.testing.assert_array_equal(hmap1, hmap2)
 
 
+@pytest.mark.parametrize("use_numba", [True, False])
+def test_vectorized_bcf(use_numba):
+    if use_numba:
+        pytest.importorskip("numba")
+    from rsciio.bruker import _api, _unbcf_numpy
+
+    fast_unbcf = _api.fast_unbcf
+    numba_enabled = _unbcf_numpy.use_numba
+    _api.fast_unbcf = False
+    _unbcf_numpy.use_numba = use_numba
+    try:
+        for bcffile in test_files:
+            thingy = _api.BCF_reader(TEST_DATA_DIR / bcffile)
+            vrt_file = thingy.get_file(
+                "EDSDatabase/SpectrumData" + str(thingy.def_index)
+            )
+            np.testing.assert_array_equal(
+                _unbcf_numpy.index_lines(vrt_file),
+                _api.py_index_hypermap_lines(vrt_file),
+            )
+            for downsample in [1, 3]:
+                _api.vectorized_unbcf = False
+                hmap1 = thingy.parse_hypermap(downsample=downsample)
+                _api.vectorized_unbcf = True
+                hmap2 = thingy.parse_hypermap(downsample=downsample)
+                np.testing.assert_array_equal(hmap1, hmap2)
+                hmap3 = thingy.parse_hypermap(
+                    downsample=downsample, lazy=True, chunks=2
+                )
+                np.testing.assert_array_equal(hmap3.compute(), hmap1)
+    finally:
+        _api.fast_unbcf = fast_unbcf
+        _api.vectorized_unbcf = True
+        _unbcf_numpy.use_numba = numba_enabled
+
+
+@pytest.mark.parametrize("fast", [True, False])
+@pytest.mark.parametrize("downsample", [1, 3])
+def test_lazy_chunked_bcf(fast, downsample):
+    if fast:
+        pytest.importorskip("rsciio.bruker.unbcf_fast")
+    from rsciio.bruker import _api
+
+    fast_unbcf = _api.fast_unbcf
+    _api.fast_unbcf = fast
+    try:
+        for bcffile in test_files:
+            filename = TEST_DATA_DIR / bcffile
+            thingy = _api.BCF_reader(filename)
+            hmap1 = thingy.parse_hypermap(downsample=downsample)
+            hmap2 = thingy.parse_hypermap(downsample=downsample, lazy=True, chunks=2)
+            assert hmap2.dtype == hmap1.dtype
+            assert hmap2.chunks[0] == (2,) * (hmap1.shape[0] // 2) + (
+                (hmap1.shape[0] % 2,) if hmap1.shape[0] % 2 else ()
+            )
+            assert hmap2.numblocks[1:] == (1, 1)
+            np.testing.assert_array_equal(hmap2.compute(), hmap1)
+    finally:
+        _api.fast_unbcf = fast_unbcf
+
+
+def test_lazy_bcf_scan_on_compute():
+    from rsciio.bruker import _api
+
+    thingy = _api.BCF_reader(TEST_DATA_DIR / test_files[0])
+    hmap = thingy.parse_hypermap(lazy=True, chunks=10)
+    # the lines are not scanned when building the graph
+    assert thingy._line_offsets == {}
+    hmap.blocks[1].compute()
+    assert thingy.def_index in thingy._line_offsets
+
+
+def test_line_offsets_fast_and_python():
+    pytest.importorskip("rsciio.bruker.unbcf_fast")
+    from rsciio.bruker import _api
+
+    for bcffile in test_files:
+        thingy = _api.BCF_reader(TEST_DATA_DIR / bcffile)
+        vrt_file = thingy.get_file("EDSDatabase/SpectrumData" + str(thingy.def_index))
+        offsets1 = _api.unbcf_fast.index_lines(vrt_file)
+        offsets2 = _api.py_index_hypermap_lines(vrt_file)
+        assert offsets1.shape == (thingy.header.image.height + 1,)
+        assert offsets1[0] == 0x1A0
+        np.testing.assert_array_equal(offsets1, offsets2)
+
+
+def test_lazy_chunks_file_reader():
+    filename = TEST_DATA_DIR / test_files[0]
+    s = file_reader(filename, select_type="spectrum_image", lazy=True, chunks=10)
+    assert s[0]["data"].chunks[:2] == ((10, 10, 10), (30,))
+    np_filename = TEST_DATA_DIR / np_files[0]
+    np.testing.assert_array_equal(s[0]["data"][:, :, 222:224], np.load(np_filename))
+
+
+@pytest.mark.parametrize("max_workers", [None, 3])
+def test_parallel_decompression(max_workers):
+    from rsciio.bruker import _api
+
+    # compressed files
+    for bcffile in [test_files[0], test_files[5], test_files[6]]:
+        thingy = _api.BCF_reader(TEST_DATA_DIR / bcffile)
+        vrt_file = thingy.get_file("EDSDatabase/SpectrumData0")
+        data = b"".join(vrt_file.get_iter_and_properties(max_workers=1)[0])
+        data2 = b"".join(vrt_file.get_iter_and_properties(max_workers=max_workers)[0])
+        assert data == data2
+        data3 = vrt_file.get_iter_and_properties(offset=100, max_workers=max_workers)
+        assert b"".join(data3[0]) == data[100:]
+        hmap1 = thingy.parse_hypermap(max_workers=1)
+        hmap2 = thingy.parse_hypermap(max_workers=max_workers)
+        np.testing.assert_array_equal(hmap1, hmap2)
+
+
+def test_parse_hypermap_closes_file(monkeypatch):
+    from rsciio.bruker import _api
+
+    readers = []
+    init = _api.SFS_reader.__init__
+
+    def _init(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        readers.append(self)
+
+    thingy = _api.BCF_reader(TEST_DATA_DIR / test_files[0])
+    monkeypatch.setattr(_api.SFS_reader, "__init__", _init)
+    thingy.parse_hypermap(lazy=False)
+    assert len(readers) == 1
+    assert readers[0]._mmap is None and readers[0]._fh is None
+    thingy.close()
+
+
+def test_read_piece_mmap():
+    import pickle
+
+    from rsciio.bruker import _api
+
+    thingy = _api.BCF_reader(TEST_DATA_DIR / test_files[0])
+    vrt_file = thingy.get_file("EDSDatabase/SpectrumData0")
+    usable_chunk = thingy.usable_chunk
+    data = b"".join(vrt_file._iter_read_chunks())
+    # inside one chunk (no copy), across chunks, ending at the chunk border
+    for offset, length in [
+        (10, 100),
+        (usable_chunk - 10, 100),
+        (10, 3 * usable_chunk),
+        (usable_chunk, usable_chunk),
+    ]:
+        piece = vrt_file.read_piece(offset, length)
+        assert isinstance(piece, memoryview)
+        assert piece == data[offset : offset + length]
+    # the memory map is not pickled, but reopened
+    vrt_file2 = pickle.loads(pickle.dumps(vrt_file))
+    assert vrt_file2.read_piece(10, 100) == data[10:110]
+    thingy.close()
+    assert thingy._mmap is None
+    assert vrt_file.read_piece(10, 100) == data[10:110]
+
+
+@pytest.mark.parametrize("use_numba", [True, False])
+@pytest.mark.parametrize("downsample", [1, 2])
+def test_parse_hypermap_sums(use_numba, downsample):
+    if use_numba:
+        pytest.importorskip("numba")
+    from rsciio.bruker import _api, _unbcf_numpy
+
+    numba_enabled = _unbcf_numpy.use_numba
+    _unbcf_numpy.use_numba = use_numba
+    windows = [(1, 2), (1.5, 7)]
+    try:
+        for bcffile in test_files:
+            thingy = _api.BCF_reader(TEST_DATA_DIR / bcffile)
+            hmap = thingy.parse_hypermap(downsample=downsample, cutoff_at_kV=8)
+            hmap = hmap.astype(np.uint64)
+            sums = thingy.parse_hypermap_sums(
+                downsample=downsample, cutoff_at_kV=8, energy_windows=windows
+            )
+            np.testing.assert_array_equal(sums["counts"], hmap.sum(axis=-1))
+            np.testing.assert_array_equal(sums["spectrum"], hmap.sum(axis=(0, 1)))
+            eds = thingy.header.spectra_data[thingy.def_index]
+            for i, (start, end) in enumerate(windows):
+                channels = slice(
+                    eds.energy_to_channel(start), eds.energy_to_channel(end)
+                )
+                np.testing.assert_array_equal(
+                    sums["windows"][i], hmap[..., channels].sum(axis=-1)
+                )
+    finally:
+        _unbcf_numpy.use_numba = numba_enabled
+    sums = thingy.parse_hypermap_sums(counts=False)
+    assert list(sums.keys()) == ["spectrum"]
+
+
+def test_energy_windows():
+    filename = TEST_DATA_DIR / test_files[0]
+    windows = {"a": (1.0, 2.0), "b": (6.2, 6.6)}
+    s = hs.load(filename, select_type="spectrum_image")
+    s_maps = hs.load(filename, select_type="spectrum_image", energy_windows=windows)
+    assert s_maps.data.shape == (2,) + s.data.shape[:2]
+    assert s_maps.axes_manager.signal_shape == s.axes_manager.navigation_shape
+    assert s_maps.original_metadata.Energy_windows.names == ["a", "b"]
+    for i, window in enumerate(windows.values()):
+        np.testing.assert_array_equal(
+            s_maps.data[i], s.isig[window[0] : window[1]].data.sum(axis=-1)
+        )
+
+
+@pytest.mark.parametrize("processes", [None, 2])
+def test_parse_hypermaps(processes):
+    from rsciio.bruker import _api
+
+    thingy = _api.BCF_reader(TEST_DATA_DIR / test_files[5])
+    hmap = thingy.parse_hypermap(downsample=2)
+    hmaps = thingy.parse_hypermaps(indexes=[0, 0], downsample=2, processes=processes)
+    assert hmaps.shape == (2,) + hmap.shape
+    assert hmaps.dtype == hmap.dtype
+    np.testing.assert_array_equal(hmaps[0], hmap)
+    np.testing.assert_array_equal(hmaps[1], hmap)
+    hmaps = thingy.parse_hypermaps(stack=False, processes=processes)
+    assert isinstance(hmaps, list)
+    assert len(hmaps) == len(thingy.available_indexes)
+    np.testing.assert_array_equal(hmaps[0], thingy.parse_hypermap())
+    # several hypermaps in the bcf
+    thingy.available_indexes = [0, 0]
+    hyperspectra = _api.bcf_hyperspectra(
+        thingy, index="all", downsample=1, processes=processes
+    )
+    assert len(hyperspectra) == 2
+    np.testing.assert_array_equal(hyperspectra[1]["data"], hmaps[0])
+    with pytest.raises(IndexError):
+        thingy.parse_hypermaps(indexes=[0, 1])
+
+
+@pytest.mark.parametrize("processes", [None, 1])
+def test_bcf_hyperspectra_dtype(monkeypatch, processes):
+    import itertools
+
+    from rsciio.bruker import _api
+
+    thingy = _api.BCF_reader(TEST_DATA_DIR / test_files[5])
+    hmap = thingy.parse_hypermap()
+    estimate_map_depth = thingy.header.estimate_map_depth
+    # the second hypermap needs a wider dtype
+    wide = itertools.cycle([False, True])
+
+    def estimate_wide_map_depth(*args, **kwargs):
+        dtype = np.dtype(estimate_map_depth(*args, **kwargs))
+        return np.dtype(f"{dtype.kind}8") if next(wide) else dtype
+
+    monkeypatch.setattr(thingy.header, "estimate_map_depth", estimate_wide_map_depth)
+    thingy.available_indexes = [0, 0]
+    hyperspectra = _api.bcf_hyperspectra(
+        thingy, index="all", downsample=1, processes=processes
+    )
+    if processes is None:
+        # each hypermap keeps its own dtype
+        assert hyperspectra[0]["data"].dtype == hmap.dtype
+    else:
+        # common dtype when decoding in the process pool
+        assert hyperspectra[0]["data"].dtype.itemsize == 8
+    assert hyperspectra[1]["data"].dtype.itemsize == 8
+    for signal in hyperspectra:
+        np.testing.assert_array_equal(signal["data"], hmap)
+
+
+def test_parse_hypermaps_shapes(monkeypatch):
+    import itertools
+
+    from rsciio.bruker import _api
+
+    thingy = _api.BCF_reader(TEST_DATA_DIR / test_files[5])
+    hmap = thingy.parse_hypermap()
+    get_shape = thingy._get_hypermap_shape
+    # the second hypermap has less channels
+    n_channels = itertools.cycle([hmap.shape[2], hmap.shape[2] - 10])
+    monkeypatch.setattr(
+        thingy,
+        "_get_hypermap_shape",
+        lambda *args: get_shape(*args)[:2] + (next(n_channels),),
+    )
+    thingy.available_indexes = [0, 0]
+    hyperspectra = _api.bcf_hyperspectra(thingy, index="all", downsample=1)
+    for signal, size in zip(hyperspectra, (hmap.shape[2], hmap.shape[2] - 10)):
+        assert signal["data"].shape == hmap.shape[:2] + (size,)
+        assert signal["axes"][2]["size"] == size
+        np.testing.assert_array_equal(signal["data"], hmap[..., :size])
+
+    hmaps = thingy.parse_hypermaps()
+    assert hmaps.shape == (2,) + hmap.shape
+    np.testing.assert_array_equal(hmaps[1, ..., :-10], hmap[..., :-10])
+    assert not hmaps[1, ..., -10:].any()
+
+    # hypermaps with different height and width can't be stacked
+    shapes = iter([hmap.shape, (hmap.shape[0] - 1,) + hmap.shape[1:]])
+    monkeypatch.setattr(thingy, "_get_hypermap_shape", lambda *args: next(shapes))
+    with pytest.raises(ValueError, match="can't be stacked"):
+        thingy.parse_hypermaps()
+
+
+def test_index_cache(tmp_path, monkeypatch):
+    from rsciio.bruker import _api
+
+    filename = TEST_DATA_DIR / test_files[0]
+    hmap = file_reader(filename, select_type="spectrum_image", index_cache=tmp_path)[0][
+        "data"
+    ]
+    reader = _api.BCF_reader(filename, index_cache=tmp_path)
+    reader.get_line_offsets()
+    assert len(list(tmp_path.iterdir())) == 1
+
+    def _fail(*args):
+        raise AssertionError("The index cache is not used.")
+
+    monkeypatch.setattr(_api.SFSTreeItem, "_fill_pointer_table", _fail)
+    monkeypatch.setattr(_api.SFSTreeItem, "setup_compression_metadata", _fail)
+    monkeypatch.setattr(_api, "py_index_hypermap_lines", _fail)
+    if _api.fast_unbcf:
+        monkeypatch.setattr(_api.unbcf_fast, "index_lines", _fail)
+
+    reader = _api.BCF_reader(filename, index_cache=tmp_path)
+    vrt_file = reader.get_file("EDSDatabase/SpectrumData0")
+    assert vrt_file._compr_block_table is not None
+    hmap2 = reader.parse_hypermap(lazy=True, chunks=7)
+    np.testing.assert_array_equal(hmap2.compute(), hmap)
+
+
 def test_decimal_regex():
     from rsciio.utils.tools import sanitize_msxml_float
 
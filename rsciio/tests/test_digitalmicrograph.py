@@ -24,6 +24,7 @@ import numpy as np
 import pytest
 
 from rsciio.digitalmicrograph._api import (
+    DeferredTagArray,
     DigitalMicrographReader,
     ImageObject,
     file_reader,
@@ -722,3 +723,60 @@ def test_load_packed_complex():
     file_content = file_reader(fname)
     data_dtype = file_content[0]["data"].dtype
     assert data_dtype == np.complex64
+
+
+@pytest.mark.parametrize("order", ("C", "F"))
+def test_lazy_chunks(order):
+    fname = DM_3D_PATH / "test-1.dm4"
+    data = file_reader(fname, order=order)[0]["data"]
+    lazy_data = file_reader(fname, lazy=True, order=order)[0]["data"]
+    # the signal axes are not chunked
+    assert lazy_data.chunksize[-2:] == lazy_data.shape[-2:]
+    np.testing.assert_array_equal(lazy_data.compute(), data)
+    lazy_data = file_reader(fname, lazy=True, order=order, chunks=(1, 1, 2))[0]["data"]
+    assert lazy_data.chunks == ((1, 1), (1, 1), (2,))
+    np.testing.assert_array_equal(lazy_data.compute(), data)
+
+
+def test_deferred_tag_arrays():
+    fname = DM_3D_PATH / "EELS_SI.dm4"
+    with open(fname, "rb") as f:
+        dm = DigitalMicrographReader(f)
+        dm.parse_file()
+        dm_deferred = DigitalMicrographReader(f, deferred_array_size=2)
+        dm_deferred.parse_file()
+    n_deferred = 0
+
+    def compare(tags, deferred_tags):
+        nonlocal n_deferred
+        for key, value in deferred_tags.items():
+            if isinstance(value, dict):
+                compare(tags[key], value)
+            elif isinstance(value, DeferredTagArray):
+                # read after closing the file
+                n_deferred += 1
+                assert len(value) == len(tags[key])
+                np.testing.assert_array_equal(np.asarray(value), tags[key])
+            else:
+                assert value == tags[key] or value != value  # NaN
+
+    compare(dm.tags_dict, dm_deferred.tags_dict)
+    assert n_deferred > 0
+
+
+@pytest.mark.parametrize(
+    "fname",
+    (
+        DM_1D_PATH / "test-MonoCL_spectrum-ccd.dm4",
+        DM_2D_PATH / "test_fft_packed_complex8.dm4",
+        DM_3D_PATH / "EELS_SI.dm4",
+    ),
+)
+def test_metadata_only(fname):
+    d = file_reader(fname)[0]
+    d_metadata_only = file_reader(fname, metadata_only=True)[0]
+    assert d_metadata_only["data"].shape == d["data"].shape
+    assert d_metadata_only["data"].dtype == d["data"].dtype
+    assert not d_metadata_only["data"].flags.writeable
+    assert d_metadata_only["axes"] == d["axes"]
+    assert d_metadata_only["metadata"] == d["metadata"]
@@ -605,3 +605,25 @@ class TestSpdMap_061_xrf:
 def test_unsupported_extension():
     with pytest.raises(ValueError):
         file_reader("fname.unsupported_extension")
+
+
+@pytest.mark.parametrize(
+    "fname",
+    (
+        "spc0_61-ipr333_xrf.spc",
+        "single_spect.spc",
+        "spd_map.spd",
+        "spc0_61-ipr333_xrf.spd",
+    ),
+)
+def test_metadata_only(fname):
+    fname = os.path.join(TMP_DIR.name, fname)
+    d = file_reader(fname)[0]
+    d_metadata_only = file_reader(fname, metadata_only=True)[0]
+    assert d_metadata_only["data"].shape == d["data"].shape
+    assert d_metadata_only["data"].dtype == d["data"].dtype
+    assert not d_metadata_only["data"].flags.writeable
+    assert d_metadata_only["axes"] == d["axes"]
+    assert d_metadata_only["original_metadata"].keys() == (
+        d["original_metadata"].keys()
+    )
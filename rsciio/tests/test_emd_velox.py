@@ -530,6 +530,39 @@ class TestVeloxEMDv11:
             assert s[i + 4].metadata.General.title == v
 
         assert s[-1].data.shape == (16, 16, 4096)
+        if lazy:
+            assert isinstance(s[-1].data.blocks[0, 0, 0].compute(), np.ndarray)
+
+    @pytest.mark.parametrize("sum_frames", (True, False))
+    @pytest.mark.parametrize("sum_EDS_detectors", (True, False))
+    def test_energy_windows(self, sum_frames, sum_EDS_detectors):
+        fname = self.fei_files_path / "Test SI 16x16 215 kx.emd"
+        kwargs = dict(
+            select_type="spectrum_image",
+            sum_frames=sum_frames,
+            sum_EDS_detectors=sum_EDS_detectors,
+            rebin_energy=4,
+        )
+        windows = {"Cu_Ka": (7.9, 8.2), "window": (0.2, 1.0)}
+        s_maps = hs.load(fname, energy_windows=windows, **kwargs)
+        # reference: the spectrum images of the individual detectors
+        kwargs["sum_EDS_detectors"] = False
+        s = hs.load(fname, **kwargs)
+        if sum_EDS_detectors:
+            s_maps = [s_maps]
+            s = [sum(s[1:], s[0])]
+        assert len(s_maps) == len(s)
+        for s_maps_detector, s_detector in zip(s_maps, s):
+            nav_shape = s_detector.data.shape[:-3]
+            assert s_maps_detector.data.shape == nav_shape + (2, 16, 16)
+            assert s_maps_detector.axes_manager.signal_shape == (16, 16)
+            energy_windows = s_maps_detector.original_metadata.Energy_windows
+            assert energy_windows.names == list(windows)
+            for i, window in enumerate(windows.values()):
+                np.testing.assert_array_equal(
+                    s_maps_detector.data[..., i, :, :],
+                    s_detector.isig[window[0] : window[1]].data.sum(axis=-1),
+                )
 
     def test_prune_data(self, caplog):
         with caplog.at_level(logging.WARNING):
@@ -25,6 +25,8 @@ in order to mimic the usage in the FEI EMD reader.
 
 """
 
+from functools import partial
+
 import numpy as np
 import pytest
 
@@ -33,8 +35,13 @@ pytest.importorskip("sparse")
 
 from rsciio.utils.fei_stream_readers import (  # noqa: E402
     array_to_stream,
+    get_frame_boundaries,
+    get_line_boundaries,
+    iter_pixel_boundaries,
     stream_to_array,
+    stream_to_lazy_array,
     stream_to_sparse_COO_array,
+    stream_to_windowed_maps,
 )
 
 
@@ -90,3 +97,146 @@ def test_sparse_stream(lazy):
             stream, spatial_shape=(3, 4), sum_frames=False, channels=5, last_frame=2
         )
         assert (arrs == arr).all()
+
+
+def _get_pixel_starts(stream, block_size=2**24):
+    # start of the pixels in the stream, from the blocks of pixels
+    offset = 0
+    pixel_starts = []
+    for first_pixel, block, starts, _ in iter_pixel_boundaries(stream, block_size):
+        assert first_pixel == len(pixel_starts)
+        pixel_starts.extend(starts + offset)
+        offset += block.size + 1
+    return np.array(pixel_starts)
+
+
+def test_pixel_frame_boundaries():
+    arr = np.zeros((3, 2, 2, 4), dtype="uint16")
+    arr[1, 0, 1, 2] = 2
+    arr[2, 1, 1, 3] = 1
+    stream = array_to_stream(arr)
+    ((first_pixel, block, starts, ends),) = iter_pixel_boundaries(stream)
+    assert first_pixel == 0
+    assert starts.size == ends.size == 12
+    assert (ends - starts).sum() == 3
+    assert (block[starts[5] : ends[5]] == 2).all()
+    frame_starts = get_frame_boundaries(stream, frame_size=4)
+    assert frame_starts.size == 3
+    np.testing.assert_array_equal(starts[::4], frame_starts)
+    frame_starts = get_frame_boundaries(stream, frame_size=4, last_frame=1)
+    np.testing.assert_array_equal(starts[:5:4], frame_starts)
+
+
+@pytest.mark.parametrize("block_size", (1, 3, 7, 100))
+def test_pixel_boundaries_blocks(block_size):
+    arr = np.random.randint(0, 3, size=(2, 3, 4, 5)).astype("uint16")
+    arr[0, 1] = 4
+    stream = array_to_stream(arr)
+    expected = _get_pixel_starts(stream)
+    assert expected.size == 24
+    pixel_starts = _get_pixel_starts(stream[:, np.newaxis], block_size=block_size)
+    np.testing.assert_array_equal(pixel_starts, expected)
+
+
+@pytest.mark.parametrize("lazy", (True, False))
+@pytest.mark.parametrize("sum_frames", (True, False))
+@pytest.mark.parametrize("first_frame, last_frame", ((2, 3), (0, 2)))
+def test_first_frame(lazy, sum_frames, first_frame, last_frame):
+    arr = np.random.randint(0, 10, size=(4, 3, 4, 5)).astype("uint16")
+    stream = array_to_stream(arr)
+    kwargs = dict(
+        spatial_shape=(3, 4),
+        sum_frames=sum_frames,
+        channels=5,
+        first_frame=first_frame,
+        last_frame=last_frame,
+    )
+    if lazy:
+        arrs = stream_to_sparse_COO_array(stream, **kwargs).compute()
+    else:
+        arrs = stream_to_array(stream, **kwargs)
+    expected = arr[first_frame:last_frame]
+    if sum_frames:
+        expected = expected.sum(axis=0)
+    assert arrs.shape == expected.shape
+    assert (arrs == expected).all()
+
+
+@pytest.mark.parametrize("sum_frames", (True, False))
+@pytest.mark.parametrize("first_frame, last_frame", ((2, 3), (0, 2), (0, 4)))
+def test_windowed_maps_frames(sum_frames, first_frame, last_frame):
+    arr = np.random.randint(0, 10, size=(4, 3, 4, 5)).astype("uint16")
+    stream = array_to_stream(arr)
+    windows = np.array([[0, 2], [3, 5]])
+    maps = stream_to_windowed_maps(
+        stream,
+        spatial_shape=(3, 4),
+        windows=windows,
+        first_frame=first_frame,
+        last_frame=last_frame,
+        sum_frames=sum_frames,
+    )
+    expected = np.stack(
+        [arr[first_frame:last_frame, ..., s:e].sum(axis=-1) for s, e in windows],
+        axis=1,
+    )
+    if sum_frames:
+        expected = expected.sum(axis=0)
+    assert maps.shape == expected.shape
+    np.testing.assert_array_equal(maps, expected)
+
+
+@pytest.mark.parametrize("sum_frames", (True, False))
+def test_stream_to_array_blocks(monkeypatch, sum_frames):
+    import rsciio.utils.fei_stream_readers as stream_readers
+
+    # small blocks to check the decoding of the pixels across blocks
+    monkeypatch.setattr(
+        stream_readers,
+        "iter_pixel_boundaries",
+        partial(stream_readers.iter_pixel_boundaries, block_size=5),
+    )
+    arr = np.random.randint(0, 4, size=(4, 3, 4, 5)).astype("uint16")
+    stream = array_to_stream(arr)
+    kwargs = dict(
+        spatial_shape=(3, 4), sum_frames=sum_frames, first_frame=1, last_frame=3
+    )
+    expected = arr[1:3].sum(axis=0) if sum_frames else arr[1:3]
+    np.testing.assert_array_equal(
+        stream_to_array(stream, channels=5, **kwargs), expected
+    )
+    maps = stream_to_windowed_maps(stream, windows=[[0, 2]], **kwargs)
+    np.testing.assert_array_equal(maps[..., 0, :, :], expected[..., :2].sum(axis=-1))
+
+
+def test_line_boundaries():
+    arr = np.random.randint(0, 3, size=(2, 3, 4, 5)).astype("uint16")
+    stream = array_to_stream(arr)
+    starts = _get_pixel_starts(stream)
+    # small blocks to check the counting of the markers across blocks
+    line_starts = get_line_boundaries(stream[:, np.newaxis], xsize=4, block_size=7)
+    np.testing.assert_array_equal(line_starts, starts[::4])
+
+
+@pytest.mark.parametrize("sum_frames", (True, False))
+@pytest.mark.parametrize("chunks", ("auto", 2))
+def test_lazy_stream(sum_frames, chunks):
+    arr = np.random.randint(0, 10, size=(4, 3, 4, 5)).astype("uint16")
+    stream = array_to_stream(arr)
+    arrs = stream_to_lazy_array(
+        stream,
+        spatial_shape=(3, 4),
+        channels=5,
+        first_frame=1,
+        last_frame=3,
+        sum_frames=sum_frames,
+        chunks=chunks,
+    )
+    expected = arr[1:3].sum(axis=0) if sum_frames else arr[1:3]
+    assert arrs.shape == expected.shape
+    # the blocks are dense, as the blocks of stream_to_sparse_COO_array
+    assert isinstance(arrs._meta, np.ndarray)
+    assert isinstance(arrs.blocks[(0,) * arrs.ndim].compute(), np.ndarray)
+    if chunks == 2:
+        assert arrs.chunks[-3] == (2, 1)
+    assert (arrs.compute() == expected).all()
@@ -399,3 +399,18 @@ class TestShading:
     def test_data(self):
         expected_data = [9385, 8354, 7658]
         np.testing.assert_allclose(self.s.isig[:3, 0].data, expected_data)
+
+
+@pytest.mark.parametrize(
+    "filename", (testfile_operate_mode_path, testfile_shading_path)
+)
+def test_metadata_only(filename):
+    from rsciio.hamamatsu import file_reader
+
+    d = file_reader(filename)[0]
+    d_metadata_only = file_reader(filename, metadata_only=True)[0]
+    assert d_metadata_only["data"].shape == d["data"].shape
+    assert d_metadata_only["data"].dtype == d["data"].dtype
+    assert not d_metadata_only["data"].flags.writeable
+    assert d_metadata_only["metadata"] == d["metadata"]
+    assert d_metadata_only["original_metadata"] == d["original_metadata"]
@@ -915,6 +915,333 @@ def test_compression(compression, tmp_path):
     _ = hs.load(tmp_path / "test_compression.hspy")
 
 
+@pytest.mark.parametrize("compression", (None, "gzip", "lzf"))
+@pytest.mark.parametrize("shuffle", (True, False))
+@pytest.mark.parametrize("parallel_compression", (True, 2))
+@pytest.mark.parametrize("lazy", (True, False))
+def test_parallel_compression(
+    compression, shuffle, parallel_compression, lazy, tmp_path
+):
+    rng = np.random.default_rng(0)
+    data = (rng.random((6, 7, 9, 11)) * 1000).astype(">i2")
+    s = hs.signals.Signal2D(data)
+    if lazy:
+        s = s.as_lazy()
+        s.data = s.data.rechunk((4, 4, 9, 11))
+    kwds = dict(compression=compression, shuffle=shuffle, chunks=(4, 5, 9, 11))
+    s.save(tmp_path / "serial.hspy", **kwds)
+    s.save(
+        tmp_path / "parallel.hspy", parallel_compression=parallel_compression, **kwds
+    )
+    np.testing.assert_array_equal(hs.load(tmp_path / "parallel.hspy").data, data)
+
+    # The chunks written directly are the same as the chunks written by h5py
+    key = "Experiments/__unnamed__/data"
+    with h5py.File(tmp_path / "serial.hspy") as f1:
+        with h5py.File(tmp_path / "parallel.hspy") as f2:
+            assert f1[key].dtype == f2[key].dtype
+            for chunk_slices in f1[key].iter_chunks():
+                offsets = tuple(s.start for s in chunk_slices)
+                chunk = f2[key].id.read_direct_chunk(offsets)
+                assert f1[key].id.read_direct_chunk(offsets) == chunk
+
+
+@zspy_marker
+@pytest.mark.parametrize("lazy", (True, False))
+def test_save_append(tmp_path, file, lazy):
+    filename = tmp_path / file
+    data = np.arange(10 * 3 * 4 * 5, dtype=np.float32).reshape(10, 3, 4, 5)
+    for i, (start, stop) in enumerate([(0, 3), (3, 4), (4, 10)]):
+        s = hs.signals.Signal2D(data[start:stop])
+        if lazy:
+            s = s.as_lazy()
+        s.axes_manager[1].scale = 0.5
+        s.metadata.General.title = "scan"
+        s.metadata.General.set_item("batch", i)
+        s.save(filename, append=True, overwrite=True, chunks=(2, 3, 4, 5))
+
+    s2 = hs.load(filename)
+    np.testing.assert_array_equal(s2.data, data)
+    assert s2.axes_manager[1].size == 10
+    assert s2.axes_manager[1].scale == 0.5
+    # the metadata are not rewritten when appending
+    assert s2.metadata.General.batch == 0
+    s2 = hs.load(filename, lazy=True)
+    assert s2.data.chunks[0] == (2,) * 5
+
+
+@zspy_marker
+def test_save_append_error(tmp_path, file):
+    filename = tmp_path / file
+    s = hs.signals.Signal2D(np.zeros((3, 4, 5)))
+    s.save(filename, append=True)
+    with pytest.raises(ValueError, match="doesn't match the shape"):
+        hs.signals.Signal2D(np.zeros((3, 5, 5))).save(
+            filename, append=True, overwrite=True
+        )
+    with pytest.raises(ValueError, match="doesn't match the dtype"):
+        hs.signals.Signal2D(np.zeros((3, 4, 5), dtype=int)).save(
+            filename, append=True, overwrite=True
+        )
+    with pytest.raises(ValueError, match="navigation axis"):
+        hs.signals.Signal2D(np.zeros((4, 5))).save(
+            filename, append=True, overwrite=True
+        )
+    # signal written without append=True
+    s.save(filename, overwrite=True)
+    if file.endswith(".hspy"):
+        with pytest.raises(ValueError, match="written with `append=True`"):
+            s.save(filename, append=True, overwrite=True)
+    else:
+        s.save(filename, append=True, overwrite=True)
+        assert hs.load(filename).data.shape == (6, 4, 5)
+
+
+@zspy_marker
+@pytest.mark.parametrize("lazy", (True, False))
+@pytest.mark.parametrize(
+    "slices",
+    (
+        (slice(2, 5),),
+        (slice(1, 6, 2), 3),
+        (slice(None), slice(None), slice(3, 9), slice(1, 4)),
+        -1,
+    ),
+)
+def test_read_slices(tmp_path, file, lazy, slices):
+    filename = tmp_path / file
+    data = np.arange(7 * 9 * 11 * 5, dtype=float).reshape(7, 9, 11, 5)
+    s = hs.signals.Signal1D(data)
+    s.axes_manager[0].scale = 0.5
+    s.axes_manager[0].offset = 3
+    s.axes_manager[1].convert_to_non_uniform_axis()
+    s.axes_manager[-1].convert_to_functional_data_axis(expression="x**2")
+    s.save(filename, chunks=(3, 4, 5, 5))
+
+    s2 = hs.load(filename, lazy=lazy, slices=slices)
+    if lazy:
+        s2.compute()
+    np.testing.assert_array_equal(s2.data, data[slices])
+    # Compare with the axes values of the saved signal, in array order
+    if not isinstance(slices, tuple):
+        slices = (slices,)
+    slices = slices + (slice(None),) * (4 - len(slices))
+    expected = [
+        axis.axis[slice_]
+        for axis, slice_ in zip(
+            sorted(s.axes_manager._axes, key=lambda axis: axis.index_in_array),
+            slices,
+        )
+        if not isinstance(slice_, int)
+    ]
+    axes = sorted(s2.axes_manager._axes, key=lambda axis: axis.index_in_array)
+    assert len(axes) == len(expected)
+    for axis, axis_values in zip(axes, expected):
+        np.testing.assert_allclose(axis.axis, axis_values)
+
+
+@zspy_marker
+@pytest.mark.parametrize("slices", ((slice(0, 2),), (1, slice(2, 5))))
+def test_read_slices_metadata_signals(tmp_path, file, slices):
+    filename = tmp_path / file
+    data = np.arange(6 * 7 * 8, dtype=float).reshape(6, 7, 8)
+    s = hs.signals.Signal1D(data)
+    s.metadata.set_item("Signal.Noise_properties.variance", s.deepcopy() * 2)
+    s.navigator = s.sum(-1)
+    s.save(filename)
+
+    s2 = hs.load(filename, slices=slices)
+    variance = s2.metadata.Signal.Noise_properties.variance
+    # the variance is read in the same region as the data
+    assert variance.data.shape == s2.data.shape
+    np.testing.assert_array_equal(variance.data, data[slices] * 2)
+    assert variance.axes_manager.navigation_shape == (s2.axes_manager.navigation_shape)
+    # the navigator is not stored for the region
+    assert "_sig_navigator" not in s2.metadata._HyperSpy
+
+
+@zspy_marker
+@pytest.mark.parametrize("lazy", (True, False))
+def test_read_slices_ragged(tmp_path, file, lazy):
+    filename = tmp_path / file
+    rng = np.random.default_rng(0)
+    data = np.empty((4, 5), dtype=object)
+    for i in np.ndindex(data.shape):
+        data[i] = rng.random((rng.integers(1, 5), 2))
+    s = hs.signals.BaseSignal(data, ragged=True)
+    s.save(filename)
+
+    s2 = hs.load(filename, lazy=lazy, slices=(slice(1, 3), slice(0, 5, 2)))
+    if lazy:
+        s2.compute()
+    assert s2.data.shape == (2, 3)
+    for i in np.ndindex(s2.data.shape):
+        np.testing.assert_array_equal(s2.data[i], data[1:3, 0:5:2][i])
+
+
+def _get_format_version(filename):
+    if filename.suffix == ".hspy":
+        import h5py
+
+        with h5py.File(filename, mode="r") as f:
+            return f.attrs["file_format_version"]
+    else:
+        import zarr
+
+        store = zarr.storage.NestedDirectoryStore(filename)
+        return zarr.open(store, mode="r").attrs["file_format_version"]
+
+
+@zspy_marker
+def test_format_version_packed_ragged(tmp_path, file):
+    filename = tmp_path / file
+    data = np.empty((3,), dtype=object)
+    for i in range(3):
+        data[i] = np.arange(i + 1, dtype=float)
+    s = hs.signals.BaseSignal(data, ragged=True)
+    hs.signals.Signal1D(np.zeros((2, 3))).save(filename)
+    assert _get_format_version(filename) == "3.3"
+    s.save(filename, overwrite=True)
+    assert _get_format_version(filename) == "3.3"
+    # only the packed layout requires the latest version
+    s.save(filename, overwrite=True, pack_ragged=True)
+    assert _get_format_version(filename) == "3.4"
+
+
+def _get_datasets_shape(filename):
+    if filename.suffix == ".hspy":
+        import h5py
+
+        with h5py.File(filename, mode="r") as f:
+            group = f["Experiments/__unnamed__"]
+            return {
+                key: group[key].shape
+                for key in group
+                if key.startswith(("data", "_ragged"))
+            }
+    else:
+        import zarr
+
+        store = zarr.storage.NestedDirectoryStore(filename)
+        group = zarr.open(store, mode="r")["Experiments/__unnamed__"]
+        return {
+            key: group[key].shape
+            for key in group
+            if key.startswith(("data", "_ragged"))
+        }
+
+
+@zspy_marker
+@pytest.mark.parametrize("lazy", (True, False))
+def test_saving_ragged_array_packed(tmp_path, file, lazy):
+    filename = tmp_path / file
+    rng = np.random.default_rng(0)
+    data = np.empty((4, 5), dtype=object)
+    for i in np.ndindex(data.shape):
+        data[i] = rng.random((rng.integers(0, 5), 2))
+    s = hs.signals.BaseSignal(data, ragged=True)
+    s.save(filename, chunks=(2, 2), pack_ragged=True)
+
+    shapes = _get_datasets_shape(filename)
+    assert shapes == {
+        "data": (sum(d.size for d in data.ravel()),),
+        "_ragged_offsets_data": (4, 5),
+        "_ragged_packed_shapes_data": (4, 5, 2),
+    }
+
+    s2 = hs.load(filename, lazy=lazy)
+    assert s2.ragged
+    if lazy:
+        assert s2.data.chunks == ((2, 2), (2, 2, 1))
+        s2.compute()
+    assert s2.data.shape == (4, 5)
+    for i in np.ndindex(data.shape):
+        np.testing.assert_array_equal(s2.data[i], data[i])
+
+
+@pytest.mark.parametrize("element_shape", ((), (3,), (0,), (2, 3), (1, 0, 2)))
+def test_pack_unpack_ragged_data(element_shape):
+    from rsciio._hierarchical import pack_ragged_data, unpack_ragged_data
+
+    data = np.empty((3, 4), dtype=object)
+    for i, j in np.ndindex(data.shape):
+        shape = tuple(n + i + j if n else n for n in element_shape)
+        data[i, j] = np.arange(np.prod(shape, dtype=int), dtype="int16").reshape(shape)
+    values, offsets, shapes = pack_ragged_data(data)
+    assert values.dtype == np.int16
+    assert offsets.shape == (3, 4)
+    assert shapes.shape == (3, 4, len(element_shape))
+
+    data2 = unpack_ragged_data(offsets, shapes, values)
+    # region with gaps between the rows in the buffer
+    region = unpack_ragged_data(offsets[1:, 1:3], shapes[1:, 1:3], values)
+    for i in np.ndindex(data.shape):
+        np.testing.assert_array_equal(data2[i], data[i])
+        assert data2[i].shape == data[i].shape
+    for i in np.ndindex(region.shape):
+        np.testing.assert_array_equal(region[i], data[1:, 1:3][i])
+
+
+def test_pack_ragged_data_unsupported():
+    from rsciio._hierarchical import pack_ragged_data
+
+    data = np.empty((2,), dtype=object)
+    data[0], data[1] = np.arange(2), np.ones((2, 2))
+    assert pack_ragged_data(data) is None
+    data[1] = np.array(["a", "b"])
+    assert pack_ragged_data(data) is None
+    assert pack_ragged_data(np.empty((0,), dtype=object)) is None
+
+
+@zspy_marker
+def test_saving_ragged_array_layout(tmp_path, file):
+    filename = tmp_path / file
+    data = np.empty((3, 2), dtype=object)
+    for i, j in np.ndindex(data.shape):
+        data[i, j] = np.arange(i * 2 + j, dtype=float)
+    s = hs.signals.BaseSignal(data, ragged=True)
+    # the variable length layout is used by default
+    s.save(filename)
+    assert set(_get_datasets_shape(filename)) == {"data", "_ragged_shapes_data"}
+
+    # lazy ragged arrays are written with the variable length layout
+    s.as_lazy().save(filename, overwrite=True, pack_ragged=True)
+    assert set(_get_datasets_shape(filename)) == {"data", "_ragged_shapes_data"}
+    s2 = hs.load(filename)
+    for i in np.ndindex(data.shape):
+        np.testing.assert_array_equal(s2.data[i], data[i])
+
+    # overwriting with the packed layout removes the previous layout
+    s.save(filename, overwrite=True, pack_ragged=True)
+    assert set(_get_datasets_shape(filename)) == {
+        "data",
+        "_ragged_offsets_data",
+        "_ragged_packed_shapes_data",
+    }
+    s2 = hs.load(filename)
+    for i in np.ndindex(data.shape):
+        np.testing.assert_array_equal(s2.data[i], data[i])
+
+    # and overwriting with the default layout removes the packed layout
+    s.save(filename, overwrite=True)
+    assert set(_get_datasets_shape(filename)) == {"data", "_ragged_shapes_data"}
+    s2 = hs.load(filename)
+    for i in np.ndindex(data.shape):
+        np.testing.assert_array_equal(s2.data[i], data[i])
+
+
+@zspy_marker
+def test_read_slices_error(tmp_path, file):
+    filename = tmp_path / file
+    hs.signals.Signal1D(np.zeros((3, 4))).save(filename)
+    with pytest.raises(IndexError):
+        hs.load(filename, slices=(1, 2, 3))
+    with pytest.raises(IndexError):
+        hs.load(filename, slices=5)
+    with pytest.raises(ValueError, match="Negative steps"):
+        hs.load(filename, slices=slice(None, None, -1))
+
+
 def test_strings_from_py2():
     exspy = pytest.importorskip("exspy", reason="exspy not installed")
     s = exspy.data.EDS_TEM_FePt_nanoparticles()
@@ -1129,6 +1456,83 @@ def test_get_signal_chunks_small_dataset():
     assert chunks == shape
 
 
+def _number_of_chunks_read(shape, chunks, axes):
+    return np.prod([-(-shape[i] // chunks[i]) for i in axes])
+
+
+@pytest.mark.parametrize("dtype", (np.uint8, np.float32))
+@pytest.mark.parametrize(
+    "shape, signal_axes", (((64, 128, 100, 100), (2, 3)), ((100, 100, 2048), (2,)))
+)
+def test_get_signal_chunks_access_pattern(shape, signal_axes, dtype):
+    navigation_axes = tuple(i for i in range(len(shape)) if i not in signal_axes)
+    target_size = 1e6
+    read = {}
+    for access_pattern in ("signal", "balanced", "navigation"):
+        chunks = get_signal_chunks(
+            shape,
+            dtype,
+            signal_axes=signal_axes,
+            target_size=target_size,
+            access_pattern=access_pattern,
+        )
+        assert np.prod(chunks) * np.dtype(dtype).itemsize <= target_size
+        assert (np.array(chunks) <= np.array(shape)).all()
+        read[access_pattern] = (
+            _number_of_chunks_read(shape, chunks, signal_axes),
+            _number_of_chunks_read(shape, chunks, navigation_axes),
+        )
+    # Reading a signal
+    assert read["signal"][0] <= read["balanced"][0] <= read["navigation"][0]
+    # Reading a navigation image
+    assert read["signal"][1] >= read["balanced"][1] >= read["navigation"][1]
+    if np.dtype(dtype).itemsize == 1:
+        # a whole signal or navigation image fits in a chunk
+        assert read["signal"][0] == 1
+        assert read["navigation"][1] == 1
+
+
+def test_get_signal_chunks_access_pattern_weight():
+    shape = (100, 100, 2048)
+    kwds = dict(shape=shape, dtype=np.float32, signal_axes=(2,))
+    assert get_signal_chunks(access_pattern=0, **kwds) == get_signal_chunks(
+        access_pattern="signal", **kwds
+    )
+    assert get_signal_chunks(access_pattern=1, **kwds) == get_signal_chunks(
+        access_pattern="navigation", **kwds
+    )
+    with pytest.raises(ValueError, match="must be one of"):
+        get_signal_chunks(access_pattern="random", **kwds)
+    with pytest.raises(ValueError, match="between 0 and 1"):
+        get_signal_chunks(access_pattern=1.5, **kwds)
+
+
+@zspy_marker
+@pytest.mark.parametrize("lazy", (True, False))
+@pytest.mark.parametrize("rechunk_on_save", (True, False))
+def test_save_access_pattern(tmp_path, file, lazy, rechunk_on_save):
+    filename = tmp_path / file
+    s = hs.signals.Signal2D(np.zeros((20, 30, 40, 50), dtype=np.float32))
+    if lazy:
+        s = s.as_lazy()
+        s.data = s.data.rechunk((5, 5, 40, 50))
+    s.save(filename, access_pattern="navigation", rechunk_on_save=rechunk_on_save)
+    s2 = hs.load(filename, lazy=True)
+    if lazy and not rechunk_on_save:
+        expected_chunks = (5, 5, 40, 50)
+    else:
+        target_size = 1e6 if file == "test.hspy" else 1e8
+        expected_chunks = get_signal_chunks(
+            s.data.shape,
+            s.data.dtype,
+            signal_axes=(2, 3),
+            target_size=target_size,
+            access_pattern="navigation",
+        )
+    assert tuple(c[0] for c in s2.data.chunks) == expected_chunks
+    np.testing.assert_array_equal(s2.data.compute(), 0)
+
+
 @zspy_marker
 def test_error_saving(tmp_path, file):
     filename = tmp_path / file
@@ -136,8 +136,10 @@ def test_dir_plugins(plugin):
     elif plugin["name"] == "QuantumDetector":
         assert dir(plugin_module) == [
             "file_reader",
+            "follow_mib_data",
             "load_mib_data",
             "parse_exposures",
+            "parse_headers",
             "parse_timestamps",
         ]
     elif plugin["writes"] is False:
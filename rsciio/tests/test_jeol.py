@@ -275,6 +275,31 @@ def test_load_datacube_frames():
     )
 
 
+@pytest.mark.parametrize("sum_frames", [True, False])
+def test_load_energy_windows(sum_frames):
+    pytest.importorskip("numba")
+    filename = TESTS_FILE_PATH / "Sample" / "00_View000" / TEST_FILES[7]
+    kwargs = dict(
+        sum_frames=sum_frames,
+        rebin_energy=32,
+        downsample=4,
+        frame_list=[0, 2, 3],
+        reader="JEOL",
+    )
+    windows = [(1.0, 2.0), (6.2, 6.6)]
+    s = hs.load(filename, **kwargs)
+    s_maps = hs.load(filename, energy_windows=windows, **kwargs)
+    nav_shape = () if sum_frames else (3,)
+    assert s_maps.data.shape == nav_shape + (2, 128, 128)
+    assert s_maps.axes_manager.signal_shape == (128, 128)
+    assert s_maps.axes_manager["Energy window"].size == 2
+    for i, window in enumerate(windows):
+        np.testing.assert_array_equal(
+            s_maps.data[..., i, :, :],
+            s.isig[window[0] : window[1]].data.sum(axis=-1),
+        )
+
+
 @pytest.mark.parametrize("filename_as_string", [True, False])
 def test_load_eds_file(filename_as_string):
     pytest.importorskip("numba")
@@ -28,9 +28,11 @@ from dask.array.core import normalize_chunks
 
 from rsciio.quantumdetector._api import (
     MIBProperties,
+    follow_mib_data,
     load_mib_data,
     parse_exposures,
     parse_hdr_file,
+    parse_headers,
     parse_timestamps,
 )
 
@@ -339,6 +341,106 @@ def test_parse_timestamps(return_mmap):
     assert len(timestamps) == len(headers)
 
 
+@pytest.mark.parametrize(
+    "fname", ["001_4x2_6bit.mib", "Quad_9_Frame_CounterDepth_24_Rows_256.mib"]
+)
+def test_parse_headers(fname):
+    _, headers = load_mib_data(str(TEST_DATA_DIR_UNZIPPED / fname), return_headers=True)
+    parsed_headers = parse_headers(headers)
+    split_headers = [header.decode().split(",") for header in headers]
+    np.testing.assert_array_equal(
+        parsed_headers["frame_number"], [int(h[1]) for h in split_headers]
+    )
+    np.testing.assert_array_equal(
+        parsed_headers["timestamp"],
+        np.array([h[-4][:-1] for h in split_headers], dtype="datetime64[ns]"),
+    )
+    np.testing.assert_allclose(
+        parsed_headers["exposure"], [float(h[-3][:-2]) / 1e6 for h in split_headers]
+    )
+    assert parsed_headers["timestamp"].shape == (len(headers),)
+    assert len(parse_headers(headers, max_index=2)["exposure"]) == 2
+
+
+def test_parse_headers_different_layout():
+    fname = TEST_DATA_DIR_UNZIPPED / "001_4x2_6bit.mib"
+    _, headers = load_mib_data(str(fname), return_headers=True)
+    headers = np.array(headers)
+    timestamps = parse_timestamps(headers)
+    # exposure with a different number of digits
+    headers[3] = headers[3].replace(b",100000000ns,", b",1500000ns,")
+    parsed_headers = parse_headers(headers)
+    np.testing.assert_allclose(
+        parsed_headers["exposure"], [100] * 3 + [1.5] + [100] * 4
+    )
+    np.testing.assert_array_equal(parsed_headers["frame_number"], np.arange(1, 9))
+    assert parse_timestamps(headers) == timestamps
+
+
+@pytest.mark.parametrize("lazy", (False, True))
+def test_check_frame_numbers(tmp_path, lazy, caplog):
+    fname = TEST_DATA_DIR_UNZIPPED / "001_4x2_6bit.mib"
+    data, headers = load_mib_data(
+        str(fname), navigation_shape=(4, 2), return_headers=True, return_mmap=False
+    )
+    # swap two frames, drop the sixth and duplicate the last one
+    order = [0, 2, 1, 3, 4, 6, 7, 7]
+    fname2 = tmp_path / "dropped_frames.mib"
+    with open(fname, "rb") as f:
+        frames = np.frombuffer(
+            f.read(), dtype=[("header", "S384"), ("frame", "V65536")]
+        )
+    fname2.write_bytes(frames[order].tobytes())
+
+    data2, headers2 = load_mib_data(
+        str(fname2),
+        navigation_shape=(4, 2),
+        lazy=lazy,
+        check_frame_numbers=True,
+        fill_value=7,
+        return_headers=True,
+    )
+    assert "1 missing, 1 duplicated and 1 out-of-order frames" in caplog.text
+    if lazy:
+        assert isinstance(data2, da.Array)
+        data2 = data2.compute()
+    expected = data.copy().reshape((8, 256, 256))
+    expected[5] = 7
+    np.testing.assert_array_equal(data2, expected.reshape(data.shape))
+    assert headers2[5] == b""
+    np.testing.assert_array_equal(np.delete(headers2, 5), np.delete(headers, 5))
+
+    # frames missing at the end are filled too
+    s = hs.load(fname2, navigation_shape=(5, 2), check_frame_numbers=True)
+    assert s.data.shape == (2, 5, 256, 256)
+
+
+def test_follow_mib_data(tmp_path):
+    fname = TEST_DATA_DIR_UNZIPPED / "001_4x2_6bit.mib"
+    data = load_mib_data(str(fname), return_mmap=False)
+    frames = fname.read_bytes()
+    frame_size = len(frames) // 8
+    fname2 = tmp_path / "live.mib"
+    # the first frames and a partially written frame
+    fname2.write_bytes(frames[: int(3.5 * frame_size)])
+
+    follow = follow_mib_data(fname2, poll_interval=0.01, timeout=0.1)
+    np.testing.assert_array_equal(next(follow), data[:3])
+    with open(fname2, "ab") as f:
+        f.write(frames[int(3.5 * frame_size) :])
+    np.testing.assert_array_equal(next(follow), data[3:])
+    # the file doesn't grow anymore
+    with pytest.raises(StopIteration):
+        next(follow)
+
+    batches = list(
+        follow_mib_data(fname, number_of_frames=5, batch_size=2, return_headers=True)
+    )
+    assert len(batches) == 1
+    np.testing.assert_array_equal(batches[0][0], data[:5])
+    assert batches[0][1].shape == (5,)
+
+
 def test_metadata():
     fname = TEST_DATA_DIR_UNZIPPED / "001_4x2_6bit.mib"
 
@@ -1515,3 +1515,20 @@ class TestIntegrationtime:
         np.testing.assert_allclose(
             self.s_21.metadata.Acquisition_instrument.Detector.integration_time, 2
         )
+
+
+@pytest.mark.parametrize(
+    "filename", (testfile_spec, testfile_map, testfile_acc2_exptime1)
+)
+def test_metadata_only(filename):
+    from rsciio.renishaw import file_reader
+
+    d = file_reader(filename)[0]
+    d_metadata_only = file_reader(filename, metadata_only=True)[0]
+    assert d_metadata_only["data"].shape == d["data"].shape
+    assert d_metadata_only["data"].dtype == d["data"].dtype
+    assert not d_metadata_only["data"].flags.writeable
+    for axis, axis_metadata_only in zip(d["axes"], d_metadata_only["axes"]):
+        assert axis_metadata_only.keys() == axis.keys()
+        assert axis_metadata_only["name"] == axis["name"]
+    assert d_metadata_only["metadata"] == d["metadata"]
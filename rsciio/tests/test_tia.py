@@ -21,7 +21,13 @@ from pathlib import Path
 import numpy as np
 import pytest
 
-from rsciio.tia._api import file_reader, load_ser_file
+from rsciio.tia._api import (
+    _get_elements_info,
+    _read_elements,
+    file_reader,
+    load_lazy_data,
+    load_ser_file,
+)
 
 hs = pytest.importorskip("hyperspy.api", reason="hyperspy not installed")
 t = pytest.importorskip("traits.api", reason="traits not installed")
@@ -529,3 +535,57 @@ def test_metadata_diffraction():
 def test_unsupported_extension():
     with pytest.raises(ValueError):
         file_reader("fname.unsupported_extension")
+
+
+@pytest.mark.parametrize(
+    "fname",
+    (
+        TEST_DATA_PATH_OLD / "16x16_STEM_BF_DF_acquire.emi",
+        TEST_DATA_PATH_OLD / "03_Scanning Preview.emi",
+        TEST_DATA_PATH_NEW / "128x128x5-diffraction_preview.emi",
+    ),
+)
+def test_metadata_only(fname):
+    d_list = file_reader(fname)
+    d_metadata_only_list = file_reader(fname, metadata_only=True)
+    assert len(d_metadata_only_list) == len(d_list)
+    for d, d_metadata_only in zip(d_list, d_metadata_only_list):
+        assert d_metadata_only["data"].shape == d["data"].shape
+        assert d_metadata_only["data"].dtype == d["data"].dtype
+        assert not d_metadata_only["data"].flags.writeable
+        assert d_metadata_only["axes"] == d["axes"]
+        assert d_metadata_only["original_metadata"].keys() == (
+            d["original_metadata"].keys()
+        )
+
+
+def test_read_elements_not_evenly_spaced():
+    fname = TEST_DATA_PATH_NEW / "16x16-spectrum_image_5x5x4000-not_square_1.ser"
+    header, data = load_ser_file(fname)
+    with open(fname, "rb") as f:
+        offsets, data_dtype_list, tag_dtype_list = _get_elements_info(f, header)
+    dtype = np.dtype(data_dtype_list + tag_dtype_list)
+    np.testing.assert_array_equal(
+        _read_elements(fname, offsets[::-1], dtype), data[::-1]
+    )
+    np.testing.assert_array_equal(
+        _read_elements(fname, offsets[[0, 2, 3]], dtype, field="Array"),
+        data["Array"][[0, 2, 3]],
+    )
+    # only the bytes of the requested fields are gathered
+    fields = [name for name in dtype.names if name != "Array"]
+    elements = _read_elements(fname, offsets[::-1], dtype, field=fields)
+    assert elements.dtype.names == tuple(fields)
+    assert elements.dtype.itemsize < dtype["Array"].itemsize
+    for name in fields:
+        np.testing.assert_array_equal(elements[name], data[name][::-1])
+
+
+def test_load_lazy_data_chunks():
+    fname = TEST_DATA_PATH_NEW / "16x16-diffraction_imagel_5x5x256x256_EDS_1.ser"
+    d = file_reader(fname)[0]
+    header, _ = load_ser_file(fname, load_array=False)
+    dc = load_lazy_data(fname, d["data"].shape, "spectrum", 3, header, chunks=5)
+    # one chunk per line of 5 elements
+    assert dc.chunks[:2] == ((1,) * 5, (5,))
+    np.testing.assert_array_equal(dc.compute(), d["data"])
@@ -36,6 +36,7 @@ from rsciio.tvips._api import (  # noqa: E402
     TVIPS_RECORDER_FRAME_HEADER,
     TVIPS_RECORDER_GENERAL_HEADER,
     _find_auto_scan_start_stop,
+    _get_frame_index,
     _get_frame_record_dtype_from_signal,
     _get_main_header_from_signal,
     _guess_image_mode,
@@ -395,6 +396,67 @@ def test_tvips_file_reader(filename, lazy, kwargs, wsa):
     assert np.allclose(signal_test.data, signal.data)
 
 
+def test_frame_index_cache(tmp_path, monkeypatch):
+    import os
+    import shutil
+
+    from rsciio.tvips import _api
+
+    filenames = []
+    for i in range(3):
+        fname = f"test_tvips_2345_split_00{i}.tvips"
+        filenames.append(str(shutil.copy(TEST_DATA_PATH / fname, tmp_path / fname)))
+    cache_dir = tmp_path / "cache"
+    d = file_reader(filenames[0], index_cache=cache_dir)[0]
+    assert len(list(cache_dir.iterdir())) == 1
+    record_dtype = np.dtype(
+        TVIPS_RECORDER_FRAME_HEADER + [("data", d["data"].dtype, (4, 5))]
+    )
+    offset = int(d["original_metadata"]["tvips_header"]["size"])
+    frame_starts, frame_headers = _get_frame_index(filenames, record_dtype, offset)
+    assert frame_starts[-1] == frame_headers.shape[0] == d["data"].shape[0]
+    assert len(frame_starts) == 4
+
+    # the index is read from the cache, without reading the files
+    def _fail(*args, **kwargs):
+        raise AssertionError("The index cache is not used.")
+
+    with monkeypatch.context() as m:
+        m.setattr(_api.np, "memmap", _fail)
+        cached = _get_frame_index(
+            filenames, record_dtype, offset, index_cache=cache_dir
+        )
+    np.testing.assert_array_equal(cached[0], frame_starts)
+    np.testing.assert_array_equal(cached[1], frame_headers)
+    d2 = file_reader(filenames[0], index_cache=cache_dir)[0]
+    np.testing.assert_array_equal(d2["data"], d["data"])
+
+    # the cache is not valid anymore when one of the files changes
+    os.utime(filenames[2], ns=(0, 0))
+    with monkeypatch.context() as m:
+        m.setattr(_api.np, "memmap", _fail)
+        with pytest.raises(AssertionError, match="not used"):
+            _get_frame_index(filenames, record_dtype, offset, index_cache=cache_dir)
+
+
+@pytest.mark.parametrize("rechunking", ("auto", False, {0: 2}, {0: 1, 1: 2, 2: 3}))
+def test_read_lazy_chunks_split_files(rechunking):
+    fname = TEST_DATA_PATH / "test_tvips_2345_split_000.tvips"
+    data = file_reader(str(fname), scan_shape=(2, 3), winding_scan_axis="x")[0]["data"]
+    data_lazy = file_reader(
+        str(fname),
+        lazy=True,
+        scan_shape=(2, 3),
+        winding_scan_axis="x",
+        rechunking=rechunking,
+    )[0]["data"]
+    if isinstance(rechunking, dict):
+        assert data_lazy.chunks[0] == (rechunking[0],) * (2 // rechunking[0])
+        if 2 in rechunking:
+            assert data_lazy.chunks[2] == (3, 1)
+    np.testing.assert_array_equal(data_lazy.compute(), data)
+
+
 @pytest.mark.xfail(raises=ValueError)
 def test_read_fail_version():
     hs.load(TEST_DATA_PATH / "test_tvips_2345_split_000.tvips", scan_shape="auto")
@@ -6,7 +6,18 @@ from dateutil import parser, tz
 
 import rsciio.utils.date_time_tools as dtt
 from rsciio.utils.distributed import get_chunk_slice
+from rsciio.utils.index_cache import (
+    get_index_cache_filename,
+    get_user_cache_dir,
+    load_index_cache,
+    save_index_cache,
+)
 from rsciio.utils.tools import ET, DTBox, XmlToDict, dict2sarray, sanitize_msxml_float
+from rsciio.utils.windowed_maps import (
+    energy_windows_to_channels,
+    get_energy_windows,
+    get_fwhm,
+)
 
 dt = [("x", np.uint8), ("y", np.uint16), ("text", (bytes, 6))]
 
@@ -398,3 +409,87 @@ def test_get_chunk_slice(shape):
     assert chunk == (
         tuple([(1,)*i for i in shape[:-2]])+tuple([(i,) for i in shape[-2:]])
     )
+
+
+def test_index_cache(tmp_path):
+    fname = tmp_path / "file.bin"
+    fname.write_bytes(b"0" * 100)
+    cache_fname = get_index_cache_filename(fname, tmp_path, "test")
+    assert cache_fname == tmp_path / "file.bin.test.npz"
+    assert load_index_cache(fname, cache_fname) is None
+
+    offsets = np.arange(10, dtype=np.int64)
+    assert save_index_cache(fname, cache_fname, offsets=offsets)
+    cache = load_index_cache(fname, cache_fname)
+    assert list(cache.keys()) == ["offsets"]
+    np.testing.assert_array_equal(cache["offsets"], offsets)
+
+    # the cache is not valid anymore when the file changes
+    fname.write_bytes(b"0" * 101)
+    assert load_index_cache(fname, cache_fname) is None
+
+
+def test_index_cache_several_files(tmp_path):
+    fnames = [tmp_path / f"file_{i}.bin" for i in range(2)]
+    for fname in fnames:
+        fname.write_bytes(b"0" * 100)
+    cache_fname = get_index_cache_filename(fnames[0], tmp_path, "test")
+    offsets = np.arange(10, dtype=np.int64)
+    assert save_index_cache(fnames, cache_fname, offsets=offsets)
+    np.testing.assert_array_equal(
+        load_index_cache(fnames, cache_fname)["offsets"], offsets
+    )
+    # the cache is not valid anymore when any of the files changes
+    fnames[1].write_bytes(b"0" * 101)
+    assert load_index_cache(fnames, cache_fname) is None
+    assert load_index_cache(fnames[:1], cache_fname) is None
+
+
+def test_index_cache_user_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.setenv("LOCALAPPDATA", str(tmp_path))
+    fname = tmp_path / "file.bin"
+    cache_fname = get_index_cache_filename(fname, True, "test")
+    assert cache_fname.parent == get_user_cache_dir()
+    assert cache_fname.name.startswith("file.bin-")
+    assert cache_fname.name.endswith(".test.npz")
+    # files with the same name in different directories
+    other = get_index_cache_filename(tmp_path / "other" / "file.bin", True, "test")
+    assert other != cache_fname
+
+
+def test_get_energy_windows():
+    names, energies = get_energy_windows([(1.0, 2.0), (6.2, 6.6)])
+    assert names == ["1-2 keV", "6.2-6.6 keV"]
+    np.testing.assert_allclose(energies, [[1.0, 2.0], [6.2, 6.6]])
+    names, energies = get_energy_windows({"a": (1.0, 2.0)})
+    assert names == ["a"]
+    np.testing.assert_allclose(energies, [[1.0, 2.0]])
+    with pytest.raises(ValueError):
+        get_energy_windows([(2.0, 1.0)])
+
+
+def test_get_energy_windows_xray_line():
+    try:
+        import exspy  # noqa: F401
+    except ImportError:
+        with pytest.raises(ImportError, match="exspy"):
+            get_energy_windows(["Fe_Ka"])
+        return
+    names, energies = get_energy_windows(["Fe_Ka"], energy_resolution_MnKa=130.0)
+    assert names == ["Fe_Ka"]
+    fwhm = get_fwhm(6.4039)
+    np.testing.assert_allclose(energies, [[6.4039 - fwhm, 6.4039 + fwhm]], atol=1e-3)
+    with pytest.raises(ValueError):
+        get_energy_windows(["Xx_Ka"])
+
+
+def test_get_fwhm():
+    np.testing.assert_allclose(get_fwhm(5.8987, 130.0), 0.130)
+    assert get_fwhm(10.0) > get_fwhm(1.0)
+
+
+def test_energy_windows_to_channels():
+    channels = energy_windows_to_channels([[0.1, 0.2], [-1.0, 0.05]], -0.1, 0.01)
+    np.testing.assert_array_equal(channels, [[20, 30], [0, 15]])
+    assert channels.dtype == np.int64
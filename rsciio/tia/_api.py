@@ -27,8 +27,8 @@ from glob import glob
 import numpy as np
 from dateutil import parser
 
-from rsciio._docstrings import FILENAME_DOC, LAZY_DOC, RETURNS_DOC
-from rsciio.utils.tools import DTBox, sarray2dict
+from rsciio._docstrings import FILENAME_DOC, LAZY_DOC, METADATA_ONLY_DOC, RETURNS_DOC
+from rsciio.utils.tools import DTBox, get_data_placeholder, sarray2dict
 
 _logger = logging.getLogger(__name__)
 
@@ -242,7 +242,9 @@ def emixml2dtb(et, dictree):
             emixml2dtb(child, dictree[et.tag])
 
 
-def emi_reader(filename, lazy=False, only_valid_data=True, dump_xml=False):
+def emi_reader(
+    filename, lazy=False, only_valid_data=True, dump_xml=False, metadata_only=False
+):
     # TODO: recover the tags from the emi file. It is easy: just look for
     # <ObjectInfo> and </ObjectInfo>. It is standard xml :)
     # xml chunks are identified using UUID, if we can find how these UUID are
@@ -261,7 +263,7 @@ def emi_reader(filename, lazy=False, only_valid_data=True, dump_xml=False):
     for f in ser_files:
         _logger.info("Opening %s", f)
         try:
-            sers.extend(ser_reader(f, objects, lazy, only_valid_data))
+            sers.extend(ser_reader(f, objects, lazy, only_valid_data, metadata_only))
         except IOError:  # Probably a single spectrum that we don't support
             continue
 
@@ -281,7 +283,7 @@ def emi_reader(filename, lazy=False, only_valid_data=True, dump_xml=False):
     return sers
 
 
-def file_reader(filename, lazy=False, only_valid_data=True):
+def file_reader(filename, lazy=False, only_valid_data=True, metadata_only=False):
     """
     Read sets of ``.ser`` and ``.emi`` files from the FEI/ThermoFisher software TIA
     (TEM Imaging & Analysis).
@@ -294,26 +296,38 @@ def file_reader(filename, lazy=False, only_valid_data=True):
         For cases, where acquisition of series or linescan data stopped before
         the end. If `True`, load only the acquired data. If `False`, the empty
         data are filled with zeros.
+    %s
 
     %s
     """
     ext = os.path.splitext(filename)[1][1:]
     if ext.lower() == "ser":
         to_return = ser_reader(
-            filename, objects=None, lazy=lazy, only_valid_data=only_valid_data
+            filename,
+            objects=None,
+            lazy=lazy,
+            only_valid_data=only_valid_data,
+            metadata_only=metadata_only,
         )
     elif ext.lower() == "emi":
-        to_return = emi_reader(filename, lazy, only_valid_data)
+        to_return = emi_reader(
+            filename, lazy, only_valid_data, metadata_only=metadata_only
+        )
     else:
         raise ValueError(f"'{ext}' is not a supported extension for the TIA reader.")
 
     return to_return
 
 
-file_reader.__doc__ %= (FILENAME_DOC, LAZY_DOC, RETURNS_DOC)
+file_reader.__doc__ %= (FILENAME_DOC, LAZY_DOC, METADATA_ONLY_DOC, RETURNS_DOC)
 
 
-def load_ser_file(filename):
+def load_ser_file(filename, load_array=True):
+    """Read the header and the elements of a ser file.
+
+    If ``load_array`` is False, the ``Array`` field of the elements is
+    skipped, only their calibration and tag are read.
+    """
     _logger.info("Opening the file: %s", filename)
     with open(filename, "rb") as f:
         header = np.fromfile(f, dtype=np.dtype(get_header_dtype_list(f)), count=1)
@@ -328,39 +342,128 @@ def load_ser_file(filename):
                 "information."
             )
 
-        # Read the first element of data offsets
-        f.seek(header["OffsetArrayOffset"][0])
-        # OffsetArrayOffset can contain 4 or 8 bytes integer depending if the
-        # data have been acquired using a 32 or 64 bits platform.
-        if header["SeriesVersion"] <= 528:
-            data_offset = readLELong(f)
-            data_offset_array = np.fromfile(
-                f, dtype="<u4", count=header["ValidNumberElements"][0]
-            )
-        else:
-            data_offset = readLELongLong(f)
-            data_offset_array = np.fromfile(
-                f, dtype="<u8", count=header["ValidNumberElements"][0]
-            )
-        data_dtype_list, shape = get_data_dtype_list(
-            f, data_offset, guess_record_by(header["DataTypeID"])
+        offsets, data_dtype_list, tag_dtype_list = _get_elements_info(f, header)
+    if load_array:
+        data = _read_elements(
+            filename, offsets, np.dtype(data_dtype_list + tag_dtype_list)
         )
-        tag_dtype_list = get_data_tag_dtype_list(header["TagTypeID"])
-        f.seek(data_offset)
+    else:
+        # The "Array" field is the last of the data fields, it is skipped
+        # and replaced by an empty array of the same dtype
+        array_dtype = np.dtype([data_dtype_list[-1]])
+        empty_array = ("Array", (array_dtype["Array"].base, (0,)))
         data = np.empty(
-            header["ValidNumberElements"][0],
-            dtype=np.dtype(data_dtype_list + tag_dtype_list),
+            len(offsets),
+            dtype=np.dtype(data_dtype_list[:-1] + [empty_array] + tag_dtype_list),
         )
-        for i, offset in enumerate(data_offset_array):
-            data[i] = np.fromfile(
-                f, dtype=np.dtype(data_dtype_list + tag_dtype_list), count=1
-            )
-            f.seek(offset)
-        _logger.info("Data info:")
-        log_struct_array_values(data[0])
+        fields = [name for name in data.dtype.names if name != "Array"]
+        elements = _read_elements(
+            filename,
+            offsets,
+            np.dtype(data_dtype_list + tag_dtype_list),
+            field=fields,
+            copy=False,
+        )
+        for name in fields:
+            data[name] = elements[name]
+        del elements
+    _logger.info("Data info:")
+    log_struct_array_values(data[0])
     return header, data
 
 
+def _get_elements_info(f, header):
+    """Return the offsets of the valid elements and the lists of dtypes of
+    their data and tag."""
+    f.seek(header["OffsetArrayOffset"][0])
+    # OffsetArrayOffset can contain 4 or 8 bytes integer depending if the
+    # data have been acquired using a 32 or 64 bits platform.
+    offsets = np.fromfile(
+        f,
+        dtype="<u4" if header["SeriesVersion"] <= 528 else "<u8",
+        count=header["ValidNumberElements"][0],
+    ).astype(np.int64)
+    data_dtype_list, _ = get_data_dtype_list(
+        f, offsets[0], guess_record_by(header["DataTypeID"])
+    )
+    tag_dtype_list = get_data_tag_dtype_list(header["TagTypeID"])
+    return offsets, data_dtype_list, tag_dtype_list
+
+
+def _read_elements(filename, offsets, dtype, field=None, copy=True):
+    """Read the elements of a ser file located at the given offsets.
+
+    Evenly spaced elements are memory-mapped as a single strided structured
+    array, otherwise they are gathered from a memory map of the bytes spanning
+    all the elements. When gathering, only the bytes of the requested fields
+    are read.
+
+    Parameters
+    ----------
+    filename : str
+        The name of the ser file.
+    offsets : numpy.ndarray
+        The offsets of the elements in the file.
+    dtype : numpy.dtype
+        The structured dtype of the elements.
+    field : str, list of str or None, default=None
+        If not None, only this field (or these fields) of the elements is
+        returned.
+    copy : bool, default=True
+        If False, the evenly spaced elements are returned as a view of the
+        memory map of the file.
+
+    Returns
+    -------
+    numpy.ndarray
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    start = int(offsets.min())
+    size = int(offsets.max()) - start + dtype.itemsize
+    buffer = np.memmap(filename, dtype="u1", mode="r", offset=start, shape=size)
+    steps = np.diff(offsets)
+    evenly_spaced = len(offsets) == 1 or (
+        np.all(steps == steps[0]) and steps[0] >= dtype.itemsize
+    )
+    if evenly_spaced:
+        step = int(steps[0]) if len(steps) else dtype.itemsize
+        elements = np.ndarray(
+            shape=len(offsets), dtype=dtype, buffer=buffer, strides=(step,)
+        )
+        if field is not None:
+            elements = elements[field]
+        if copy:
+            elements = np.array(elements)
+    elif field is None:
+        elements = _gather_bytes(buffer, offsets - start, dtype.itemsize)
+        elements = elements.view(dtype)[:, 0]
+    elif isinstance(field, str):
+        elements = _gather_field(buffer, offsets - start, dtype, field)
+    else:
+        elements = np.empty(len(offsets), dtype=[(name, dtype[name]) for name in field])
+        for name in field:
+            elements[name] = _gather_field(buffer, offsets - start, dtype, name)
+    return elements
+
+
+def _gather_bytes(buffer, positions, nbytes):
+    """Return the nbytes bytes starting at every position of the buffer, as
+    a (len(positions), nbytes) array."""
+    # one row of bytes for every possible start position
+    windows = np.lib.stride_tricks.as_strided(
+        buffer, shape=(buffer.size - nbytes + 1, nbytes), strides=(1, 1)
+    )
+    return windows[positions]
+
+
+def _gather_field(buffer, positions, dtype, field):
+    """Return the field of the elements of dtype starting at every position
+    of the buffer."""
+    field_dtype, field_offset = dtype.fields[field][:2]
+    values = _gather_bytes(buffer, positions + field_offset, field_dtype.itemsize)
+    return values.view(field_dtype.base).reshape((len(positions),) + field_dtype.shape)
+
+
 def get_xml_info_from_emi(emi_file):
     with open(emi_file, "rb") as f:
         tx = f.read()
@@ -501,12 +604,14 @@ def convert_xml_to_dict(xml_object):
     return op
 
 
-def ser_reader(filename, objects=None, lazy=False, only_valid_data=True):
+def ser_reader(
+    filename, objects=None, lazy=False, only_valid_data=True, metadata_only=False
+):
     """
     Reads the information from the file and returns it in the HyperSpy
     required format.
     """
-    header, data = load_ser_file(filename)
+    header, data = load_ser_file(filename, load_array=not (metadata_only or lazy))
     record_by = guess_record_by(header["DataTypeID"])
     ndim = int(header["NumberDimensions"][0])
     date, time = None, None
@@ -645,14 +750,20 @@ def ser_reader(filename, objects=None, lazy=False, only_valid_data=True):
 
     # Remove Nones from array_shape caused by squeezing size 1 dimensions
     array_shape = [dim for dim in array_shape if dim is not None]
-    if lazy:
-        from dask import delayed
-        from dask.array import from_delayed
-
-        val = delayed(load_only_data, pure=True)(
-            filename, array_shape, record_by, len(axes), only_valid_data=only_valid_data
+    if metadata_only:
+        dc = get_data_placeholder(
+            _get_data_shape(array_shape, header, data, len(axes), only_valid_data),
+            data["Array"].dtype,
+        )
+    elif lazy:
+        dc = load_lazy_data(
+            filename,
+            array_shape,
+            record_by,
+            len(axes),
+            header,
+            only_valid_data=only_valid_data,
         )
-        dc = from_delayed(val, shape=array_shape, dtype=data["Array"].dtype)
     else:
         dc = load_only_data(
             filename,
@@ -704,26 +815,88 @@ def load_only_data(
 ):
     if data is None:
         header, data = load_ser_file(filename)
+    return _reshape_elements(
+        data["Array"], array_shape, record_by, num_axes, header, only_valid_data
+    )
+
+
+def load_lazy_data(
+    filename,
+    array_shape,
+    record_by,
+    num_axes,
+    header,
+    only_valid_data=True,
+    chunks="auto",
+):
+    """Return a dask array of the data, chunked along the elements."""
+    import dask.array as da
+    from dask import delayed
+
+    with open(filename, "rb") as f:
+        offsets, data_dtype_list, tag_dtype_list = _get_elements_info(f, header)
+    dtype = np.dtype(data_dtype_list + tag_dtype_list)
+    array_dtype = dtype["Array"]
+    element_chunks = da.core.normalize_chunks(
+        (chunks,) + (-1,) * array_dtype.ndim,
+        shape=(len(offsets),) + array_dtype.shape,
+        dtype=array_dtype.base,
+    )[0]
+    blocks = []
+    start = 0
+    for size in element_chunks:
+        block = delayed(_read_elements, pure=True)(
+            filename, offsets[start : start + size], dtype, field="Array"
+        )
+        blocks.append(
+            da.from_delayed(
+                block, shape=(size,) + array_dtype.shape, dtype=array_dtype.base
+            )
+        )
+        start += size
+    return _reshape_elements(
+        da.concatenate(blocks),
+        array_shape,
+        record_by,
+        num_axes,
+        header,
+        only_valid_data,
+    )
+
+
+def _reshape_elements(dc, array_shape, record_by, num_axes, header, only_valid_data):
     # If the acquisition stops before finishing the job, the stored file will
     # report the requested size even though no values are recorded. Therefore
     # if the shapes of the retrieved array does not match that of the data
     # dimensions we must fill the rest with zeros or (better) nans if the
     # dtype is float
-    if np.prod(array_shape) != np.prod(data["Array"].shape):
+    array_shape = list(array_shape)
+    if np.prod(array_shape) != np.prod(dc.shape):
         if int(header["NumberDimensions"][0]) == 1 and only_valid_data:
             # No need to fill with zeros if `TotalNumberElements !=
             # ValidNumberElements` for series data.
             # The valid data is always `0:ValidNumberElements`
-            dc = data["Array"][0 : header["ValidNumberElements"][0], ...]
+            dc = dc[0 : header["ValidNumberElements"][0], ...]
             array_shape[0] = header["ValidNumberElements"][0]
         else:
             # Maps will need to be filled with zeros or nans
-            dc = np.zeros(np.prod(array_shape), dtype=data["Array"].dtype)
+            size = int(np.prod(array_shape))
+            fill_value = 0
             if dc.dtype is np.dtype("f") or dc.dtype is np.dtype("f8"):
-                dc[:] = np.nan
-            dc[: data["Array"].ravel().shape[0]] = data["Array"].ravel()
-    else:
-        dc = data["Array"]
+                fill_value = np.nan
+            if isinstance(dc, np.ndarray):
+                dc_filled = np.full(size, fill_value, dtype=dc.dtype)
+                dc_filled[: dc.size] = dc.ravel()
+                dc = dc_filled
+            else:
+                import dask.array as da
+
+                dc = da.concatenate(
+                    [
+                        dc.ravel(),
+                        da.full(size - dc.size, fill_value, dtype=dc.dtype),
+                    ]
+                )
 
     dc = dc.reshape(array_shape)
     if record_by == "image":
@@ -735,6 +908,24 @@ def load_only_data(
     return dc
 
 
+def _get_data_shape(array_shape, header, data, num_axes, only_valid_data=True):
+    # The shape of the data returned by `load_only_data`, without reading them
+    array_shape = list(array_shape)
+    if "ArrayLength" in data.dtype.names:
+        element_size = data["ArrayLength"][0]
+    else:
+        element_size = data["ArraySizeX"][0] * data["ArraySizeY"][0]
+    if (
+        np.prod(array_shape) != header["ValidNumberElements"][0] * element_size
+        and int(header["NumberDimensions"][0]) == 1
+        and only_valid_data
+    ):
+        array_shape[0] = header["ValidNumberElements"][0]
+    if num_axes != len(array_shape):
+        array_shape = [dim for dim in array_shape if dim != 1]
+    return tuple(array_shape)
+
+
 def _guess_units_from_mode(objects_dict, header):
     # in case the xml file doesn't contain the "Mode" or the header doesn't
     # contain 'Dim-1_UnitsLength', return "meters" as default, which will be
@@ -22,7 +22,6 @@ import re
 import warnings
 from datetime import datetime, timezone
 
-import dask
 import dask.array as da
 import numpy as np
 import pint
@@ -36,6 +35,11 @@ from rsciio._docstrings import (
     SHOW_PROGRESSBAR_DOC,
     SIGNAL_DOC,
 )
+from rsciio.utils.index_cache import (
+    get_index_cache_filename,
+    load_index_cache,
+    save_index_cache,
+)
 from rsciio.utils.tools import (
     _UREG,
     DTBox,
@@ -132,7 +136,7 @@ def _get_main_header_from_signal(signal, version=2, frame_header_extra_bytes=0):
         offsety = round((offsety * _UREG(unit)).to(to_unit).magnitude)
     else:
         warnings.warn(
-            "Image scale units could not be converted, " "saving axes scales as is.",
+            "Image scale units could not be converted, saving axes scales as is.",
             UserWarning,
         )
     metadata = DTBox(signal["metadata"], box_dots=True)
@@ -219,6 +223,148 @@ def _guess_scan_index_grid(rotidx, start, stop):
     return indxs + start
 
 
+def _get_frame_index(filenames, record_dtype, offset, index_cache=False):
+    """
+    Get the index of the frames of the tvips files.
+
+    If ``index_cache`` is not ``False``, the index is saved in a persistent
+    cache and only computed again when one of the files is modified, see
+    :py:mod:`rsciio.utils.index_cache`.
+
+    Parameters
+    ----------
+    filenames : list of str
+        The tvips files, in order.
+    record_dtype : numpy.dtype
+        The dtype of the frame records.
+    offset : int
+        The offset of the first frame in the first file.
+    index_cache : bool, str or pathlib.Path
+        Whether to use the persistent index cache, and where: ``True`` for
+        the user cache directory or the path of the cache directory.
+
+    Returns
+    -------
+    frame_starts : numpy.ndarray
+        The index of the first frame of each file, with the total number of
+        frames as last element. The offset of a frame in its file follows
+        from the size of the records.
+    frame_headers : numpy.ndarray
+        The frame headers of all frames, including the rotator index.
+    """
+    if index_cache:
+        cache_filename = get_index_cache_filename(filenames[0], index_cache, "tvips")
+        cache = load_index_cache(filenames, cache_filename)
+        if cache is not None:
+            return cache["frame_starts"], cache["frame_headers"]
+
+    frame_header_dtype = np.dtype(TVIPS_RECORDER_FRAME_HEADER)
+    frame_numbers = []
+    all_frame_headers = []
+    for i, fn in enumerate(filenames):
+        # no offset on the other files
+        records = np.memmap(
+            fn, mode="r", dtype=record_dtype, offset=offset if i == 0 else 0
+        )
+        # copy the frame header fields only, without the data of the records
+        frame_headers = np.empty(records.shape, dtype=frame_header_dtype)
+        for name in frame_header_dtype.names:
+            frame_headers[name] = records[name]
+        all_frame_headers.append(frame_headers)
+        frame_numbers.append(records.shape[0])
+        del records
+    frame_starts = np.concatenate([[0], np.cumsum(frame_numbers)]).astype(np.int64)
+    frame_headers = np.concatenate(all_frame_headers)
+
+    if index_cache:
+        save_index_cache(
+            filenames,
+            cache_filename,
+            frame_starts=frame_starts,
+            frame_headers=frame_headers,
+        )
+    return frame_starts, frame_headers
+
+
+def _read_frames(indices, filenames, record_dtype, offset, frame_starts):
+    """
+    Read the frames at the given indices from the tvips files.
+
+    Parameters
+    ----------
+    indices : numpy.ndarray
+        The index of the frames in the stack of all frames of the files.
+    filenames, record_dtype, offset :
+        See :py:func:`_get_frame_index`.
+    frame_starts : numpy.ndarray
+        The index of the first frame of each file as returned by
+        :py:func:`_get_frame_index`.
+
+    Returns
+    -------
+    numpy.ndarray
+        The frames with shape ``indices.shape + (dimy, dimx)``.
+    """
+    flat_indices = np.asarray(indices).ravel()
+    file_indices = np.searchsorted(frame_starts, flat_indices, side="right") - 1
+    data_dtype = record_dtype["data"]
+    data = np.empty(flat_indices.shape + data_dtype.shape, dtype=data_dtype.base)
+    for i in np.unique(file_indices):
+        in_file = file_indices == i
+        records = np.memmap(
+            filenames[i],
+            mode="r",
+            dtype=record_dtype,
+            offset=offset if i == 0 else 0,
+            shape=frame_starts[i + 1] - frame_starts[i],
+        )
+        data[in_file] = records["data"][flat_indices[in_file] - frame_starts[i]]
+        del records
+    return data.reshape(np.shape(indices) + data_dtype.shape)
+
+
+def _get_chunks(rechunking, navigation_dimension):
+    if rechunking == "auto" or not rechunking:
+        # the navigation axes are optimally chunked and the signal axes are
+        # not chunked
+        return ("auto",) * navigation_dimension + (-1, -1)
+    return rechunking
+
+
+def _frames_to_array(
+    indices, filenames, record_dtype, offset, frame_starts, lazy, chunks
+):
+    """
+    Get the array of the frames at the given indices, for lazy loading, each
+    chunk of the array reads its own frames from the files.
+    """
+    kwargs = dict(
+        filenames=filenames,
+        record_dtype=record_dtype,
+        offset=offset,
+        frame_starts=frame_starts,
+    )
+    if not lazy:
+        return _read_frames(indices, **kwargs)
+    data_dtype = record_dtype["data"]
+    chunks = da.core.normalize_chunks(
+        chunks, shape=indices.shape + data_dtype.shape, dtype=data_dtype.base
+    )
+    # the frames are always read entirely
+    frame_chunks = tuple((size,) for size in data_dtype.shape)
+    data = da.map_blocks(
+        _read_frames,
+        da.from_array(indices, chunks=chunks[: indices.ndim]),
+        new_axis=(indices.ndim, indices.ndim + 1),
+        chunks=chunks[: indices.ndim] + frame_chunks,
+        dtype=data_dtype.base,
+        **kwargs,
+    )
+    if chunks[indices.ndim :] != frame_chunks:
+        data = data.rechunk(chunks)
+    return data
+
+
 def file_reader(
     filename,
     lazy=False,
@@ -227,6 +373,7 @@ def file_reader(
     winding_scan_axis=None,
     hysteresis=0,
     rechunking="auto",
+    index_cache=False,
 ):
     """
     Read TVIPS stream file for in-situ and 4D STEM data.
@@ -263,11 +410,21 @@ def file_reader(
         points to align even and odd scan rows. Default is 0, no hysteresis.
     rechunking : bool, str, dict, Default="auto"
         Only relevant when using lazy loading. If set to False each tvips file is
-        a single chunk. For a better experience, with the default setting of
-        ``"auto"`` rechunking is performed such that the navigation axes
-        are optimally chunked and the signal axes are not chunked.
-        If set to anything else, e.g. a dictionary, the value will be passed to
-        the chunks argument in dask.array.rechunk.
+        a single chunk when loading an image stack. For a better experience, with
+        the default setting of ``"auto"`` the navigation axes are optimally
+        chunked and the signal axes are not chunked.
+        If set to anything else, e.g. a dictionary, the value will be used as
+        ``chunks`` argument of :py:func:`dask.array.core.normalize_chunks`;
+        the axes not specified in a dictionary are not chunked. Every chunk
+        reads its frames directly from the tvips files.
+    index_cache : bool or str, default=False
+        Whether to save the index of the frames (the file containing each
+        frame and the frame headers, including the rotator index) to a
+        persistent cache, so that later opening of the same files skips
+        reading all frame headers again. If ``True``, the cache is saved in
+        the user cache directory, if a string, in the given directory (e.g.
+        the directory of the files). The cache is ignored as soon as the size
+        or the modification time of one of the files changes.
 
     %s
     """
@@ -291,7 +448,7 @@ def file_reader(
         f.seek(0)
         # read the main header in file 0
         header = np.fromfile(f, dtype=TVIPS_RECORDER_GENERAL_HEADER, count=1)
-        dtype = np.dtype(f"u{header['bitsperpixel'][0]//8}")
+        dtype = np.dtype(f"u{header['bitsperpixel'][0] // 8}")
         dimx = header["dimx"][0]
         dimy = header["dimy"][0]
         # the size of the frame header varies with version
@@ -320,29 +477,21 @@ def file_reader(
             record_dtype.append(("extra", bytes, extra_bytes))
         record_dtype.append(("data", dtype, (dimy, dimx)))
 
-    # memmap the data
-    records_000 = np.memmap(
-        filename, mode="r", dtype=record_dtype, offset=header["size"][0]
+    filenames = [filename] + other_files
+    record_dtype = np.dtype(record_dtype)
+    offset = int(header["size"][0])
+    frame_starts, frame_headers = _get_frame_index(
+        filenames, record_dtype, offset, index_cache=index_cache
+    )
+    frames_kwargs = dict(
+        filenames=filenames,
+        record_dtype=record_dtype,
+        offset=offset,
+        frame_starts=frame_starts,
+        lazy=lazy,
     )
-    # the array data
-    all_array_data = [records_000["data"]]
-    # in case we also want the frame header metadata later
-    metadata_keys = np.array(TVIPS_RECORDER_FRAME_HEADER)[:, 0]
-    metadata_000 = records_000[metadata_keys]
-    all_metadata = [metadata_000]
-    # also load data from other files
-    for i in other_files:
-        # no offset on the other files
-        records = np.memmap(i, mode="r", dtype=record_dtype)
-        all_metadata.append(records[metadata_keys])
-        all_array_data.append(records["data"])
-    if lazy:
-        data_stack = da.concatenate(all_array_data, axis=0)
-    else:
-        data_stack = np.concatenate(all_array_data, axis=0)
-
     # extracting some units/scales/offsets of the DP's or images
-    mode = all_metadata[0]["mode"][0]
+    mode = frame_headers["mode"][0]
     DPU = "1/nm" if mode == 2 else "nm"
     SDP = header["pixelsize"][0]
     offsetx = header["offsetx"][0]
@@ -352,7 +501,7 @@ def file_reader(
     if scan_shape is not None:
         # try to deduce start and stop of the scan based on rotator index
         if scan_shape == "auto":
-            record_idxs = np.concatenate([i["rotidx"] for i in all_metadata])
+            record_idxs = frame_headers["rotidx"]
             scan_start_frame, scan_stop_frame = _find_auto_scan_start_stop(record_idxs)
             if scan_start_frame is None or scan_stop_frame is None:
                 raise ValueError(
@@ -373,12 +522,12 @@ def file_reader(
         # scan shape and start are provided
         else:
             total_scan_frames = np.prod(scan_shape)
-            max_frame_index = np.prod(data_stack.shape[:-2])
+            max_frame_index = frame_starts[-1]
             final_frame = scan_start_frame + total_scan_frames
             if final_frame > max_frame_index:
                 raise ValueError(
-                    f"Shape {scan_shape} requires image index {final_frame-1} "
-                    f"which is out of bounds. Final frame index: {max_frame_index-1}."
+                    f"Shape {scan_shape} requires image index {final_frame - 1} "
+                    f"which is out of bounds. Final frame index: {max_frame_index - 1}."
                 )
             indices = np.arange(scan_start_frame, final_frame).reshape(scan_shape)
 
@@ -398,9 +547,11 @@ def file_reader(
             else:
                 raise ValueError("Invalid winding scan axis")
 
-        with dask.config.set(**{"array.slicing.split_large_chunks": True}):
-            data_stack = data_stack[indices.ravel()]
-        data_stack = data_stack.reshape(*indices.shape, dimy, dimx)
+        data_stack = _frames_to_array(
+            indices,
+            chunks=_get_chunks(rechunking, indices.ndim),
+            **frames_kwargs,
+        )
         units = (indices.ndim - 2) * [""] + ["nm", "nm", DPU, DPU]
         names = (indices.ndim - 2) * [""] + ["y", "x", "dy", "dx"]
         # no scale information stored in the scan!
@@ -422,9 +573,17 @@ def file_reader(
         ]
     else:
         # we load as a regular image stack
+        if lazy and rechunking is False:
+            # each tvips file is a single chunk
+            stack_chunks = (tuple(np.diff(frame_starts)), -1, -1)
+        else:
+            stack_chunks = _get_chunks(rechunking, 1)
+        data_stack = _frames_to_array(
+            np.arange(frame_starts[-1]), chunks=stack_chunks, **frames_kwargs
+        )
         units = ["s", DPU, DPU]
         names = ["time", "dy", "dx"]
-        times = np.concatenate([i["timestamp"] + i["ms"] / 1000 for i in all_metadata])
+        times = frame_headers["timestamp"] + frame_headers["ms"] / 1000
         timescale = 1 if times.shape[0] <= 0 else times[1] - times[0]
         scales = [timescale, SDP, SDP]
         offsets = [times[0], offsety, offsetx]
@@ -442,17 +601,17 @@ def file_reader(
             }
             for i in range(dim)
         ]
-    dtobj = datetime.fromtimestamp(all_metadata[0]["timestamp"][0])
+    dtobj = datetime.fromtimestamp(frame_headers["timestamp"][0])
     date = dtobj.date().isoformat()
     time = dtobj.time().isoformat()
-    current = all_metadata[0]["fcurrent"][0]
-    stagex = all_metadata[0]["stagex"][0]
-    stagey = all_metadata[0]["stagey"][0]
-    stagez = all_metadata[0]["stagez"][0]
-    stagealpha = all_metadata[0]["stagea"][0]
-    stagebeta = all_metadata[0]["stageb"][0]
-    # mag = all_metadata[0]["mag"][0]  # TODO it is unclear what this value is
-    focus = all_metadata[0]["objective"][0]
+    current = frame_headers["fcurrent"][0]
+    stagex = frame_headers["stagex"][0]
+    stagey = frame_headers["stagey"][0]
+    stagez = frame_headers["stagez"][0]
+    stagealpha = frame_headers["stagea"][0]
+    stagebeta = frame_headers["stageb"][0]
+    # mag = frame_headers["mag"][0]  # TODO it is unclear what this value is
+    focus = frame_headers["objective"][0]
     metadata = {
         "General": {
             "original_filename": os.path.split(filename)[1],
@@ -477,17 +636,6 @@ def file_reader(
         },
     }
 
-    if lazy:
-        if rechunking:
-            if rechunking == "auto":
-                navdims = data_stack.ndim - 2
-                chunks = {ax_index: "auto" for ax_index in range(navdims)}
-                chunks[navdims] = None
-                chunks[navdims + 1] = None
-            else:
-                chunks = rechunking
-            data_stack = data_stack.rechunk(chunks)
-
     if mode == 2:
         metadata["Signal"] = {"signal_type": "diffraction"}
     # TODO at the moment hyperspy doesn't have a signal type for mode==1, imaging
@@ -104,7 +104,8 @@ def slice_memmap(slices, file, dtypes, shape, key=None, **kwargs):
     numpy.ndarray
         Array of the data from the memory mapped file sliced using the provided slice.
     """
-    slices_ = np.squeeze(slices)[()]
+    # one (start, stop) pair per dimension, also for 1D data
+    slices_ = np.reshape(slices, (-1, 2))
     data = np.memmap(file, dtypes, shape=shape, **kwargs)
     if key is not None:
         data = data[key]
@@ -121,6 +122,7 @@ def memmap_distributed(
     chunks="auto",
     block_size_limit=None,
     key=None,
+    mode="r",
 ):
     """
     Drop in replacement for py:func:`numpy.memmap` allowing for distributed
@@ -149,6 +151,9 @@ def memmap_distributed(
         Maximum size of a block in bytes. The default is None.
     key : None, str
         For structured dtype only. Specify the key of the structured dtype to use.
+    mode : str, optional
+        The file is opened in this mode, see :class:`numpy.memmap` for more
+        details. The default is "r".
 
     Returns
     -------
@@ -185,7 +190,9 @@ def memmap_distributed(
         block_size_limit=block_size_limit,
         dtype=array_dtype,
     )
-    num_dim = len(shape)
+    # the slices have one row per dimension of the data, including the
+    # dimensions of the sub-array of a structured dtype
+    num_dim = len(data_chunks)
     data = da.map_blocks(
         slice_memmap,
         chunked_slices,
@@ -193,7 +200,7 @@ def memmap_distributed(
         dtype=array_dtype,
         shape=shape,
         order=order,
-        mode="r",
+        mode=mode,
         dtypes=dtype,
         offset=offset,
         chunks=data_chunks,
@@ -119,3 +119,39 @@ atomic_number2name = {
     118: "Uuo",
     119: "Uue",
 }
+
+
+def get_xray_line_energy(xray_line):
+    """
+    Return the energy of a X-ray line from the elements database of exspy
+    (or of hyperspy < 2.0), which needs to be installed.
+
+    Parameters
+    ----------
+    xray_line : str
+        The X-ray line, e.g. ``"Fe_Ka"``.
+
+    Returns
+    -------
+    float
+        The energy of the line in keV.
+    """
+    try:
+        from exspy.misc.elements import elements_db
+    except ImportError:
+        try:
+            from hyperspy.misc.elements import elements_db
+        except ImportError:
+            raise ImportError(
+                f"The energy of the '{xray_line}' X-ray line can't be found, "
+                "because it requires the `exspy` package. Install `exspy` or "
+                "define the energy window with its (start, end) energies."
+            )
+    element, _, line = xray_line.partition("_")
+    try:
+        energy = elements_db[element]["Atomic_properties"]["Xray_lines"][line][
+            "energy (keV)"
+        ]
+    except (KeyError, AttributeError):
+        raise ValueError(f"'{xray_line}' is not a known X-ray line.")
+    return float(energy)
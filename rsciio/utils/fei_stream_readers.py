@@ -16,12 +16,18 @@
 # You should have received a copy of the GNU General Public License
 # along with RosettaSciIO. If not, see <https://www.gnu.org/licenses/#GPL>.
 
+import dask
 import dask.array as da
 import numpy as np
 import sparse
 
 from rsciio.utils.tools import jit_ifnumba
 
+try:
+    from numba import prange
+except ImportError:  # pragma: no cover
+    prange = range
+
 
 class DenseSliceCOO(sparse.COO):
     """Just like sparse.COO, but returning a dense array on indexing/slicing"""
@@ -35,6 +41,152 @@ class DenseSliceCOO(sparse.COO):
             return obj
 
 
+def _read_stream(stream, start, end):
+    # Read a range of a stream, which can be a numpy array or a
+    # (size, 1) h5py dataset as in Velox files
+    return np.asarray(stream[start:end]).reshape(-1)
+
+
+def iter_pixel_boundaries(stream, block_size=2**24):
+    """Iterates over the spectra of the pixels in a FEI stream by blocks
+
+    The spectrum of each pixel is terminated by a 65535 marker. The stream is
+    read by blocks ending at a marker and the markers of each block are
+    located at once with numpy, so that the pixels of a block can be decoded
+    independently without locating the pixels of the whole stream.
+
+    Parameters
+    ----------
+    stream: numpy array or h5py dataset
+    block_size: int
+        The number of values of the stream read at once. A block is extended
+        when it doesn't contain a marker.
+
+    Yields
+    ------
+    first_pixel: int
+        The index of the first pixel of the block in the stream.
+    block: numpy array
+        The values of the stream in the block, without the marker
+        terminating the block.
+    starts, ends: numpy arrays
+        The (included) start and (excluded) end indices in the block of the
+        spectrum of each pixel, the markers being excluded.
+
+    """
+    size = stream.shape[0]
+    start = 0
+    first_pixel = 0
+    while True:
+        end = min(start + block_size, size)
+        block = _read_stream(stream, start, end)
+        markers = np.flatnonzero(block == 65535)
+        if end < size:
+            if markers.size == 0:
+                # a pixel spans the whole block
+                block_size *= 2
+                continue
+            # the last pixel of the block continues in the next block
+            block = block[: markers[-1]]
+            starts = np.zeros(markers.size, dtype=np.int64)
+            starts[1:] = markers[:-1] + 1
+            ends = markers.astype(np.int64)
+        else:
+            starts = np.zeros(markers.size + 1, dtype=np.int64)
+            starts[1:] = markers + 1
+            ends = np.append(markers, block.size).astype(np.int64)
+        yield first_pixel, block, starts, ends
+        if end == size:
+            break
+        first_pixel += starts.size
+        start += block.size + 1
+
+
+def _get_marker_boundaries(stream, period, block_size=2**24, count=None):
+    # Returns the index following every period-th marker, starting with 0,
+    # reading the stream by blocks. Stops once count boundaries are found.
+    size = stream.shape[0]
+    boundaries = [np.zeros(1, dtype=np.int64)]
+    n_boundaries = 1
+    n_markers = 0
+    for start in range(0, size, block_size):
+        if count is not None and n_boundaries > count:
+            break
+        block = _read_stream(stream, start, start + block_size)
+        markers = np.flatnonzero(block == 65535) + start
+        # keep the markers terminating a period, counting the markers of the
+        # previous blocks
+        boundaries.append(markers[(period - 1 - n_markers) % period :: period] + 1)
+        n_boundaries += boundaries[-1].size
+        n_markers += markers.size
+    boundaries = np.concatenate(boundaries).astype(np.int64)
+    # a marker terminating the stream doesn't start a new period
+    boundaries = boundaries[boundaries < size]
+    return boundaries if count is None else boundaries[:count]
+
+
+def get_frame_boundaries(stream, frame_size, last_frame=None, block_size=2**24):
+    """Returns the indices of the start of the frames in a FEI stream
+
+    The stream is read by blocks, so that only the start of the frames are
+    kept in memory.
+
+    Parameters
+    ----------
+    stream: numpy array or h5py dataset
+    frame_size: int
+        The number of pixels of a frame.
+    last_frame: int or None
+        If not None, the stream is read until the start of this frame only.
+    block_size: int
+        The number of values of the stream read at once.
+
+    Returns
+    -------
+    frame_starts: numpy array
+        The index in the stream of the first value of each frame, up to
+        ``last_frame`` (included) if given.
+
+    """
+    count = None if last_frame is None else last_frame + 1
+    return _get_marker_boundaries(stream, frame_size, block_size, count=count)
+
+
+def get_stream_range(frame_starts, first_frame, last_frame, size):
+    """Returns the range of a FEI stream containing the given frames
+
+    Parameters
+    ----------
+    frame_starts: numpy array
+        The index in the stream of the first value of each frame, as returned
+        by :py:func:`get_frame_boundaries` or as stored in the
+        ``FrameLocationTable`` of Velox files.
+    first_frame, last_frame: int
+        The first (included) and last (excluded) frames.
+    size: int
+        The size of the stream.
+
+    Returns
+    -------
+    start, end: int
+
+    """
+    n_frames = len(frame_starts)
+    start = int(frame_starts[first_frame]) if first_frame < n_frames else size
+    end = int(frame_starts[last_frame]) if last_frame < n_frames else size
+    return start, end
+
+
+def _slice_stream(stream, frame_size, first_frame, last_frame):
+    # Slice the stream to the frames to read, so that the frames before
+    # first_frame and from last_frame are not decoded
+    frame_starts = get_frame_boundaries(stream, frame_size, last_frame=last_frame)
+    start, end = get_stream_range(
+        frame_starts, first_frame, last_frame, stream.shape[0]
+    )
+    return stream[start:end], last_frame - first_frame
+
+
 @jit_ifnumba(cache=True)
 def _stream_to_sparse_COO_array_sum_frames(
     stream_data, last_frame, shape, channels, rebin_energy=1, first_frame=0
@@ -238,6 +390,11 @@ def stream_to_sparse_COO_array(
         If True, sum all the frames
 
     """
+    frame_size = spatial_shape[0] * spatial_shape[1]
+    stream_data, last_frame = _slice_stream(
+        stream_data, frame_size, first_frame, last_frame
+    )
+    first_frame = 0
     if sum_frames:
         coords, data, shape = _stream_to_sparse_COO_array_sum_frames(
             stream_data=stream_data,
@@ -261,60 +418,30 @@ def stream_to_sparse_COO_array(
     return dask_sparse
 
 
-@jit_ifnumba(cache=True)
-def _fill_array_with_stream_sum_frames(
-    spectrum_image, stream, first_frame, last_frame, rebin_energy=1
+@jit_ifnumba(cache=True, parallel=True)
+def _fill_array_with_pixels(
+    spectrum_image, stream, starts, ends, first_pixel=0, rebin_energy=1, sum_frames=True
 ):  # pragma: no cover
-    # jit speeds up this function by a factor of ~ 30
-    navigation_index = 0
-    frame_number = 0
-    shape = spectrum_image.shape
-    for count_channel in np.nditer(stream):
-        # when we reach the end of the frame, reset the navigation index to 0
-        if navigation_index == (shape[0] * shape[1]):
-            navigation_index = 0
-            frame_number += 1
-            # break the for loop when we reach the last frame we want to read
-            if frame_number == last_frame:
-                break
-        # if different of ‘65535’, add a count to the corresponding channel
-        if count_channel != 65535:
-            if first_frame <= frame_number:
-                spectrum_image[
-                    navigation_index // shape[1],
-                    navigation_index % shape[1],
-                    count_channel // rebin_energy,
-                ] += 1
-        else:
-            navigation_index += 1
-
-
-@jit_ifnumba(cache=True)
-def _fill_array_with_stream(
-    spectrum_image, stream, first_frame, last_frame, rebin_energy=1
-):  # pragma: no cover
-    navigation_index = 0
-    frame_number = 0
-    shape = spectrum_image.shape
-    for count_channel in np.nditer(stream):
-        # when we reach the end of the frame, reset the navigation index to 0
-        if navigation_index == (shape[1] * shape[2]):
-            navigation_index = 0
-            frame_number += 1
-            # break the for loop when we reach the last frame we want to read
-            if frame_number == last_frame:
-                break
-        # if different of ‘65535’, add a count to the corresponding channel
-        if count_channel != 65535:
-            if first_frame <= frame_number:
-                spectrum_image[
-                    frame_number - first_frame,
-                    navigation_index // shape[2],
-                    navigation_index % shape[2],
-                    count_channel // rebin_energy,
-                ] += 1
-        else:
-            navigation_index += 1
+    # spectrum_image has (frames, y, x, channels) shape, with a single
+    # frame when summing the frames. The pixels of the block start at the
+    # first_pixel pixel of the stream.
+    # The pixels of a block are decoded in parallel: each thread writes its
+    # own pixel (of all frames), which avoids any race condition.
+    frames, ysize, xsize, channels = spectrum_image.shape
+    frame_size = ysize * xsize
+    n_pixels = starts.size
+    if not sum_frames:
+        n_pixels = max(min(n_pixels, frames * frame_size - first_pixel), 0)
+    for k in prange(min(n_pixels, frame_size)):
+        navigation_index = (first_pixel + k) % frame_size
+        y = navigation_index // xsize
+        x = navigation_index % xsize
+        for pixel in range(k, n_pixels, frame_size):
+            frame = 0 if sum_frames else (first_pixel + pixel) // frame_size
+            for i in range(starts[pixel], ends[pixel]):
+                channel = stream[i] // rebin_energy
+                if channel < channels:
+                    spectrum_image[frame, y, x, channel] += 1
 
 
 def stream_to_array(
@@ -330,6 +457,11 @@ def stream_to_array(
 ):
     """Returns data stored in a FEI stream as a nd COO array
 
+    The stream is decoded by blocks of pixels: the boundaries of the pixels
+    of a block are found in a vectorised pre-pass and the pixels are decoded
+    in parallel (if numba is installed). Only the values of the frames to
+    read are decoded.
+
     Parameters
     ----------
     stream: numpy array
@@ -349,41 +481,242 @@ def stream_to_array(
         stream.
 
     """
-
-    frames = last_frame - first_frame
+    frame_size = spatial_shape[0] * spatial_shape[1]
+    stream, frames = _slice_stream(stream, frame_size, first_frame, last_frame)
+    shape = (spatial_shape[0], spatial_shape[1], int(channels / rebin_energy))
     if not sum_frames:
-        if spectrum_image is None:
-            spectrum_image = np.zeros(
-                (
-                    frames,
-                    spatial_shape[0],
-                    spatial_shape[1],
-                    int(channels / rebin_energy),
-                ),
-                dtype=dtype,
-            )
+        shape = (frames,) + shape
+    if spectrum_image is None:
+        spectrum_image = np.zeros(shape, dtype=dtype)
+    for first_pixel, block, starts, ends in iter_pixel_boundaries(stream):
+        _fill_array_with_pixels(
+            spectrum_image=spectrum_image.reshape((-1,) + shape[-3:]),
+            stream=block,
+            starts=starts,
+            ends=ends,
+            first_pixel=first_pixel,
+            rebin_energy=rebin_energy,
+            sum_frames=sum_frames,
+        )
+    return spectrum_image
+
+
+def get_line_boundaries(stream, xsize, block_size=2**24):
+    """Returns the indices of the start of the lines of pixels in a FEI stream
+
+    The stream is read by blocks, so that it doesn't need to be loaded in
+    memory, and only the start of the lines are kept.
+
+    Parameters
+    ----------
+    stream: numpy array or h5py dataset
+    xsize: int
+        The number of pixels of a line.
+    block_size: int
+        The number of values of the stream read at once.
+
+    Returns
+    -------
+    line_starts: numpy array
+        The index in the stream of the first value of each line of all
+        frames.
+
+    """
+    return _get_marker_boundaries(stream, xsize, block_size)
+
 
-            _fill_array_with_stream(
-                spectrum_image=spectrum_image,
-                stream=stream,
-                first_frame=first_frame,
-                last_frame=last_frame,
+def _lines_to_array(
+    stream,
+    line_starts,
+    ysize,
+    frames,
+    first_row,
+    shape,
+    channels,
+    rebin_energy=1,
+    sum_frames=True,
+    dtype="uint16",
+):
+    # Decode the lines [first_row, first_row + n_rows) of the given frames,
+    # reading only the corresponding ranges of the stream.
+    # shape is the shape of the block: (rows, x, channels) or
+    # (frames, rows, x, channels) when not summing the frames.
+    n_rows, xsize = shape[-3:-1]
+    size = stream.shape[0]
+    spectrum_image = np.zeros(shape, dtype=dtype)
+    for i, frame in enumerate(frames):
+        first_line = frame * ysize + first_row
+        start, end = get_stream_range(
+            line_starts, first_line, first_line + n_rows, size
+        )
+        stream_to_array(
+            _read_stream(stream, start, end),
+            spatial_shape=(n_rows, xsize),
+            channels=channels,
+            last_frame=1,
+            rebin_energy=rebin_energy,
+            sum_frames=True,
+            spectrum_image=spectrum_image if sum_frames else spectrum_image[i],
+        )
+    return spectrum_image
+
+
+def stream_to_lazy_array(
+    stream,
+    spatial_shape,
+    channels,
+    last_frame,
+    first_frame=0,
+    rebin_energy=1,
+    sum_frames=True,
+    dtype="uint16",
+    chunks="auto",
+    line_starts=None,
+):
+    """Returns data stored in a FEI stream as a dask array
+
+    The start of the lines of pixels are indexed once and every block of the
+    dask array decodes only the range of the stream containing its lines,
+    so that the stream is never loaded in memory as a whole. The blocks are
+    dense numpy arrays, like the blocks of
+    :py:func:`stream_to_sparse_COO_array`, which are dense slices of a
+    sparse array of the whole stream.
+
+    Parameters
+    ----------
+    stream: numpy array or h5py dataset
+    spatial_shape: tuple of ints
+        (ysize, xsize)
+    channels: ints
+        Number of channels in the spectrum
+    last_frame, first_frame: int
+        The last (excluded) and first (included) frames to read.
+    rebin_energy: int
+        Rebin the spectra. The default is 1 (no rebinning applied)
+    sum_frames: bool
+        If True, sum all the frames
+    dtype: numpy dtype
+        dtype of the array
+    chunks: int or str
+        Chunking of the y axis, the x and energy axes are never chunked and
+        the frames are in separate chunks when not summing the frames.
+        Default is "auto".
+    line_starts: numpy array or None
+        The start of the lines as returned by
+        :py:func:`get_line_boundaries`. If None, the stream is indexed.
+
+    """
+    ysize, xsize = spatial_shape
+    if line_starts is None:
+        line_starts = get_line_boundaries(stream, xsize)
+    shape = (ysize, xsize, int(channels / rebin_energy))
+    frames = range(first_frame, last_frame)
+    row_chunks = da.core.normalize_chunks((chunks, -1, -1), shape=shape, dtype=dtype)[0]
+    frame_blocks = []
+    for block_frames in [frames] if sum_frames else [[f] for f in frames]:
+        blocks = []
+        first_row = 0
+        for n_rows in row_chunks:
+            block_shape = (n_rows,) + shape[1:]
+            if not sum_frames:
+                block_shape = (1,) + block_shape
+            value = dask.delayed(_lines_to_array)(
+                stream,
+                line_starts,
+                ysize,
+                block_frames,
+                first_row,
+                block_shape,
+                channels,
                 rebin_energy=rebin_energy,
-            )
-    else:
-        if spectrum_image is None:
-            spectrum_image = np.zeros(
-                (spatial_shape[0], spatial_shape[1], int(channels / rebin_energy)),
+                sum_frames=sum_frames,
                 dtype=dtype,
             )
-        _fill_array_with_stream_sum_frames(
-            spectrum_image=spectrum_image,
-            stream=stream,
-            first_frame=first_frame,
-            last_frame=last_frame,
+            blocks.append(da.from_delayed(value, shape=block_shape, dtype=dtype))
+            first_row += n_rows
+        frame_blocks.append(da.concatenate(blocks, axis=-3))
+    if sum_frames:
+        return frame_blocks[0]
+    return da.concatenate(frame_blocks, axis=0)
+
+
+@jit_ifnumba(cache=True, parallel=True)
+def _fill_windows_with_pixels(
+    maps, stream, starts, ends, windows, first_pixel=0, rebin_energy=1, sum_frames=True
+):  # pragma: no cover
+    # maps has (frames, windows, y, x) shape, see _fill_array_with_pixels
+    frames, _, ysize, xsize = maps.shape
+    frame_size = ysize * xsize
+    n_pixels = starts.size
+    if not sum_frames:
+        n_pixels = max(min(n_pixels, frames * frame_size - first_pixel), 0)
+    for k in prange(min(n_pixels, frame_size)):
+        navigation_index = (first_pixel + k) % frame_size
+        y = navigation_index // xsize
+        x = navigation_index % xsize
+        for pixel in range(k, n_pixels, frame_size):
+            frame = 0 if sum_frames else (first_pixel + pixel) // frame_size
+            for i in range(starts[pixel], ends[pixel]):
+                channel = stream[i] // rebin_energy
+                for w in range(windows.shape[0]):
+                    if windows[w, 0] <= channel and channel < windows[w, 1]:
+                        maps[frame, w, y, x] += 1
+
+
+def stream_to_windowed_maps(
+    stream,
+    spatial_shape,
+    windows,
+    last_frame,
+    first_frame=0,
+    rebin_energy=1,
+    sum_frames=True,
+    maps=None,
+):
+    """Returns the counts of a FEI stream in energy windows as maps
+
+    Parameters
+    ----------
+    stream: numpy array
+    spatial_shape: tuple of ints
+        (ysize, xsize)
+    windows: numpy array
+        (first, end) channels of the windows after rebinning, with
+        (windows, 2) shape.
+    rebin_energy: int
+        Rebin the spectra. The default is 1 (no rebinning applied)
+    sum_frames: bool
+        If True, sum all the frames
+    maps: numpy array or None
+        If not None, the counts of the stream are added to the maps provided.
+
+    Returns
+    -------
+    maps: numpy array
+        The (windows, y, x) maps, or (frames, windows, y, x) maps if
+        sum_frames is False.
+
+    """
+    windows = np.asarray(windows, dtype=np.int64).reshape(-1, 2)
+    frame_size = spatial_shape[0] * spatial_shape[1]
+    stream, frames = _slice_stream(stream, frame_size, first_frame, last_frame)
+    shape = (len(windows), spatial_shape[0], spatial_shape[1])
+    if not sum_frames:
+        shape = (frames,) + shape
+    if maps is None:
+        maps = np.zeros(shape, dtype=np.uint32)
+    for first_pixel, block, starts, ends in iter_pixel_boundaries(stream):
+        _fill_windows_with_pixels(
+            maps=maps.reshape((-1,) + shape[-3:]),
+            stream=block,
+            starts=starts,
+            ends=ends,
+            windows=windows,
+            first_pixel=first_pixel,
             rebin_energy=rebin_energy,
+            sum_frames=sum_frames,
         )
-    return spectrum_image
+    return maps
 
 
 @jit_ifnumba(cache=True)
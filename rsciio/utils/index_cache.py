@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+# Copyright 2007-2024 The HyperSpy developers
+#
+# This file is part of RosettaSciIO.
+#
+# RosettaSciIO is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RosettaSciIO is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with RosettaSciIO. If not, see <https://www.gnu.org/licenses/#GPL>.
+
+"""
+Persistent cache of the (binary) index of a file, such as offsets of the
+datasets or of the frames, which are expensive to find. The cache is saved as
+a ``.npz`` file and is only valid as long as the size and the modification
+time of the indexed file (or files) are unchanged.
+"""
+
+import hashlib
+import logging
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+_logger = logging.getLogger(__name__)
+
+# Increase when the layout of the cached index changes
+INDEX_CACHE_VERSION = 1
+
+
+def get_user_cache_dir():
+    """
+    Return the directory used to cache file indexes for the current user.
+
+    Returns
+    -------
+    pathlib.Path
+    """
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local")
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+    return Path(base) / "rosettasciio" / "index"
+
+
+def get_index_cache_filename(filename, index_cache, tag):
+    """
+    Return the path of the index cache of a file.
+
+    Parameters
+    ----------
+    filename : str or pathlib.Path
+        The indexed file.
+    index_cache : bool, str or pathlib.Path
+        If ``True``, the cache is located in the user cache directory (see
+        :py:func:`get_user_cache_dir`), otherwise in the given directory.
+    tag : str
+        Name of the index, typically the name of the reader.
+
+    Returns
+    -------
+    pathlib.Path
+    """
+    filename = Path(filename).resolve()
+    if index_cache is True:
+        # files with the same name can be located in different directories
+        path_hash = hashlib.sha1(str(filename).encode("utf-8")).hexdigest()[:16]
+        return get_user_cache_dir() / f"{filename.name}-{path_hash}.{tag}.npz"
+    else:
+        return Path(index_cache) / f"{filename.name}.{tag}.npz"
+
+
+def _get_file_signature(filename):
+    # the index of a series of files is valid as long as none of the files
+    # has changed
+    filenames = filename if isinstance(filename, (list, tuple)) else [filename]
+    signature = []
+    for fn in filenames:
+        stat = os.stat(fn)
+        signature.extend([stat.st_size, stat.st_mtime_ns])
+    return np.array(signature + [INDEX_CACHE_VERSION])
+
+
+def load_index_cache(filename, cache_filename):
+    """
+    Load the index cache of a file.
+
+    Parameters
+    ----------
+    filename : str, pathlib.Path or list
+        The indexed file or the list of indexed files, when the index spans
+        several files.
+    cache_filename : str or pathlib.Path
+        The index cache, as returned by :py:func:`get_index_cache_filename`.
+
+    Returns
+    -------
+    dict or None
+        Dictionary of the cached arrays or ``None`` if the cache doesn't exist
+        or doesn't match the indexed files (size or modification time).
+    """
+    cache_filename = Path(cache_filename)
+    if not cache_filename.is_file():
+        return None
+    try:
+        with np.load(cache_filename, allow_pickle=False) as npz:
+            cache = {key: npz[key] for key in npz.files}
+    except Exception as e:
+        _logger.warning(f"Failed to read the index cache '{cache_filename}': {e}")
+        return None
+    signature = cache.pop("_file_signature", None)
+    if signature is None or not np.array_equal(
+        signature, _get_file_signature(filename)
+    ):
+        _logger.info(f"The index cache '{cache_filename}' is outdated.")
+        return None
+    _logger.debug(f"Using index cache '{cache_filename}'.")
+    return cache
+
+
+def save_index_cache(filename, cache_filename, **arrays):
+    """
+    Save the index cache of a file. The cache is written to a temporary file
+    and then renamed, so that a partially written cache is never read.
+
+    Parameters
+    ----------
+    filename : str, pathlib.Path or list
+        The indexed file or the list of indexed files, see
+        :py:func:`load_index_cache`.
+    cache_filename : str or pathlib.Path
+        The index cache, as returned by :py:func:`get_index_cache_filename`.
+    **arrays : numpy.ndarray
+        The arrays to cache.
+
+    Returns
+    -------
+    bool
+        Whether the cache has been saved or not.
+    """
+    cache_filename = Path(cache_filename)
+    try:
+        cache_filename.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_filename = tempfile.mkstemp(
+            suffix=".npz", prefix=".tmp", dir=cache_filename.parent
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, _file_signature=_get_file_signature(filename), **arrays)
+            os.replace(tmp_filename, cache_filename)
+        except BaseException:
+            os.remove(tmp_filename)
+            raise
+    except OSError as e:
+        _logger.warning(f"Failed to write the index cache '{cache_filename}': {e}")
+        return False
+    return True
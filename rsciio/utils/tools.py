@@ -527,6 +527,26 @@ def get_file_handle(data, warn=True):
     return None
 
 
+def get_data_placeholder(shape, dtype):
+    """Return a placeholder of the data, used when reading only the metadata.
+
+    The placeholder is a read-only array of zeros, which has the shape and
+    dtype of the data but doesn't allocate their memory.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        The shape of the data.
+    dtype : numpy.dtype
+        The dtype of the data.
+
+    Returns
+    -------
+    numpy.ndarray
+    """
+    return np.broadcast_to(np.zeros((), dtype=dtype), shape)
+
+
 def jit_ifnumba(*decorator_args, **decorator_kwargs):
     try:
         import numba
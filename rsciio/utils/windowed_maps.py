@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+# Copyright 2007-2024 The HyperSpy developers
+#
+# This file is part of RosettaSciIO.
+#
+# RosettaSciIO is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RosettaSciIO is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with RosettaSciIO. If not, see <https://www.gnu.org/licenses/#GPL>.
+
+"""
+Energy-window maps of EDS event streams: the counts of the events are binned
+directly in (windows, y, x) maps while the stream is decoded, without
+allocating the (y, x, energy) spectrum image.
+"""
+
+import copy
+
+import numpy as np
+
+from rsciio.utils.elements import get_xray_line_energy
+from rsciio.utils.tools import jit_ifnumba
+
+# Energy of the Mn Ka line in keV, reference of the energy resolution
+MN_KA_ENERGY = 5.8987
+
+
+def get_fwhm(energy, energy_resolution_MnKa=130.0):
+    """
+    Return the FWHM of a peak of an EDS detector, calculated from the
+    resolution of the detector at the Mn Ka line (Fano factor and electronic
+    noise).
+
+    Parameters
+    ----------
+    energy : float or numpy.ndarray
+        The energy of the peak in keV.
+    energy_resolution_MnKa : float, default=130.0
+        The FWHM of the Mn Ka peak in eV.
+
+    Returns
+    -------
+    float or numpy.ndarray
+        The FWHM in keV.
+    """
+    return (
+        np.sqrt(2.5 * (energy - MN_KA_ENERGY) * 1000 + energy_resolution_MnKa**2) / 1000
+    )
+
+
+def get_energy_windows(energy_windows, energy_resolution_MnKa=130.0, width=2.0):
+    """
+    Return the names and the (start, end) energies of energy windows.
+
+    Parameters
+    ----------
+    energy_windows : list or dict
+        List of X-ray lines (e.g. ``"Fe_Ka"``) or of ``(start, end)``
+        energies in keV, or dictionary of ``(start, end)`` energies in keV
+        with the names of the windows as keys.
+    energy_resolution_MnKa : float, default=130.0
+        The FWHM of the Mn Ka peak in eV, used to calculate the width of the
+        windows of X-ray lines.
+    width : float, default=2.0
+        The width of the windows of X-ray lines in units of FWHM of the line.
+
+    Returns
+    -------
+    names : list of str
+        The names of the windows.
+    energies : numpy.ndarray
+        The (start, end) energies of the windows in keV, with (windows, 2)
+        shape.
+    """
+    if isinstance(energy_windows, dict):
+        energy_windows = list(energy_windows.items())
+    else:
+        if isinstance(energy_windows, str):
+            # a single X-ray line
+            energy_windows = [energy_windows]
+        energy_windows = [(None, window) for window in energy_windows]
+    names = []
+    energies = np.zeros((len(energy_windows), 2))
+    for i, (name, window) in enumerate(energy_windows):
+        if isinstance(window, str):
+            energy = get_xray_line_energy(window)
+            half_width = width * get_fwhm(energy, energy_resolution_MnKa) / 2
+            window, name = (energy - half_width, energy + half_width), window
+        start, end = window
+        if start >= end:
+            raise ValueError(
+                f"The start of the energy window {window} must be lower than "
+                "its end."
+            )
+        energies[i] = start, end
+        names.append(name if name is not None else f"{start:g}-{end:g} keV")
+    return names, energies
+
+
+def energy_windows_to_channels(energies, offset, scale):
+    """
+    Convert the energies of windows to the channels of the spectrum.
+
+    Parameters
+    ----------
+    energies : numpy.ndarray
+        The (start, end) energies of the windows in keV, as returned by
+        :py:func:`get_energy_windows`.
+    offset, scale : float
+        The offset and the scale of the energy axis in keV.
+
+    Returns
+    -------
+    numpy.ndarray
+        The (first, end) channels of the windows with (windows, 2) shape,
+        the end channel being excluded.
+    """
+    channels = np.round((np.asarray(energies, dtype=float) - offset) / scale)
+    return np.clip(channels, 0, None).astype(np.int64).reshape(-1, 2)
+
+
+@jit_ifnumba(cache=True)
+def add_to_windows(maps, y, x, channel, windows, value):  # pragma: no cover
+    """Add the counts of an event to the (windows, y, x) maps."""
+    for w in range(windows.shape[0]):
+        if windows[w, 0] <= channel and channel < windows[w, 1]:
+            maps[w, y, x] += value
+
+
+def windowed_maps_dictionary(
+    maps,
+    names,
+    energies,
+    axes,
+    metadata,
+    original_metadata,
+    navigation_axes=None,
+):
+    """
+    Return the signal dictionary of energy-window maps.
+
+    Parameters
+    ----------
+    maps : numpy.ndarray
+        The maps with (windows, y, x) shape, optionally preceded by the
+        navigation axes.
+    names : list of str
+        The names of the windows.
+    energies : numpy.ndarray
+        The (start, end) energies of the windows in keV.
+    axes : list of dict
+        The dictionaries of the y and x axes of the maps.
+    metadata, original_metadata : dict
+        The metadata of the spectrum image, which are copied.
+    navigation_axes : None or list of dict
+        The dictionaries of the axes preceding the windows axis.
+
+    Returns
+    -------
+    dict
+    """
+    navigation_axes = [] if navigation_axes is None else navigation_axes
+    window_axis = {
+        "name": "Energy window",
+        "size": len(names),
+        "offset": 0,
+        "scale": 1,
+        "navigate": True,
+    }
+    axes = (
+        [dict(axis) for axis in navigation_axes]
+        + [window_axis]
+        + [dict(axis, navigate=False) for axis in axes]
+    )
+    for i, axis in enumerate(axes):
+        axis["index_in_array"] = i
+    metadata = copy.deepcopy(metadata)
+    general = metadata.setdefault("General", {})
+    general["title"] = "Energy windows: " + ", ".join(names)
+    signal = metadata.setdefault("Signal", {})
+    # the maps are not EDS spectra
+    signal.pop("signal_type", None)
+    signal["quantity"] = "X-rays (Counts)"
+    original_metadata = dict(original_metadata)
+    original_metadata["Energy_windows"] = {
+        "names": list(names),
+        "energies (keV)": np.asarray(energies),
+    }
+    return {
+        "data": maps,
+        "axes": axes,
+        "metadata": metadata,
+        "original_metadata": original_metadata,
+    }
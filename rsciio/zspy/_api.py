@@ -26,14 +26,24 @@ import zarr
 from dask.diagnostics import ProgressBar
 
 from rsciio._docstrings import (
+    ACCESS_PATTERN_DOC,
+    APPEND_DOC,
     CHUNKS_DOC,
     FILENAME_DOC,
     LAZY_DOC,
+    PACK_RAGGED_DOC,
+    RECHUNK_ON_SAVE_DOC,
     RETURNS_DOC,
     SHOW_PROGRESSBAR_DOC,
     SIGNAL_DOC,
+    SLICES_DOC,
+)
+from rsciio._hierarchical import (
+    HierarchicalReader,
+    HierarchicalWriter,
+    compatible_version,
+    set_format_version,
 )
-from rsciio._hierarchical import HierarchicalReader, HierarchicalWriter, version
 from rsciio.utils.tools import dummy_context_manager
 
 _logger = logging.getLogger(__name__)
@@ -128,7 +138,17 @@ class ZspyWriter(HierarchicalWriter):
         return dset
 
     @staticmethod
-    def _store_data(data, dset, group, key, chunks, show_progressbar=True):
+    def _store_data(
+        data,
+        dset,
+        group,
+        key,
+        chunks,
+        show_progressbar=True,
+        parallel_compression=False,
+    ):
+        # zarr compresses the chunks in the dask workers already, therefore
+        # `parallel_compression` is not used
         # Tuple of dask arrays can also be passed, in which case the task graphs
         # are merged and the data is written in a single `da.store` call.
         # This is useful when saving a ragged array, where we need to write
@@ -167,6 +187,10 @@ def file_writer(
     close_file=True,
     write_dataset=True,
     show_progressbar=True,
+    append=False,
+    access_pattern=None,
+    rechunk_on_save=False,
+    pack_ragged=False,
     **kwds,
 ):
     """
@@ -192,6 +216,10 @@ def file_writer(
         be useful to overwrite signal attributes only (for example ``axes_manager``)
         without having to write the whole dataset, which can take time.
     %s
+    %s
+    %s
+    %s
+    %s
     **kwds
         The keyword arguments are passed to the
         :py:meth:`zarr.hierarchy.Group.require_dataset` function.
@@ -215,14 +243,14 @@ def file_writer(
         store = zarr.storage.NestedDirectoryStore(
             filename,
         )
-    mode = "w" if write_dataset else "a"
+    mode = "w" if write_dataset and not append else "a"
 
     _logger.debug(f"File mode: {mode}")
     _logger.debug(f"Zarr store: {store}")
 
     f = zarr.open_group(store=store, mode=mode)
     f.attrs["file_format"] = "ZSpy"
-    f.attrs["file_format_version"] = version
+    set_format_version(f.attrs, compatible_version)
     exps = f.require_group("Experiments")
     title = signal["metadata"]["General"]["title"]
     group_name = title if title else "__unnamed__"
@@ -239,6 +267,10 @@ def file_writer(
         compressor=compressor,
         write_dataset=write_dataset,
         show_progressbar=show_progressbar,
+        append=append,
+        access_pattern=access_pattern,
+        rechunk_on_save=rechunk_on_save,
+        pack_ragged=pack_ragged,
         **kwds,
     )
     writer.write()
@@ -255,10 +287,14 @@ file_writer.__doc__ %= (
     SIGNAL_DOC,
     CHUNKS_DOC,
     SHOW_PROGRESSBAR_DOC,
+    APPEND_DOC,
+    ACCESS_PATTERN_DOC,
+    RECHUNK_ON_SAVE_DOC,
+    PACK_RAGGED_DOC,
 )
 
 
-def file_reader(filename, lazy=False, **kwds):
+def file_reader(filename, lazy=False, slices=None, **kwds):
     """
     Read data from zspy files saved with the HyperSpy zarr format
     specification.
@@ -267,6 +303,7 @@ def file_reader(filename, lazy=False, **kwds):
     ----------
     %s
     %s
+    %s
     **kwds : dict, optional
         Pass keyword arguments to the :py:func:`zarr.convenience.open` function.
 
@@ -285,7 +322,7 @@ def file_reader(filename, lazy=False, **kwds):
 
     reader = ZspyReader(f)
 
-    return reader.read(lazy=lazy)
+    return reader.read(lazy=lazy, slices=slices)
 
 
-file_reader.__doc__ %= (FILENAME_DOC, LAZY_DOC, RETURNS_DOC)
+file_reader.__doc__ %= (FILENAME_DOC, LAZY_DOC, SLICES_DOC, RETURNS_DOC)